@@ -4,6 +4,7 @@ import logging
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 from config.llm_config import embedding_model
+from core.dedup import DedupIndex
 from config.prompts import SystemPrompts, UserPrompts
 from utils.similarity_utils import calculate_similarity, jaccard_similarity
 
@@ -34,8 +35,10 @@ class DeduplicationAgent:
         question_texts = [q.get("question_text", "") for q in questions]
         question_embeddings = embedding_model.embed_batch(question_texts)
         
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(question_embeddings)
+        # Only pairs at or above the threshold can be duplicates
+        neighbors = DedupIndex.from_embeddings(
+            question_embeddings, self.similarity_threshold
+        ).neighbors(question_embeddings)
         
         # Find duplicates
         unique_indices = []
@@ -50,19 +53,15 @@ class DeduplicationAgent:
             processed.add(i)
             
             # Find similar questions to i
-            for j in range(i + 1, len(questions)):
-                if j in processed:
+            for j, similarity in neighbors[i]:
+                if j <= i or j in processed:
                     continue
                 
-                similarity = similarity_matrix[i][j]
-                
-                # Check if questions are similar enough to be duplicates
-                if similarity >= self.similarity_threshold:
-                    # Additional semantic check
-                    if self._are_questions_semantic_duplicates(questions[i], questions[j]):
-                        duplicate_indices.append(j)
-                        processed.add(j)
-                        logger.info(f"Found duplicate: {j} similar to {i} (score: {similarity:.3f})")
+                # Additional semantic check
+                if self._are_questions_semantic_duplicates(questions[i], questions[j]):
+                    duplicate_indices.append(j)
+                    processed.add(j)
+                    logger.info(f"Found duplicate: {j} similar to {i} (score: {similarity:.3f})")
         
         # Separate unique and duplicate questions
         unique_questions = [questions[i] for i in unique_indices]
@@ -203,20 +202,18 @@ class DeduplicationAgent:
             List of (index1, index2, similarity) tuples
         """
         near_duplicates = []
+        if len(questions) < 2:
+            return near_duplicates
         
         # Generate embeddings
         question_texts = [q.get("question_text", "") for q in questions]
         embeddings = embedding_model.embed_batch(question_texts)
         
-        # Compare each pair
+        # Pairs between threshold and the duplicate threshold
+        neighbors = DedupIndex.from_embeddings(embeddings).neighbors(embeddings, threshold)
         for i in range(len(questions)):
-            for j in range(i + 1, len(questions)):
-                similarity = cosine_similarity(
-                    [embeddings[i]], 
-                    [embeddings[j]]
-                )[0][0]
-                
-                if threshold <= similarity < self.similarity_threshold:
+            for j, similarity in neighbors[i]:
+                if j > i and similarity < self.similarity_threshold:
                     near_duplicates.append((i, j, similarity))
         
         return near_duplicates
@@ -340,7 +337,7 @@ class DeduplicationAgent:
         
         # Select diverse questions
         selected = []
-        selected_embeddings = []
+        selected_index = None
         
         for score, question in scored_questions:
             if len(selected) >= max_count:
@@ -349,21 +346,18 @@ class DeduplicationAgent:
             question_text = question.get("question_text", "")
             embedding = embedding_model.embed(question_text)
             
-            # Check diversity with already selected questions
-            is_diverse = True
-            for sel_embedding in selected_embeddings:
-                similarity = cosine_similarity([embedding], [sel_embedding])[0][0]
-                if similarity > 0.7:  # Too similar to existing question
-                    is_diverse = False
-                    break
+            # Check diversity with already selected questions in one search
+            if selected_index is None:
+                selected_index = DedupIndex(len(embedding), threshold=0.7)
             
-            if is_diverse:
+            if not selected_index.is_duplicate(embedding):  # Too similar to existing question otherwise
                 selected.append(question)
-                selected_embeddings.append(embedding)
+                selected_index.add([embedding])
         
         # If we still need more questions, take highest scoring ones
         if len(selected) < max_count:
-            remaining = [q for _, q in scored_questions if q not in selected]
+            selected_ids = {id(q) for q in selected}
+            remaining = [q for _, q in scored_questions if id(q) not in selected_ids]
             selected.extend(remaining[:max_count - len(selected)])
         
         return selected
@@ -1,15 +1,157 @@
+import io
 import json
-from typing import Dict, List, Any, Tuple
+import string
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 import random
+import numpy as np
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import chain, groupby
 from config.llm_config import llm_client
 
 logger = logging.getLogger(__name__)
 
+# Shared compact encoder for DB payloads (avoids building an encoder per dumps call)
+_json_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# Below this size a plain Python sum is cheaper than building NumPy arrays
+_NUMPY_MIN_QUESTIONS = 32
+
+# Option labels for HTML (A, B, C...) and Markdown (a, b, c...) output
+_UPPER_LABELS = string.ascii_uppercase
+_LOWER_LABELS = string.ascii_lowercase
+
+# Static document head for HTML output; only the title varies
+_HTML_HEADER_TMPL = (
+    "<!DOCTYPE html>\n"
+    "<html>\n"
+    "<head>\n"
+    "<title>{title}</title>\n"
+    "<style>\n"
+    "body {{ font-family: Arial, sans-serif; margin: 40px; }}\n"
+    ".question {{ margin-bottom: 30px; padding: 15px; border: 1px solid #ddd; }}\n"
+    ".options {{ margin-left: 20px; }}\n"
+    ".option {{ margin: 5px 0; }}\n"
+    ".correct {{ color: green; font-weight: bold; }}\n"
+    ".explanation {{ margin-top: 10px; font-style: italic; color: #666; }}\n"
+    "</style>\n"
+    "</head>\n"
+    "<body>\n"
+)
+
+# Keys already stored in dedicated columns and left out of "original_data"
+_DB_COLUMN_KEYS = frozenset({
+    "question_text", "options", "answer", "correct_answer",
+    "explanation", "difficulty"
+})
+
+def _score_kernel(scores: np.ndarray) -> Tuple[float, float]:
+    """Mean validation and confidence of an (N, 2) score matrix in one reduction"""
+    mean_validation, mean_confidence = scores.mean(axis=0)
+    return float(mean_validation), float(mean_confidence)
+
+
+@lru_cache(maxsize=256)
+def _average_difficulty(distribution: FrozenSet[Tuple[str, int]]) -> str:
+    """Average difficulty level of a (difficulty, count) distribution"""
+    counts = dict(distribution)
+    total = sum(counts.values())
+    if total == 0:
+        return "medium"
+    
+    # Weight difficulties
+    weight = (
+        counts.get("easy", 0) * 1 +
+        counts.get("medium", 0) * 2 +
+        counts.get("hard", 0) * 3
+    ) / total
+    
+    if weight < 1.5:
+        return "easy"
+    elif weight < 2.5:
+        return "medium"
+    else:
+        return "hard"
+
+
+@lru_cache(maxsize=256)
+def _coverage_score(topic_count: int, total_questions: int) -> float:
+    """Topic coverage score against an ideal of 3-5 questions per topic"""
+    if total_questions == 0 or topic_count == 0:
+        return 0.0
+    
+    ideal_per_topic = 4
+    return min(1.0, total_questions / (topic_count * ideal_per_topic))
+
+
+@lru_cache(maxsize=256)
+def _quality_rating(avg_validation: float, avg_confidence: float) -> str:
+    """Quality rating label for the average validation/confidence scores"""
+    avg_score = (avg_validation + avg_confidence) / 2
+    
+    if avg_score >= 0.8:
+        return "Excellent"
+    elif avg_score >= 0.7:
+        return "Good"
+    elif avg_score >= 0.6:
+        return "Fair"
+    else:
+        return "Needs Improvement"
+
+
+class _LazyFormats(Mapping):
+    """Read-only "formats" mapping that renders each output only when requested"""
+    
+    __slots__ = ("_agent", "_q", "_m", "_json", "_html", "_md")
+    _KEYS = ("json", "html", "markdown")
+    
+    def __init__(self, agent: "FormatterAgent", questions: List[Dict], metadata: Dict):
+        self._agent = agent
+        self._q = questions
+        self._m = metadata
+        self._json = None
+        self._html = None
+        self._md = None
+    
+    @property
+    def json(self) -> Dict[str, Any]:
+        if self._json is None:
+            self._json = self._agent._format_as_json(self._q, self._m)
+        return self._json
+    
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = self._agent._format_as_html(self._q, self._m)
+        return self._html
+    
+    @property
+    def markdown(self) -> str:
+        if self._md is None:
+            self._md = self._agent._format_as_markdown(self._q, self._m)
+        return self._md
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
 class FormatterAgent:
+    _DIFF_ORDER = {"easy": 1, "medium": 2, "hard": 3}
+    
     def __init__(self):
         self.question_types = ["mcq", "short_answer"]
+        self._rng = random.Random()
     
     def format_quiz(
         self, 
@@ -26,6 +168,9 @@ class FormatterAgent:
         Returns:
             Formatted quiz structure
         """
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        
         try:
             # Sort questions by topic and difficulty
             sorted_questions = self._sort_questions(questions)
@@ -34,7 +179,7 @@ class FormatterAgent:
             formatted_questions = self._apply_quiz_config(sorted_questions, quiz_config)
             
             # Generate quiz metadata
-            quiz_metadata = self._generate_quiz_metadata(formatted_questions, quiz_config)
+            quiz_metadata = self._generate_quiz_metadata(formatted_questions, quiz_config, now=now)
             
             # Create quiz sections by topic
             quiz_sections = self._create_quiz_sections(formatted_questions)
@@ -42,12 +187,8 @@ class FormatterAgent:
             # Calculate statistics
             quiz_stats = self._calculate_quiz_statistics(formatted_questions)
             
-            # Format for different outputs
-            output_formats = {
-                "json": self._format_as_json(formatted_questions, quiz_metadata),
-                "html": self._format_as_html(formatted_questions, quiz_metadata),
-                "markdown": self._format_as_markdown(formatted_questions, quiz_metadata)
-            }
+            # Output formats are rendered on first access
+            output_formats = _LazyFormats(self, formatted_questions, quiz_metadata)
             
             quiz = {
                 "metadata": quiz_metadata,
@@ -55,11 +196,12 @@ class FormatterAgent:
                 "questions": formatted_questions,
                 "statistics": quiz_stats,
                 "formats": output_formats,
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": now_iso,
                 "version": "1.0"
             }
             
             logger.info(f"Formatted quiz with {len(formatted_questions)} questions")
+            
             return quiz
             
         except Exception as e:
@@ -88,7 +230,7 @@ class FormatterAgent:
                 "quiz_id": quiz_id,
                 "question_text": question.get("question_text", ""),
                 "question_type": question.get("question_type", "mcq"),
-                "options": json.dumps(question.get("options", [])),
+                "options": _json_encode(question.get("options", [])),
 
                 # ✅ FIXED answer mapping
                 "correct_answer": question.get("correct_answer") or question.get("answer", ""),
@@ -108,7 +250,7 @@ class FormatterAgent:
 
                 "question_order": i + 1,
 
-                "metadata": json.dumps({
+                "metadata": _json_encode({
                     "chunk_id": question.get("chunk_id"),
                     "page_number": question.get("page_number"),
                     "subtopic": question.get("subtopic"),
@@ -116,10 +258,7 @@ class FormatterAgent:
                     "generation_source": question.get("generation_source", "llm"),
                     "original_data": {
                         key: value for key, value in question.items()
-                        if key not in [
-                            "question_text", "options", "answer", "correct_answer",
-                            "explanation", "difficulty"
-                        ]
+                        if key not in _DB_COLUMN_KEYS
                     }
                 })
             }
@@ -145,26 +284,26 @@ class FormatterAgent:
         questions = quiz_data.get("questions", [])
         metadata = quiz_data.get("metadata", {})
         
-        # Calculate topic distribution
-        topic_distribution = {}
-        difficulty_distribution = {"easy": 0, "medium": 0, "hard": 0}
-        type_distribution = {"mcq": 0, "short_answer": 0}
+        # Distributions, quality and timing are all gathered in a single pass
+        topic_distribution = defaultdict(int)
+        difficulty_distribution = defaultdict(int, {"easy": 0, "medium": 0, "hard": 0})
+        type_distribution = defaultdict(int, {"mcq": 0, "short_answer": 0})
+        score_total = 0.0
         
         for question in questions:
-            topic = question.get("topic", "General")
-            topic_distribution[topic] = topic_distribution.get(topic, 0) + 1
-            
-            difficulty = question.get("difficulty", "medium")
-            difficulty_distribution[difficulty] = difficulty_distribution.get(difficulty, 0) + 1
-            
-            q_type = question.get("question_type", "mcq")
-            type_distribution[q_type] = type_distribution.get(q_type, 0) + 1
+            get = question.get
+            topic_distribution[get("topic", "General")] += 1
+            difficulty_distribution[get("difficulty", "medium")] += 1
+            type_distribution[get("question_type", "mcq")] += 1
+            score_total += (get("validation_score", 0.5) + get("confidence_score", 0.5)) / 2
+        
+        topic_distribution = dict(topic_distribution)
+        difficulty_distribution = dict(difficulty_distribution)
+        type_distribution = dict(type_distribution)
         
         # Calculate estimated time (1 minute per MCQ, 2 minutes per short answer)
-        estimated_time = (
-            type_distribution.get("mcq", 0) * 1 +
-            type_distribution.get("short_answer", 0) * 2
-        )
+        estimated_time = type_distribution["mcq"] * 1 + type_distribution["short_answer"] * 2
+        quality_score = score_total / len(questions) if questions else 0.0
         
         summary = {
             "quiz_id": metadata.get("quiz_id"),
@@ -178,7 +317,7 @@ class FormatterAgent:
             "estimated_time_minutes": estimated_time,
             "average_difficulty": self._calculate_average_difficulty(difficulty_distribution),
             "coverage_score": self._calculate_coverage_score(topic_distribution, len(questions)),
-            "quality_score": self._calculate_quality_score(questions)
+            "quality_score": quality_score
         }
         
         return summary
@@ -199,30 +338,29 @@ class FormatterAgent:
             Student-friendly quiz format
         """
         questions = quiz_data.get("questions", [])
+        g = dict.get
         
         student_questions = []
         for question in questions:
             student_question = {
-                "question_id": question.get("question_id"),
-                "question_text": question.get("question_text", ""),
-                "question_type": question.get("question_type", "mcq"),
-                "difficulty": question.get("difficulty", "medium"),
-                "topic": question.get("topic", "General"),
-                "question_order": question.get("question_order", 0)
+                "question_id": g(question, "question_id"),
+                "question_text": g(question, "question_text", ""),
+                "question_type": g(question, "question_type", "mcq"),
+                "difficulty": g(question, "difficulty", "medium"),
+                "topic": g(question, "topic", "General"),
+                "question_order": g(question, "question_order", 0)
             }
             
             # Add options for MCQs
-            if question.get("question_type") == "mcq":
-                options = question.get("options", [])
+            if g(question, "question_type") == "mcq":
+                options = g(question, "options", [])
                 # Shuffle options for student view
-                shuffled_options = options.copy()
-                random.shuffle(shuffled_options)
-                student_question["options"] = shuffled_options
+                student_question["options"] = self._rng.sample(options, len(options))
             
             # Add answer if requested
             if include_answers:
-                student_question["correct_answer"] = question.get("answer", "")
-                student_question["explanation"] = question.get("explanation", "")
+                student_question["correct_answer"] = g(question, "answer", "")
+                student_question["explanation"] = g(question, "explanation", "")
             
             student_questions.append(student_question)
         
@@ -237,30 +375,15 @@ class FormatterAgent:
         }
     
     def _sort_questions(self, questions: List[Dict]) -> List[Dict]:
-        """Sort questions by topic and difficulty"""
-        # First, sort by topic
-        questions_by_topic = {}
-        for question in questions:
-            topic = question.get("normalized_topic", "General")
-            if topic not in questions_by_topic:
-                questions_by_topic[topic] = []
-            questions_by_topic[topic].append(question)
-        
-        # Sort topics alphabetically
-        sorted_topics = sorted(questions_by_topic.keys())
-        
-        # Within each topic, sort by difficulty (easy -> medium -> hard)
-        sorted_questions = []
-        for topic in sorted_topics:
-            topic_questions = questions_by_topic[topic]
-            # Define difficulty order
-            difficulty_order = {"easy": 1, "medium": 2, "hard": 3}
-            topic_questions.sort(
-                key=lambda q: difficulty_order.get(q.get("difficulty", "medium"), 2)
-            )
-            sorted_questions.extend(topic_questions)
-        
-        return sorted_questions
+        """Sort questions by topic and difficulty (easy -> medium -> hard)"""
+        return sorted(questions, key=self._sort_key)
+    
+    def _sort_key(self, question: Dict) -> Tuple[str, int]:
+        """Sort key: topic alphabetically, then difficulty order"""
+        return (
+            question.get("normalized_topic", "General"),
+            self._DIFF_ORDER.get(question.get("difficulty", "medium"), 2)
+        )
     
     def _apply_quiz_config(
         self, 
@@ -278,6 +401,7 @@ class FormatterAgent:
         
         # Select questions based on configuration
         selected_questions = []
+        selected_ids = set()
         counts = {"easy": 0, "medium": 0, "hard": 0}
         targets = {
             "easy": int(max_questions * difficulty_distribution.get("easy", 0.3)),
@@ -290,6 +414,7 @@ class FormatterAgent:
             
             if counts[difficulty] < targets[difficulty]:
                 selected_questions.append(question)
+                selected_ids.add(id(question))
                 counts[difficulty] += 1
             
             if len(selected_questions) >= max_questions:
@@ -297,7 +422,7 @@ class FormatterAgent:
         
         # If we still need more questions, fill with whatever is available
         if len(selected_questions) < max_questions:
-            remaining = [q for q in questions if q not in selected_questions]
+            remaining = [q for q in questions if id(q) not in selected_ids]
             selected_questions.extend(remaining[:max_questions - len(selected_questions)])
         
         # Assign question order
@@ -309,21 +434,20 @@ class FormatterAgent:
     def _generate_quiz_metadata(
         self, 
         questions: List[Dict], 
-        config: Dict
+        config: Dict,
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Generate quiz metadata"""
-        # Calculate topic coverage
+        now = now or datetime.utcnow()
+        
+        # Calculate topic coverage and difficulty breakdown in one pass
         topics = set()
+        difficulties = Counter()
         for question in questions:
-            topic = question.get("normalized_topic", "General")
-            topics.add(topic)
+            topics.add(question.get("normalized_topic", "General"))
+            difficulties[question.get("difficulty", "medium")] += 1
         
-        # Calculate difficulty breakdown
-        difficulty_counts = {"easy": 0, "medium": 0, "hard": 0}
-        for question in questions:
-            difficulty = question.get("difficulty", "medium")
-            if difficulty in difficulty_counts:
-                difficulty_counts[difficulty] += 1
+        difficulty_counts = {level: difficulties[level] for level in self._DIFF_ORDER}
         
         metadata = {
             "title": config.get("title", "Generated Quiz"),
@@ -332,8 +456,8 @@ class FormatterAgent:
             "topic_count": len(topics),
             "topics_covered": list(topics),
             "difficulty_breakdown": difficulty_counts,
-            "generation_date": datetime.utcnow().isoformat(),
-            "quiz_id": config.get("quiz_id", f"quiz_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"),
+            "generation_date": now.isoformat(),
+            "quiz_id": config.get("quiz_id", f"quiz_{now.strftime('%Y%m%d_%H%M%S')}"),
             "source_pdf": config.get("source_pdf", "Unknown"),
             "version": "1.0"
         }
@@ -341,45 +465,29 @@ class FormatterAgent:
         return metadata
     
     def _create_quiz_sections(self, questions: List[Dict]) -> List[Dict]:
-        """Create quiz sections by topic"""
+        """Create quiz sections by topic (questions arrive grouped by _sort_questions)"""
         sections = []
-        current_topic = None
-        current_section = None
         
-        for question in questions:
-            topic = question.get("normalized_topic", "General")
-            
-            if topic != current_topic:
-                # Start new section
-                if current_section:
-                    sections.append(current_section)
-                
-                current_topic = topic
-                current_section = {
-                    "section_title": f"Section: {topic}",
-                    "topic": topic,
-                    "instructions": "Answer the following questions:",
-                    "questions": [],
-                    "question_count": 0,
-                    "difficulty_breakdown": {"easy": 0, "medium": 0, "hard": 0}
+        for topic, group in groupby(questions, key=lambda q: q.get("normalized_topic", "General")):
+            section_questions = [
+                {
+                    "question_id": question.get("question_id"),
+                    "question_text": question.get("question_text"),
+                    "question_type": question.get("question_type"),
+                    "difficulty": question.get("difficulty", "medium")
                 }
+                for question in group
+            ]
+            difficulties = Counter(q["difficulty"] for q in section_questions)
             
-            # Add question to current section
-            current_section["questions"].append({
-                "question_id": question.get("question_id"),
-                "question_text": question.get("question_text"),
-                "question_type": question.get("question_type"),
-                "difficulty": question.get("difficulty", "medium")
+            sections.append({
+                "section_title": f"Section: {topic}",
+                "topic": topic,
+                "instructions": "Answer the following questions:",
+                "questions": section_questions,
+                "question_count": len(section_questions),
+                "difficulty_breakdown": {level: difficulties[level] for level in self._DIFF_ORDER}
             })
-            current_section["question_count"] += 1
-            
-            difficulty = question.get("difficulty", "medium")
-            if difficulty in current_section["difficulty_breakdown"]:
-                current_section["difficulty_breakdown"][difficulty] += 1
-        
-        # Add the last section
-        if current_section:
-            sections.append(current_section)
         
         return sections
     
@@ -387,28 +495,32 @@ class FormatterAgent:
         """Calculate quiz statistics"""
         total_questions = len(questions)
         
-        # Difficulty statistics
+        # Difficulty statistics and topic diversity
         difficulty_counts = {"easy": 0, "medium": 0, "hard": 0}
-        validation_scores = []
-        confidence_scores = []
+        topics = set()
         
         for question in questions:
             difficulty = question.get("difficulty", "medium")
             if difficulty in difficulty_counts:
                 difficulty_counts[difficulty] += 1
-            
-            validation_score = question.get("validation_score", 0.5)
-            validation_scores.append(validation_score)
-            
-            confidence_score = question.get("confidence_score", 0.5)
-            confidence_scores.append(confidence_score)
-        
-        # Calculate averages
-        avg_validation = sum(validation_scores) / total_questions if validation_scores else 0
-        avg_confidence = sum(confidence_scores) / total_questions if confidence_scores else 0
-        
-        # Topic diversity
-        topics = set(q.get("normalized_topic", "General") for q in questions)
+            topics.add(question.get("normalized_topic", "General"))
+        
+        # Calculate averages (NumPy reduction only pays off for larger quizzes)
+        if total_questions >= _NUMPY_MIN_QUESTIONS:
+            scores = np.fromiter(
+                chain.from_iterable(
+                    (q.get("validation_score", 0.5), q.get("confidence_score", 0.5))
+                    for q in questions
+                ),
+                dtype=np.float64, count=2 * total_questions
+            ).reshape(total_questions, 2)
+            avg_validation, avg_confidence = _score_kernel(scores)
+        elif total_questions:
+            avg_validation = sum(q.get("validation_score", 0.5) for q in questions) / total_questions
+            avg_confidence = sum(q.get("confidence_score", 0.5) for q in questions) / total_questions
+        else:
+            avg_validation = 0
+            avg_confidence = 0
         
         return {
             "total_questions": total_questions,
@@ -426,19 +538,20 @@ class FormatterAgent:
         metadata: Dict
     ) -> Dict[str, Any]:
         """Format quiz as JSON"""
+        g = dict.get
         return {
             "metadata": metadata,
             "questions": [
                 {
-                    "id": q.get("question_id"),
-                    "text": q.get("question_text"),
-                    "type": q.get("question_type"),
-                    "options": q.get("options", []),
-                    "correct_answer": q.get("answer"),
-                    "explanation": q.get("explanation"),
-                    "difficulty": q.get("difficulty"),
-                    "topic": q.get("normalized_topic"),
-                    "page_reference": q.get("page_number")
+                    "id": g(q, "question_id"),
+                    "text": g(q, "question_text"),
+                    "type": g(q, "question_type"),
+                    "options": g(q, "options", []),
+                    "correct_answer": g(q, "answer"),
+                    "explanation": g(q, "explanation"),
+                    "difficulty": g(q, "difficulty"),
+                    "topic": g(q, "normalized_topic"),
+                    "page_reference": g(q, "page_number")
                 }
                 for q in questions
             ]
@@ -450,52 +563,43 @@ class FormatterAgent:
         metadata: Dict
     ) -> str:
         """Format quiz as HTML"""
-        html_parts = [
-            "<!DOCTYPE html>",
-            "<html>",
-            "<head>",
-            "<title>" + metadata.get("title", "Quiz") + "</title>",
-            "<style>",
-            "body { font-family: Arial, sans-serif; margin: 40px; }",
-            ".question { margin-bottom: 30px; padding: 15px; border: 1px solid #ddd; }",
-            ".options { margin-left: 20px; }",
-            ".option { margin: 5px 0; }",
-            ".correct { color: green; font-weight: bold; }",
-            ".explanation { margin-top: 10px; font-style: italic; color: #666; }",
-            "</style>",
-            "</head>",
-            "<body>",
-            f"<h1>{metadata.get('title', 'Quiz')}</h1>",
-            f"<p>{metadata.get('description', '')}</p>",
-            f"<p><strong>Total Questions:</strong> {metadata.get('total_questions', 0)}</p>"
-        ]
+        g = dict.get
+        buf = io.StringIO()
+        w = buf.write
+        title = metadata.get("title", "Quiz")
+        
+        w(_HTML_HEADER_TMPL.format(title=title))
+        w(
+            f"<h1>{title}</h1>\n"
+            f"<p>{metadata.get('description', '')}</p>\n"
+            f"<p><strong>Total Questions:</strong> {metadata.get('total_questions', 0)}</p>\n"
+        )
         
         for i, question in enumerate(questions, 1):
-            html_parts.extend([
-                f'<div class="question" id="q{i}">',
-                f'<h3>Question {i}: {question.get("difficulty", "").capitalize()} Difficulty</h3>',
-                f'<p><strong>Topic:</strong> {question.get("normalized_topic", "General")}</p>',
-                f'<p>{question.get("question_text", "")}</p>'
-            ])
+            w(
+                f'<div class="question" id="q{i}">\n'
+                f'<h3>Question {i}: {g(question, "difficulty", "").capitalize()} Difficulty</h3>\n'
+                f'<p><strong>Topic:</strong> {g(question, "normalized_topic", "General")}</p>\n'
+                f'<p>{g(question, "question_text", "")}</p>\n'
+            )
             
-            if question.get("question_type") == "mcq":
-                html_parts.append('<div class="options">')
-                for j, option in enumerate(question.get("options", []), 1):
-                    html_parts.append(f'<div class="option">{chr(64+j)}. {option}</div>')
-                html_parts.append('</div>')
+            if g(question, "question_type") == "mcq":
+                w('<div class="options">\n')
+                w("".join(
+                    f'<div class="option">{label}. {option}</div>\n'
+                    for label, option in zip(_UPPER_LABELS, g(question, "options", []))
+                ))
+                w('</div>\n')
             
-            html_parts.extend([
-                f'<p class="correct"><strong>Answer:</strong> {question.get("answer", "")}</p>',
-                f'<p class="explanation"><strong>Explanation:</strong> {question.get("explanation", "")}</p>',
-                '</div>'
-            ])
-        
-        html_parts.extend([
-            "</body>",
-            "</html>"
-        ])
-        
-        return "\n".join(html_parts)
+            w(
+                f'<p class="correct"><strong>Answer:</strong> {g(question, "answer", "")}</p>\n'
+                f'<p class="explanation"><strong>Explanation:</strong> {g(question, "explanation", "")}</p>\n'
+                '</div>\n'
+            )
+        
+        w("</body>\n</html>")
+        
+        return buf.getvalue()
     
     def _format_as_markdown(
         self, 
@@ -503,32 +607,38 @@ class FormatterAgent:
         metadata: Dict
     ) -> str:
         """Format quiz as Markdown"""
-        markdown_parts = [
-            f"# {metadata.get('title', 'Quiz')}",
-            f"\n{metadata.get('description', '')}",
-            f"\n**Total Questions:** {metadata.get('total_questions', 0)}",
+        g = dict.get
+        buf = io.StringIO()
+        w = buf.write
+        
+        w(
+            f"# {metadata.get('title', 'Quiz')}\n"
+            f"\n{metadata.get('description', '')}\n"
+            f"\n**Total Questions:** {metadata.get('total_questions', 0)}\n"
             "\n---\n"
-        ]
+        )
         
         for i, question in enumerate(questions, 1):
-            markdown_parts.extend([
-                f"\n## Question {i}: {question.get('difficulty', '').capitalize()}",
-                f"\n**Topic:** {question.get('normalized_topic', 'General')}",
-                f"\n{question.get('question_text', '')}"
-            ])
+            w(
+                f"\n\n## Question {i}: {g(question, 'difficulty', '').capitalize()}\n"
+                f"\n**Topic:** {g(question, 'normalized_topic', 'General')}\n"
+                f"\n{g(question, 'question_text', '')}"
+            )
             
-            if question.get("question_type") == "mcq":
-                markdown_parts.append("\n**Options:**")
-                for j, option in enumerate(question.get("options", []), 1):
-                    markdown_parts.append(f"{chr(96+j)}) {option}")
+            if g(question, "question_type") == "mcq":
+                w("\n\n**Options:**")
+                w("".join(
+                    f"\n{label}) {option}"
+                    for label, option in zip(_LOWER_LABELS, g(question, "options", []))
+                ))
             
-            markdown_parts.extend([
-                f"\n**Answer:** {question.get('answer', '')}",
-                f"\n*Explanation:* {question.get('explanation', '')}",
+            w(
+                f"\n\n**Answer:** {g(question, 'answer', '')}\n"
+                f"\n*Explanation:* {g(question, 'explanation', '')}\n"
                 "\n---"
-            ])
+            )
         
-        return "\n".join(markdown_parts)
+        return buf.getvalue()
     
     def _format_fallback_quiz(
         self, 
@@ -553,23 +663,7 @@ class FormatterAgent:
     
     def _calculate_average_difficulty(self, distribution: Dict) -> str:
         """Calculate average difficulty"""
-        total = sum(distribution.values())
-        if total == 0:
-            return "medium"
-        
-        # Weight difficulties
-        weight = (
-            distribution.get("easy", 0) * 1 +
-            distribution.get("medium", 0) * 2 +
-            distribution.get("hard", 0) * 3
-        ) / total
-        
-        if weight < 1.5:
-            return "easy"
-        elif weight < 2.5:
-            return "medium"
-        else:
-            return "hard"
+        return _average_difficulty(frozenset(distribution.items()))
     
     def _calculate_coverage_score(
         self, 
@@ -577,33 +671,7 @@ class FormatterAgent:
         total_questions: int
     ) -> float:
         """Calculate topic coverage score"""
-        if total_questions == 0:
-            return 0.0
-        
-        # Ideal: 3-5 questions per topic
-        ideal_per_topic = 4
-        topic_count = len(distribution)
-        
-        if topic_count == 0:
-            return 0.0
-        
-        ideal_total = topic_count * ideal_per_topic
-        coverage = min(1.0, total_questions / ideal_total)
-        
-        return coverage
-    
-    def _calculate_quality_score(self, questions: List[Dict]) -> float:
-        """Calculate overall quiz quality score"""
-        if not questions:
-            return 0.0
-        
-        scores = []
-        for question in questions:
-            validation = question.get("validation_score", 0.5)
-            confidence = question.get("confidence_score", 0.5)
-            scores.append((validation + confidence) / 2)
-        
-        return sum(scores) / len(scores)
+        return _coverage_score(len(distribution), total_questions)
     
     def _calculate_estimated_time(self, questions: List[Dict]) -> int:
         """Calculate estimated completion time"""
@@ -625,13 +693,4 @@ class FormatterAgent:
         avg_confidence: float
     ) -> str:
         """Calculate quality rating"""
-        avg_score = (avg_validation + avg_confidence) / 2
-        
-        if avg_score >= 0.8:
-            return "Excellent"
-        elif avg_score >= 0.7:
-            return "Good"
-        elif avg_score >= 0.6:
-            return "Fair"
-        else:
-            return "Needs Improvement"
\ No newline at end of file
+        return _quality_rating(avg_validation, avg_confidence)
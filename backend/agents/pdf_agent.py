@@ -1,11 +1,18 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Tuple
 import logging
 from config.llm_config import llm_client
 from config.prompts import SystemPrompts
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Chunks analyzed per LLM request, capped by total text so a group stays
+# well inside the model's context window
+_ANALYSIS_GROUP_SIZE = 16
+_ANALYSIS_GROUP_CHARS = 24000
+
 class PDFAgent:
     def __init__(self):
         self.system_prompt = SystemPrompts.PDF_ANALYZER_SYSTEM
@@ -65,6 +72,107 @@ class PDFAgent:
             logger.error(f"Error analyzing chunk: {e}")
             return self._get_basic_analysis(chunk)
     
+    def analyze_chunks(self, chunks: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Analyze many chunks, several per LLM request
+        
+        Chunks are grouped (up to _ANALYSIS_GROUP_SIZE chunks or
+        _ANALYSIS_GROUP_CHARS characters per group) and the groups are sent
+        concurrently; llm_client's rate limiter paces them.
+        
+        Args:
+            chunks: List of chunk dictionaries
+            
+        Returns:
+            Analysis results, one per chunk in input order
+        """
+        groups = []
+        for i, chunk in enumerate(chunks):
+            length = len(chunk.get("text", ""))
+            if groups and len(groups[-1][0]) < _ANALYSIS_GROUP_SIZE and groups[-1][1] + length <= _ANALYSIS_GROUP_CHARS:
+                groups[-1][0].append(i)
+                groups[-1][1] += length
+            else:
+                groups.append([[i], length])
+        
+        results: List[Any] = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=max(1, settings.LLM_MAX_CONCURRENCY)) as executor:
+            group_results = executor.map(
+                lambda group: self._analyze_chunk_group([chunks[i] for i in group[0]]), groups
+            )
+            for (indices, _), analyses in zip(groups, group_results):
+                for i, analysis in zip(indices, analyses):
+                    results[i] = analysis
+        
+        return results
+    
+    def _analyze_chunk_group(self, chunks: List[Dict]) -> List[Dict[str, Any]]:
+        """One analysis request for a group of chunks; chunks it leaves out are analyzed alone"""
+        if len(chunks) == 1:
+            return [self.analyze_chunk(chunks[0])]
+        
+        try:
+            texts = json.dumps([
+                {"id": i, "page": chunk.get("page_number", 1), "text": chunk.get("text", "")}
+                for i, chunk in enumerate(chunks)
+            ], ensure_ascii=False)
+            
+            prompt = f"""Analyze each of the following text chunks separately:
+
+            Chunks:
+            {texts}
+
+            For every chunk extract:
+            1. Key concepts and entities (list)
+            2. Important facts or definitions (list)
+            3. Main ideas or themes (1-3)
+            4. Relationships between concepts if any
+            5. Technical terms or jargon
+            
+            Return as JSON: {{"analyses": [...]}} with exactly one entry per chunk,
+            each with these keys:
+            - id: the chunk's id
+            - concepts: list of key concepts
+            - facts: list of important facts
+            - main_ideas: list of main ideas
+            - relationships: list of relationships
+            - technical_terms: list of technical terms
+            - summary: brief summary of chunk
+            """
+            
+            response = llm_client.generate_json(
+                prompt=prompt,
+                system_prompt=self.system_prompt
+            )
+            entries = response.get("analyses") if isinstance(response, dict) else response
+        except Exception as e:
+            logger.error(f"Error analyzing chunk group, analyzing individually: {e}")
+            entries = None
+        
+        by_id = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and str(entry.get("id", "")).isdigit():
+                by_id[int(entry.pop("id"))] = entry
+        
+        results = []
+        for i, chunk in enumerate(chunks):
+            analysis = by_id.get(i)
+            if analysis is None:
+                results.append(self.analyze_chunk(chunk))
+                continue
+            
+            chunk_text = chunk.get("text", "")
+            analysis.update({
+                "chunk_id": chunk.get("chunk_id"),
+                "page_number": chunk.get("page_number", 1),
+                "text_length": len(chunk_text),
+                "word_count": len(chunk_text.split())
+            })
+            results.append(analysis)
+        
+        logger.info(f"Analyzed {len(by_id)}/{len(chunks)} chunks in one request")
+        return results
+    
     def extract_key_information(self, chunks: List[Dict]) -> Dict[str, Any]:
         """
         Extract key information from all chunks
@@ -72,6 +180,18 @@ class PDFAgent:
         Args:
             chunks: List of chunk dictionaries
             
+        Returns:
+            Consolidated key information
+        """
+        return self.consolidate_analyses(self.analyze_chunks(chunks))
+    
+    def consolidate_analyses(self, analyses: List[Dict]) -> Dict[str, Any]:
+        """
+        Merge per-chunk analyses into one key-information summary
+        
+        Args:
+            analyses: Results of analyze_chunk / analyze_chunks
+            
         Returns:
             Consolidated key information
         """
@@ -80,9 +200,7 @@ class PDFAgent:
         all_ideas = []
         all_terms = []
         
-        for chunk in chunks:
-            analysis = self.analyze_chunk(chunk)
-            
+        for analysis in analyses:
             all_concepts.extend(analysis.get("concepts", []))
             all_facts.extend(analysis.get("facts", []))
             all_ideas.extend(analysis.get("main_ideas", []))
@@ -100,14 +218,14 @@ class PDFAgent:
         top_concepts = concept_counter.most_common(10)
         
         return {
-            "total_chunks_analyzed": len(chunks),
+            "total_chunks_analyzed": len(analyses),
             "unique_concepts": all_concepts,
             "unique_facts": all_facts,
             "main_ideas": all_ideas,
             "technical_terms": all_terms,
             "top_concepts": [concept for concept, count in top_concepts],
             "concept_frequencies": dict(top_concepts),
-            "summary": f"Extracted {len(all_concepts)} concepts, {len(all_facts)} facts from {len(chunks)} chunks"
+            "summary": f"Extracted {len(all_concepts)} concepts, {len(all_facts)} facts from {len(analyses)} chunks"
         }
     
     def identify_content_structure(self, chunks: List[Dict]) -> Dict[str, Any]:
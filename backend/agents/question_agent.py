@@ -1,13 +1,43 @@
+import bisect
 import json
 import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, islice
 from typing import Dict, List, Any, Tuple
 import logging
 from config.llm_config import llm_client
 from config.prompts import SystemPrompts, UserPrompts
 from config.settings import settings
+from utils.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Subtopics that are pure numbers (years, page numbers) or shorter than 4 characters
+_JUNK_SUBTOPIC = re.compile(r"\d+|.{0,3}", re.DOTALL)
+_SENT_RE = re.compile(r"[.!?]+")
+
+# Complexity offsets by claimed difficulty and question type (anything else adds 0)
+_COMPLEXITY_DIFFICULTY_ADJ = {"easy": -0.2, "hard": 0.2}
+_COMPLEXITY_TYPE_ADJ = {"mcq": 0.1}  # MCQs are generally easier
+
+# Typical distribution used to weight a chunk's difficulty mix
+_DIFFICULTY_WEIGHTS = {"easy": 0.3, "medium": 0.5, "hard": 0.2}
+
+
+@lru_cache(maxsize=16)
+def _difficulty_cdf(difficulty_mix: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+    """Normalized cumulative weights for a difficulty mix (unknown levels are skipped)"""
+    difficulties = tuple(d for d in difficulty_mix if d in _DIFFICULTY_WEIGHTS)
+    cumulative = list(accumulate(_DIFFICULTY_WEIGHTS[d] for d in difficulties))
+    if not cumulative:
+        return (), ()
+    
+    total = cumulative[-1]
+    return difficulties, tuple(c / total for c in cumulative)
+
+
 class QuestionAgent:
     def __init__(self):
         self.system_prompt = SystemPrompts.QUESTION_GENERATOR_SYSTEM
@@ -17,7 +47,8 @@ class QuestionAgent:
         chunk: Dict, 
         subtopic: str, 
         count: int = 2,
-        difficulty: str = "medium"
+        difficulty: str = "medium",
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Generate questions for a specific chunk and subtopic
@@ -27,6 +58,7 @@ class QuestionAgent:
             subtopic: Specific subtopic to focus on
             count: Number of questions to generate
             difficulty: Target difficulty level
+            use_cache: False asks the LLM again instead of replaying a cached response
             
         Returns:
             List of generated questions
@@ -43,7 +75,8 @@ class QuestionAgent:
             
             response = llm_client.generate_json(
                 prompt=prompt,
-                system_prompt=self.system_prompt
+                system_prompt=self.system_prompt,
+                use_cache=use_cache
             )
             
             questions = response.get("questions", [])
@@ -71,7 +104,8 @@ class QuestionAgent:
     def generate_questions_batch(
         self, 
         chunk_assignments: List[Dict], 
-        extracted_topics: Dict
+        extracted_topics: Dict,
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Generate questions for multiple chunks based on assignments
@@ -79,11 +113,13 @@ class QuestionAgent:
         Args:
             chunk_assignments: List of chunk assignments from planner
             extracted_topics: Topics extracted from chunks
+            use_cache: False regenerates every question instead of replaying cached responses
             
         Returns:
             List of all generated questions
         """
-        all_questions = []
+        # Collect one LLM request per chunk (or per chunk subtopic) up front
+        requests = []
         
         for assignment in chunk_assignments:
             chunk_id = assignment.get("chunk_id")
@@ -95,26 +131,39 @@ class QuestionAgent:
             
             if not chunk_topics:
                 # Generate general questions
-                questions = self._generate_general_questions(
-                    chunk_text, 
-                    target_count,
-                    assignment.get("difficulty_mix", ["medium"])
-                )
-                all_questions.extend(questions)
+                requests.append((
+                    self._generate_general_questions,
+                    (chunk_text, target_count, assignment.get("difficulty_mix", ["medium"]), use_cache)
+                ))
             else:
                 # Generate questions for each subtopic
                 for subtopic in chunk_topics[:1]:
                     # Determine difficulty for this question
                     difficulty = self._select_difficulty(assignment.get("difficulty_mix", ["medium"]))
                     
-                    # Generate questions
-                    questions = self.generate_questions_for_chunk(
-                        chunk={"text": chunk_text, "chunk_id": chunk_id, "page_number": assignment.get("page_number", 1)},
-                        subtopic=subtopic,
-                        count=max(1, target_count // len(chunk_topics)),
-                        difficulty=difficulty
-                    )
-                    all_questions.extend(questions)
+                    requests.append((
+                        self.generate_questions_for_chunk,
+                        (
+                            {"text": chunk_text, "chunk_id": chunk_id, "page_number": assignment.get("page_number", 1)},
+                            subtopic,
+                            max(1, target_count // len(chunk_topics)),
+                            difficulty,
+                            use_cache
+                        )
+                    ))
+        
+        # LLM round-trips dominate, so independent requests are issued concurrently
+        # (results keep the assignment order)
+        if len(requests) > 1:
+            workers = min(settings.LLM_MAX_CONCURRENCY, len(requests))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda request: request[0](*request[1]), requests))
+        else:
+            results = [generate(*args) for generate, args in requests]
+        
+        all_questions = []
+        for questions in results:
+            all_questions.extend(questions)
         
         logger.info(f"Generated total {len(all_questions)} questions")
         return all_questions
@@ -124,57 +173,41 @@ class QuestionAgent:
         Use normalized_topics subtopics and filter junk like years, page numbers, ISSN, etc.
         """
         normalized_topics = extracted_topics.get("normalized_topics", [])
-        all_subtopics = []
-
-        for topic in normalized_topics:
-            subs = topic.get("subtopics", [])
-            if isinstance(subs, list):
-                for s in subs:
-                    if not isinstance(s, str):
-                        continue
-                    s_clean = s.strip()
-
-                    # ❌ Reject numbers like 2014, 373, etc.
-                    if s_clean.isdigit():
-                        continue
-
-                    # ❌ Reject very short terms
-                    if len(s_clean) < 4:
-                        continue
 
-                    all_subtopics.append(s_clean)
+        def _iter_subtopics():
+            for topic in normalized_topics:
+                subs = topic.get("subtopics", [])
+                if isinstance(subs, list):
+                    for s in subs:
+                        if not isinstance(s, str):
+                            continue
+                        s_clean = s.strip()
 
-        # return top 3-5 topics (stable)
-        return all_subtopics[:5]
+                        # ❌ Reject numbers like 2014, 373, etc. and very short terms
+                        if not _JUNK_SUBTOPIC.fullmatch(s_clean):
+                            yield s_clean
 
+        # return top 3-5 topics (stable), stopping as soon as enough are found
+        return list(islice(_iter_subtopics(), 5))
 
-    
     def _select_difficulty(self, difficulty_mix: List[str]) -> str:
         """Select difficulty based on mix"""
         if not difficulty_mix:
             return "medium"
         
-        weights = []
-        difficulties = []
-        
-        # Assign weights based on typical distribution
-        for diff in difficulty_mix:
-            if diff == "easy":
-                weights.append(0.3)
-            elif diff == "medium":
-                weights.append(0.5)
-            elif diff == "hard":
-                weights.append(0.2)
-            difficulties.append(diff)
-        
-        # Normalize weights
-        total = sum(weights)
-        if total > 0:
-            weights = [w/total for w in weights]
+        difficulties, cdf = _difficulty_cdf(tuple(difficulty_mix))
+        if not difficulties:
+            return "medium"
         
-        return random.choices(difficulties, weights=weights, k=1)[0]
+        return difficulties[bisect.bisect_right(cdf, random.random())]
     
-    def _generate_general_questions(self, text: str, count: int, difficulty_mix: List[str]) -> List[Dict[str, Any]]:
+    def _generate_general_questions(
+        self,
+        text: str,
+        count: int,
+        difficulty_mix: List[str],
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         If no topics found, ask LLM to generate MCQs directly instead of sentence-meaning.
         """
@@ -189,7 +222,7 @@ class QuestionAgent:
             prompt += f"\nTarget difficulty: {difficulty.capitalize()}"
             prompt += "\nIMPORTANT: Generate MCQ questions only. Avoid 'What does this sentence mean' style."
 
-            response = llm_client.generate_json(prompt=prompt, system_prompt=self.system_prompt)
+            response = llm_cache.generate_json(prompt=prompt, system_prompt=self.system_prompt, use_cache=use_cache)
 
             questions = response.get("questions", [])
             for q in questions:
@@ -236,8 +269,7 @@ class QuestionAgent:
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """Simple sentence splitting"""
-        import re
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_RE.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
     def enrich_questions_with_metadata(
@@ -256,46 +288,26 @@ class QuestionAgent:
             Enriched questions
         """
         normalized_topics = topics_data.get("normalized_topics", [])
-        topic_mapping = topics_data.get("mapping", {})
+        map_topic = topics_data.get("mapping", {}).get
+        calculate_complexity = self._calculate_complexity
         
         for question in questions:
-            # Add topic information
-            subtopic = question.get("subtopic", "")
-            if subtopic in topic_mapping:
-                question["normalized_topic"] = topic_mapping[subtopic]
-            else:
-                question["normalized_topic"] = "General"
-            
-            # Add question order placeholder
-            question["question_order"] = 0
-            
-            # Add validation status
-            question["validation_status"] = "pending"
-            
-            # Calculate complexity score
-            question["complexity_score"] = self._calculate_complexity(question)
+            question.update(
+                normalized_topic=map_topic(question.get("subtopic", ""), "General"),
+                question_order=0,  # Order placeholder
+                validation_status="pending",
+                complexity_score=calculate_complexity(question)
+            )
         
         return questions
     
     def _calculate_complexity(self, question: Dict) -> float:
         """Calculate question complexity score"""
-        complexity = 0.5  # Base
-        
-        # Adjust based on difficulty
-        difficulty = question.get("difficulty", "medium")
-        if difficulty == "easy":
-            complexity -= 0.2
-        elif difficulty == "hard":
-            complexity += 0.2
-        
-        # Adjust based on question type
-        q_type = question.get("question_type", "")
-        if q_type == "mcq":
-            complexity += 0.1  # MCQs are generally easier
-        
-        # Adjust based on text length
-        question_text = question.get("question_text", "")
-        if len(question_text.split()) > 25:
-            complexity += 0.1
+        complexity = (
+            0.5  # Base
+            + _COMPLEXITY_DIFFICULTY_ADJ.get(question.get("difficulty", "medium"), 0.0)
+            + _COMPLEXITY_TYPE_ADJ.get(question.get("question_type", ""), 0.0)
+            + (0.1 if len(question.get("question_text", "").split()) > 25 else 0.0)
+        )
         
         return max(0.1, min(1.0, complexity))
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -11,7 +12,7 @@ import json
 from db.database import get_db
 from db.models import User, PDFDocument, Quiz, Question, Topic, StudentAttempt
 from schemas.pdf_schema import PDFUpload, PDFResponse, QuizCreate, QuizResponse, QuestionUpdate
-from schemas.quiz_schema import QuizWithQuestions, QuestionWithTopics
+from schemas.quiz_schema import QuizWithQuestions, QuestionWithTopics, QuestionResponse
 from services.admin_service import AdminService
 from services.quiz_pipeline_service import QuizPipelineService
 from api.auth_routes import get_current_admin_user
@@ -19,6 +20,10 @@ from config.settings import settings
 
 router = APIRouter()
 
+# List serializers for responses built from trusted DB rows (no re-validation)
+_PDF_LIST = TypeAdapter(List[PDFResponse])
+_QUIZ_LIST = TypeAdapter(List[QuizResponse])
+
 @router.post("/pdf/upload", response_model=PDFResponse)
 async def upload_pdf(
     background_tasks: BackgroundTasks,
@@ -83,7 +88,10 @@ async def list_pdfs(
                 pdf.pdf_metadata = json.loads(pdf.pdf_metadata)
             except Exception:
                 pdf.pdf_metadata = {}
-    return pdfs
+    return Response(
+        _PDF_LIST.dump_json([PDFResponse.from_orm_trusted(pdf) for pdf in pdfs]),
+        media_type="application/json"
+    )
 
 @router.get("/pdf/{pdf_id}", response_model=PDFResponse)
 async def get_pdf(
@@ -95,17 +103,18 @@ async def get_pdf(
     pdf = db.query(PDFDocument).filter(PDFDocument.id == pdf_id).first()
     if not pdf:
         raise HTTPException(status_code=404, detail="PDF not found")
-    return pdf
+    return Response(PDFResponse.from_orm_trusted(pdf).model_dump_json(), media_type="application/json")
 
 @router.post("/quiz/generate/{pdf_id}")
 async def generate_quiz(
     pdf_id: int,
     quiz_data: QuizCreate,
     background_tasks: BackgroundTasks,
+    regenerate: bool = False,
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Generate quiz from PDF"""
+    """Generate quiz from PDF (regenerate=true asks the LLM for new questions instead of replaying cached ones)"""
     pdf = db.query(PDFDocument).filter(PDFDocument.id == pdf_id).first()
     if not pdf:
         raise HTTPException(status_code=404, detail="PDF not found")
@@ -132,7 +141,8 @@ async def generate_quiz(
     background_tasks.add_task(
         QuizPipelineService.generate_quiz_background, #changed from process quiz background
         pdf_id,
-        quiz.id
+        quiz.id,
+        not regenerate
     )
     
     return {"message": "Quiz generation started", "quiz_id": quiz.id}
@@ -146,7 +156,10 @@ async def list_quizzes(
 ):
     """List all quizzes"""
     quizzes = db.query(Quiz).order_by(Quiz.created_at.desc()).offset(skip).limit(limit).all()
-    return quizzes
+    return Response(
+        _QUIZ_LIST.dump_json([QuizResponse.from_orm_trusted(quiz) for quiz in quizzes]),
+        media_type="application/json"
+    )
 
 @router.get("/quiz/{quiz_id}")
 async def get_quiz(
@@ -154,20 +167,20 @@ async def get_quiz(
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
-    if not quiz:
+    detail = AdminService(db).get_quiz_with_questions(quiz_id)
+    if detail is None:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    # Manually get questions
-    questions = db.query(Question).filter(Question.quiz_id == quiz_id).all()
-    
     # Build a clean response dictionary
     return {
-        "id": quiz.id,
-        "title": quiz.title,
-        "description": quiz.description,
-        "status": quiz.status,
-        "questions": questions # Pydantic will serialize this list
+        "id": detail.quiz.id,
+        "title": detail.quiz.title,
+        "description": detail.quiz.description,
+        "status": detail.quiz.status,
+        "questions": [
+            q.model_dump(mode="json", by_alias=True, exclude_none=True)
+            for q in detail.questions
+        ]
     }
 
 @router.put("/question/{question_id}")
@@ -190,7 +203,7 @@ async def update_question(
     db.commit()
     db.refresh(question)
     
-    return question
+    return Response(QuestionResponse.model_validate(question).to_json(), media_type="application/json")
 
 @router.delete("/question/{question_id}")
 async def delete_question(
@@ -4,12 +4,13 @@ from fastapi.staticfiles import StaticFiles
 import os
 
 from api import auth_routes, admin_routes, student_routes
-from db.database import engine
+from db.database import engine, upgrade_schema
 from db.models import Base
 
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema()
 
 app = FastAPI(
     title="PDF Quiz Platform API",
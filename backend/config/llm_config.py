@@ -1,11 +1,47 @@
 from openai import OpenAI
+import httpx
 from sentence_transformers import SentenceTransformer
 import logging
 from typing import List, Dict
+import hashlib
+import json
+import numpy as np
+import torch
 from config.settings import settings
+from utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Idle LLM connections stay open across the pipeline's throttling sleeps,
+# so consecutive calls reuse the TLS session instead of re-handshaking
+_LLM_KEEPALIVE_SECONDS = 30.0
+
+# orjson parses multi-KB model responses several times faster than the stdlib;
+# its decode error subclasses json.JSONDecodeError so callers are unaffected
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+
+def _response_key(model: str, system_prompt: str, prompt: str) -> str:
+    """Response cache key: cache version, model and both prompts (blake3 when installed)"""
+    data = "\0".join([settings.LLM_CACHE_VERSION, model, system_prompt or "", prompt]).encode("utf-8")
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
 class LLMClient:
     def __init__(self):
         logger.info(f"Initializing LLM with model: {settings.OPENAI_MODEL}")
@@ -17,9 +53,25 @@ class LLMClient:
         self.client = OpenAI(
             api_key=settings.OPENAI_API_KEY,
             base_url=settings.LLM_BASE_URL,
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONCURRENCY * 2,
+                    max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+                    keepalive_expiry=_LLM_KEEPALIVE_SECONDS
+                )
+            ),
         )
 
         self.model = settings.OPENAI_MODEL
+        # Shared by every agent and worker thread; a 429 that still gets
+        # through is retried by the OpenAI client, which honours Retry-After
+        self.rate_limiter = RateLimiter(settings.LLM_REQUESTS_PER_MINUTE, per=60.0)
+        # Raw JSON responses persist across runs for LLM_CACHE_TTL_SECONDS, so a
+        # retried or re-run step replays earlier answers instead of calling the API again
+        self.response_cache = (
+            diskcache.Cache(settings.LLM_CACHE_DIR)
+            if diskcache is not None and settings.LLM_CACHE_DIR else None
+        )
         self.embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
 
         
@@ -29,6 +81,7 @@ class LLMClient:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        self.rate_limiter.acquire()
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -40,28 +93,60 @@ class LLMClient:
             logger.error(f"LLM API error: {e}")
             raise
     
-    def generate_json(self, prompt: str, system_prompt: str = None) -> Dict:
+    def generate_json(self, prompt: str, system_prompt: str = None, use_cache: bool = True) -> Dict:
+        """
+        Generate a JSON response, replaying a cached one for an identical request
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            use_cache: False always calls the API and leaves the response cache untouched
+
+        Returns:
+            Parsed JSON response
+        """
+        use_cache = use_cache and self.response_cache is not None
+        key = _response_key(self.model, system_prompt, prompt) if use_cache else None
+        if key is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return _json_loads(cached)
+
         response = self.generate(
             prompt=prompt,
             system_prompt=system_prompt,
             response_format={"type": "json_object"}
         )
-        
-        return json.loads(response)
+        parsed = _json_loads(response)
+
+        # Only responses that parsed are worth replaying
+        if key is not None:
+            self.response_cache.set(key, response, expire=settings.LLM_CACHE_TTL_SECONDS)
+        return parsed
 
 class EmbeddingModel:
     def __init__(self):
         self.model_name = settings.EMBEDDING_MODEL  # e.g. "all-MiniLM-L6-v2"
         self.model = SentenceTransformer(self.model_name)
+        self.model.eval()
     
     def embed(self, text: str) -> List[float]:
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        # inference_mode skips autograd bookkeeping entirely
+        with torch.inference_mode():
+            embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding.tolist()
     
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        with torch.inference_mode():
+            embeddings = self.model.encode(texts, convert_to_numpy=True)
         return embeddings.tolist()
 
+    def embed_batch_array(self, texts: List[str]) -> np.ndarray:
+        """embed_batch, but returns the (len(texts), dim) float32 matrix without converting to lists"""
+        with torch.inference_mode():
+            embeddings = self.model.encode(texts, convert_to_numpy=True, batch_size=settings.EMBEDDING_BATCH_SIZE)
+        return np.asarray(embeddings, dtype=np.float32)
+
 
 # Global instances
 llm_client = LLMClient()
@@ -110,38 +110,100 @@ class EmbeddingManager:
             if not embeddings:
                 raise ValueError("No embeddings found in chunks")
             
-            # Convert to numpy arrays
-            embeddings_array = np.array(embeddings, dtype=np.float32)
+            return self._save_vector_index(np.array(embeddings, dtype=np.float32), metadata, index_name)
             
-            # Create index directory
-            index_dir = os.path.join(self.vector_index_dir, index_name)
-            os.makedirs(index_dir, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Error creating vector index: {e}")
+            raise
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into one float32 matrix
+        
+        All texts go to the model in a single encode call, so the whole set
+        is length-sorted before it is split into EMBEDDING_BATCH_SIZE batches
+        and each batch pads as little as possible.
+        
+        Args:
+            texts: Texts to embed
             
-            # Save embeddings and metadata
-            index_data = {
-                "embeddings": embeddings_array,
-                "metadata": metadata,
-                "created_at": datetime.utcnow().isoformat(),
-                "total_vectors": len(embeddings),
-                "embedding_dim": embeddings_array.shape[1]
-            }
+        Returns:
+            float32 array of shape (len(texts), dim); row i embeds texts[i]
+        """
+        return embedding_model.embed_batch_array(texts)
+    
+    def create_chunk_index(self, chunks: List[Any], index_name: str) -> str:
+        """
+        Embed chunks and save them as a vector index
+        
+        Same on-disk index as create_vector_index, but texts are embedded
+        straight into one float32 matrix instead of being attached to
+        per-chunk dicts as lists and re-collected.
+        
+        Args:
+            chunks: Chunk dataclasses (core.page_chunker.Chunk)
+            index_name: Name for the index
             
-            index_path = os.path.join(index_dir, "vector_index.pkl")
-            with open(index_path, 'wb') as f:
-                pickle.dump(index_data, f)
+        Returns:
+            Path to saved index
+        """
+        try:
+            if not chunks:
+                raise ValueError("No embeddings found in chunks")
             
-            # Save metadata separately for easy access
-            metadata_path = os.path.join(index_dir, "metadata.json")
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            embeddings = self.embed_texts([chunk.text for chunk in chunks])
+            metadata = [
+                {
+                    "chunk_id": chunk.chunk_id,
+                    "page_number": chunk.page_number,
+                    "text_preview": chunk.text[:200],
+                    "word_count": chunk.word_count,
+                    "previous_page_ref": chunk.previous_page_ref,
+                    "next_page_ref": chunk.next_page_ref,
+                    "metadata": chunk.metadata
+                }
+                for chunk in chunks
+            ]
+            logger.info(f"Generated embeddings for {len(chunks)} chunks")
             
-            logger.info(f"Created vector index at {index_path} with {len(embeddings)} vectors")
-            return index_path
+            return self._save_vector_index(embeddings, metadata, index_name)
             
         except Exception as e:
             logger.error(f"Error creating vector index: {e}")
             raise
     
+    def _save_vector_index(
+        self, 
+        embeddings_array: np.ndarray, 
+        metadata: List[Dict[str, Any]], 
+        index_name: str
+    ) -> str:
+        """Pickle embeddings + metadata under index_name and return the index path"""
+        # Create index directory
+        index_dir = os.path.join(self.vector_index_dir, index_name)
+        os.makedirs(index_dir, exist_ok=True)
+        
+        # Save embeddings and metadata
+        index_data = {
+            "embeddings": embeddings_array,
+            "metadata": metadata,
+            "created_at": datetime.utcnow().isoformat(),
+            "total_vectors": len(embeddings_array),
+            "embedding_dim": embeddings_array.shape[1]
+        }
+        
+        index_path = os.path.join(index_dir, "vector_index.pkl")
+        with open(index_path, 'wb') as f:
+            pickle.dump(index_data, f)
+        
+        # Save metadata separately for easy access
+        metadata_path = os.path.join(index_dir, "metadata.json")
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        
+        logger.info(f"Created vector index at {index_path} with {len(embeddings_array)} vectors")
+        return index_path
+    
     def load_vector_index(self, index_path: str) -> Dict[str, Any]:
         """
         Load vector index from file
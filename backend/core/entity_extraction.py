@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Sequence, Tuple, Set
 import logging
 from collections import Counter
 import spacy
@@ -7,6 +7,10 @@ from config.llm_config import llm_client
 
 logger = logging.getLogger(__name__)
 
+# Character cap per text handed to spaCy, and texts per nlp.pipe batch
+_MAX_SPACY_CHARS = 1000000
+_SPACY_BATCH_SIZE = 32
+
 class EntityExtractor:
     def __init__(self):
         try:
@@ -28,10 +32,12 @@ class EntityExtractor:
         Returns:
             Entity extraction results
         """
-        text = chunk.get("text", "")
-        chunk_id = chunk.get("chunk_id", "")
-        page_number = chunk.get("page_number", 1)
-        
+        return self._extract_entities(
+            chunk.get("text", ""), chunk.get("chunk_id", ""), chunk.get("page_number", 1)
+        )
+    
+    def _extract_entities(self, text: str, chunk_id: str, page_number: int) -> Dict[str, Any]:
+        """Single-text extraction shared by the dict and column entry points"""
         if not text:
             return {
                 "chunk_id": chunk_id,
@@ -50,10 +56,70 @@ class EntityExtractor:
             logger.error(f"Error extracting entities: {e}")
             return self._extract_with_llm_fallback(text, chunk_id, page_number)
     
+    def extract_entities_from_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract entities from many chunks, batching texts through nlp.pipe
+        
+        Args:
+            chunks: List of chunk dictionaries with text
+            
+        Returns:
+            Entity extraction results, one per chunk in input order
+        """
+        return self.extract_entities_from_columns(
+            [chunk.get("text", "") for chunk in chunks],
+            [chunk.get("chunk_id", "") for chunk in chunks],
+            [chunk.get("page_number", 1) for chunk in chunks]
+        )
+    
+    def extract_entities_from_columns(
+        self,
+        texts: Sequence[str],
+        chunk_ids: Sequence[str],
+        page_numbers: Sequence[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract entities from parallel text / id / page columns
+        
+        Same results as extract_entities_from_chunks, but takes plain lists
+        read straight off the chunker output so no per-chunk dicts are built.
+        
+        Args:
+            texts: Chunk texts
+            chunk_ids: Chunk IDs, aligned with texts
+            page_numbers: Page numbers, aligned with texts
+            
+        Returns:
+            Entity extraction results, one per text in input order
+        """
+        if not self.use_spacy:
+            return [self._extract_entities(*row) for row in zip(texts, chunk_ids, page_numbers)]
+        
+        results: List[Any] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text]
+        
+        try:
+            docs = self.nlp.pipe(
+                (texts[i][:_MAX_SPACY_CHARS] for i in pending),
+                batch_size=_SPACY_BATCH_SIZE
+            )
+            for i, doc in zip(pending, docs):
+                results[i] = self._entities_from_doc(doc, chunk_ids[i], page_numbers[i])
+        except Exception as e:
+            logger.error(f"Error in batched entity extraction, continuing per chunk: {e}")
+        
+        # Empty texts and anything the batch did not finish go through the single-text path
+        return [
+            result if result is not None else self._extract_entities(*row)
+            for result, row in zip(results, zip(texts, chunk_ids, page_numbers))
+        ]
+    
     def _extract_with_spacy(self, text: str, chunk_id: str, page_num: int) -> Dict[str, Any]:
         """Extract entities using spaCy"""
-        doc = self.nlp(text[:1000000])  # Limit text length
-        
+        return self._entities_from_doc(self.nlp(text[:_MAX_SPACY_CHARS]), chunk_id, page_num)
+    
+    def _entities_from_doc(self, doc, chunk_id: str, page_num: int) -> Dict[str, Any]:
+        """Build extraction results from a processed spaCy Doc"""
         entities_by_type = {}
         all_entities = []
         
@@ -1,17 +1,108 @@
 import re
 from typing import Dict, List, Any, Tuple
 import logging
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+import gzip
 import hashlib
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blingfire import text_to_sentences
+except ImportError:
+    text_to_sentences = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Paragraph breaks, sentence boundaries and missing space after punctuation
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+_MISSING_SPACE_RE = re.compile(r'([.!?])([A-Z])')
+
+# Documents with at least this many pages are chunked on a thread pool
+_PARALLEL_MIN_PAGES = 64
+_PARALLEL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Buffer size for chunk file writes
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Word-count boundaries between small, medium and large chunks
+_SIZE_BUCKET_BOUNDS = np.array([300, 700])
+
+
+def _split_sentences(paragraph: str) -> List[str]:
+    """Sentence split via blingfire's compiled tokenizer when installed, regex otherwise"""
+    if text_to_sentences is not None:
+        # One sentence per line, whitespace inside sentences normalized
+        return text_to_sentences(paragraph).split("\n")
+    return _SENTENCE_BOUNDARY_RE.split(paragraph)
+
+
+def _overlap_from_words(words: List[str], position: str, ratio: float) -> str:
+    """Leading or trailing share of words, joined back into text"""
+    overlap_word_count = int(len(words) * ratio)
+    
+    if position == "start":
+        overlap_words = words[:overlap_word_count]
+    elif position == "end":
+        overlap_words = words[-overlap_word_count:]
+    else:
+        return ""
+    
+    return " ".join(overlap_words)
+
+
+# Text helpers below are pure, so repeated calls on the same page text (e.g.
+# running several chunking strategies over one PDF) reuse earlier results
+@lru_cache(maxsize=2048)
+def _overlap_text(text: str, position: str, ratio: float) -> str:
+    return _overlap_from_words(text.split(), position, ratio)
+
+
+@lru_cache(maxsize=2048)
+def _split_paragraphs(text: str) -> Tuple[str, ...]:
+    """Non-empty, stripped paragraphs split on blank lines"""
+    return tuple(
+        para for para in (p.strip() for p in _PARAGRAPH_RE.split(text)) if para
+    )
+
+
+@lru_cache(maxsize=2048)
+def _contains_headings(text: str) -> bool:
+    """Heading-like line (short 'Title:' or ALL CAPS) among the first three lines"""
+    # maxsplit stops after the first few lines
+    for line in text.split('\n', 3)[:3]:
+        line = line.strip()
+        if not line:
+            continue
+        if line.endswith(':') and len(line.split()) <= 10:
+            return True
+        if len(line) < 100 and line.isupper():
+            return True
+    return False
+
+
+@lru_cache(maxsize=1)
+def _utc_stamp(epoch_second: int) -> str:
+    """Second-resolution UTC timestamp for chunk IDs; formatted once per second"""
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+
+@dataclass(slots=True)
 class Chunk:
-    """Chunk data structure"""
+    """Chunk data structure (slotted: large PDFs produce thousands of these)"""
     chunk_id: str
     text: str
     page_number: int
@@ -48,60 +139,22 @@ class PageChunker:
         Returns:
             List of chunks with overlap
         """
-        chunks = []
-        
-        for i, page in enumerate(pages):
-            page_number = page.get("page_number", i + 1)
-            page_text = page.get("text", "")
-            
-            if not page_text or len(page_text.split()) < self.min_chunk_size:
-                # If page is too small, combine with neighboring pages
-                combined_chunks = self._handle_small_page(pages, i)
-                chunks.extend(combined_chunks)
-                continue
-            
-            # Get text from previous page for overlap
-            prev_overlap = ""
-            if i > 0:
-                prev_page_text = pages[i-1].get("text", "")
-                if prev_page_text:
-                    prev_overlap = self._get_overlap_text(prev_page_text, "end")
-            
-            # Get text from next page for overlap
-            next_overlap = ""
-            if i < len(pages) - 1:
-                next_page_text = pages[i+1].get("text", "")
-                if next_page_text:
-                    next_overlap = self._get_overlap_text(next_page_text, "start")
-            
-            # Create chunk with overlaps
-            chunk_text = prev_overlap + "\n" + page_text + "\n" + next_overlap
-            chunk_text = self._clean_chunk_text(chunk_text)
-            
-            # Create chunk
-            chunk = Chunk(
-                chunk_id=self._generate_chunk_id(page_number, 0),
-                text=chunk_text,
-                page_number=page_number,
-                start_char=0,
-                end_char=len(chunk_text),
-                word_count=len(chunk_text.split()),
-                metadata={
-                    "original_page": page_number,
-                    "has_prev_overlap": bool(prev_overlap),
-                    "has_next_overlap": bool(next_overlap),
-                    "prev_page": i if i > 0 else None,
-                    "next_page": i + 2 if i < len(pages) - 1 else None,
-                    "overlap_ratio": self.overlap_ratio,
-                    "chunk_type": "page_with_overlap"
-                },
-                previous_page_ref=f"page_{i}" if i > 0 else "",
-                next_page_ref=f"page_{i+2}" if i < len(pages) - 1 else ""
-            )
-            
-            chunks.append(chunk)
+        if len(pages) >= _PARALLEL_MIN_PAGES:
+            # Split every page up front so workers only read the shared cache
+            words_cache = {i: page.get("text", "").split() for i, page in enumerate(pages)}
+            with ThreadPoolExecutor(max_workers=_PARALLEL_MAX_WORKERS) as executor:
+                page_chunks = executor.map(
+                    lambda i: self._build_page_chunks(pages, i, words_cache), range(len(pages))
+                )
+                chunks = [chunk for group in page_chunks for chunk in group]
+        else:
+            chunks = []
+            words_cache: Dict[int, List[str]] = {}
             
-            logger.debug(f"Created chunk for page {page_number}: {chunk.word_count} words")
+            for i in range(len(pages)):
+                # Only the previous, current and next pages are ever needed
+                words_cache.pop(i - 2, None)
+                chunks.extend(self._build_page_chunks(pages, i, words_cache))
         
         logger.info(f"Created {len(chunks)} chunks from {len(pages)} pages")
         return chunks
@@ -140,8 +193,8 @@ class PageChunker:
                 para_words = len(paragraph.split())
                 if para_words > self.max_chunk_size:
                     # Split large paragraph
-                    sub_chunks = self._split_large_paragraph(paragraph)
-                    for sub_idx, sub_chunk in enumerate(sub_chunks):
+                    sub_chunks = self._split_large_paragraph_counted(paragraph)
+                    for sub_idx, (sub_chunk, sub_words) in enumerate(sub_chunks):
                         chunk = self._create_semantic_chunk(
                             sub_chunk,
                             page_number,
@@ -149,7 +202,8 @@ class PageChunker:
                             para_idx,
                             sub_idx,
                             i,
-                            pages
+                            pages,
+                            sub_words
                         )
                         chunks.append(chunk)
                         chunk_counter += 1
@@ -162,7 +216,8 @@ class PageChunker:
                         para_idx,
                         0,
                         i,
-                        pages
+                        pages,
+                        para_words
                     )
                     chunks.append(chunk)
                     chunk_counter += 1
@@ -210,16 +265,20 @@ class PageChunker:
         overlap_words = int(window_size * self.overlap_ratio)
         step_size = window_size - overlap_words
         
+        # Join once and slice windows out by character offset: word j starts at
+        # word_starts[j], and the word before it ends one separator earlier
+        joined = " ".join(words)
+        word_starts = list(accumulate(map(len, words), lambda offset, length: offset + length + 1, initial=0))
+        
         # Create sliding windows
         for i in range(0, len(words) - overlap_words, step_size):
             end_idx = min(i + window_size, len(words))
-            chunk_words = words[i:end_idx]
-            chunk_text = " ".join(chunk_words)
+            chunk_text = joined[word_starts[i]:word_starts[end_idx] - 1]
             
-            # Get context from previous window if available
+            # Get context from previous window if available (only a preview is kept)
             context_start = max(0, i - overlap_words)
-            context_words = words[context_start:i]
-            context_text = " ".join(context_words) if context_words else ""
+            context_end = min(word_starts[i] - 1, word_starts[context_start] + 100)
+            context_text = joined[word_starts[context_start]:context_end] if context_start < i else ""
             
             chunk = Chunk(
                 chunk_id=self._generate_chunk_id(page_number, i),
@@ -227,14 +286,14 @@ class PageChunker:
                 page_number=page_number,
                 start_char=i,  # Approximate character position
                 end_char=end_idx,
-                word_count=len(chunk_words),
+                word_count=end_idx - i,
                 metadata={
                     "chunk_type": "sliding_window",
                     "window_start": i,
                     "window_end": end_idx,
                     "window_size": window_size,
                     "overlap_words": overlap_words,
-                    "context_preview": context_text[:100] + "..." if context_text else ""
+                    "context_preview": context_text + "..." if context_text else ""
                 },
                 previous_page_ref=f"window_{i-step_size}" if i > 0 else ""
             )
@@ -244,10 +303,83 @@ class PageChunker:
         logger.info(f"Created {len(chunks)} sliding window chunks")
         return chunks
     
+    def _build_page_chunks(
+        self, 
+        pages: List[Dict], 
+        i: int, 
+        words_cache: Dict[int, List[str]]
+    ) -> List[Chunk]:
+        """
+        Build the overlap chunk (or combined small-page chunk) for one page
+        
+        Args:
+            pages: All pages
+            i: Index of the page to chunk
+            words_cache: Split words per page index
+            
+        Returns:
+            Chunks produced for this page, in order
+        """
+        page = pages[i]
+        page_number = page.get("page_number", i + 1)
+        page_text = page.get("text", "")
+        
+        if not page_text or len(self._page_words(pages, i, words_cache)) < self.min_chunk_size:
+            # If page is too small, combine with neighboring pages
+            return self._handle_small_page(pages, i, words_cache)
+        
+        # Get text from previous page for overlap
+        prev_overlap = ""
+        if i > 0:
+            prev_page_text = pages[i-1].get("text", "")
+            if prev_page_text:
+                prev_overlap = self._get_overlap_text(
+                    prev_page_text, "end", self._page_words(pages, i - 1, words_cache)
+                )
+        
+        # Get text from next page for overlap
+        next_overlap = ""
+        if i < len(pages) - 1:
+            next_page_text = pages[i+1].get("text", "")
+            if next_page_text:
+                next_overlap = self._get_overlap_text(
+                    next_page_text, "start", self._page_words(pages, i + 1, words_cache)
+                )
+        
+        # Create chunk with overlaps
+        chunk_text = prev_overlap + "\n" + page_text + "\n" + next_overlap
+        chunk_text, chunk_word_count = self._clean_chunk_text_counted(chunk_text)
+        
+        # Create chunk
+        chunk = Chunk(
+            chunk_id=self._generate_chunk_id(page_number, 0),
+            text=chunk_text,
+            page_number=page_number,
+            start_char=0,
+            end_char=len(chunk_text),
+            word_count=chunk_word_count,
+            metadata={
+                "original_page": page_number,
+                "has_prev_overlap": bool(prev_overlap),
+                "has_next_overlap": bool(next_overlap),
+                "prev_page": i if i > 0 else None,
+                "next_page": i + 2 if i < len(pages) - 1 else None,
+                "overlap_ratio": self.overlap_ratio,
+                "chunk_type": "page_with_overlap"
+            },
+            previous_page_ref=f"page_{i}" if i > 0 else "",
+            next_page_ref=f"page_{i+2}" if i < len(pages) - 1 else ""
+        )
+        
+        logger.debug(f"Created chunk for page {page_number}: {chunk.word_count} words")
+        
+        return [chunk]
+    
     def _handle_small_page(
         self, 
         pages: List[Dict], 
-        page_index: int
+        page_index: int,
+        words_cache: Dict[int, List[str]] = None
     ) -> List[Chunk]:
         """
         Handle small pages by combining with neighbors
@@ -255,28 +387,35 @@ class PageChunker:
         Args:
             pages: All pages
             page_index: Index of small page
+            words_cache: Split words per page index, shared with the caller
             
         Returns:
             List of combined chunks
         """
+        if words_cache is None:
+            words_cache = {}
+        
         current_page = pages[page_index]
         page_number = current_page.get("page_number", page_index + 1)
         current_text = current_page.get("text", "")
+        current_word_count = len(self._page_words(pages, page_index, words_cache))
         
         # Try to combine with next page
         if page_index < len(pages) - 1:
             next_page = pages[page_index + 1]
             next_text = next_page.get("text", "")
             combined_text = current_text + "\n" + next_text
+            # Joined on a newline, so no words merge across the page boundary
+            combined_word_count = current_word_count + len(self._page_words(pages, page_index + 1, words_cache))
             
-            if len(combined_text.split()) >= self.min_chunk_size:
+            if combined_word_count >= self.min_chunk_size:
                 chunk = Chunk(
                     chunk_id=self._generate_chunk_id(page_number, 0),
                     text=combined_text,
                     page_number=page_number,
                     start_char=0,
                     end_char=len(combined_text),
-                    word_count=len(combined_text.split()),
+                    word_count=combined_word_count,
                     metadata={
                         "original_pages": [page_number, page_number + 1],
                         "chunk_type": "combined_pages",
@@ -291,15 +430,16 @@ class PageChunker:
             prev_page = pages[page_index - 1]
             prev_text = prev_page.get("text", "")
             combined_text = prev_text + "\n" + current_text
+            combined_word_count = len(self._page_words(pages, page_index - 1, words_cache)) + current_word_count
             
-            if len(combined_text.split()) >= self.min_chunk_size:
+            if combined_word_count >= self.min_chunk_size:
                 chunk = Chunk(
                     chunk_id=self._generate_chunk_id(page_number - 1, 0),
                     text=combined_text,
                     page_number=page_number - 1,
                     start_char=0,
                     end_char=len(combined_text),
-                    word_count=len(combined_text.split()),
+                    word_count=combined_word_count,
                     metadata={
                         "original_pages": [page_number - 1, page_number],
                         "chunk_type": "combined_pages",
@@ -316,7 +456,7 @@ class PageChunker:
             page_number=page_number,
             start_char=0,
             end_char=len(current_text),
-            word_count=len(current_text.split()),
+            word_count=current_word_count,
             metadata={
                 "chunk_type": "small_page",
                 "warning": "page_below_minimum_size"
@@ -324,46 +464,50 @@ class PageChunker:
         )
         return [chunk]
     
-    def _get_overlap_text(self, text: str, position: str) -> str:
+    def _page_words(
+        self, 
+        pages: List[Dict], 
+        page_index: int, 
+        words_cache: Dict[int, List[str]]
+    ) -> List[str]:
+        """Split a page's text once per chunking pass"""
+        words = words_cache.get(page_index)
+        if words is None:
+            words = words_cache[page_index] = pages[page_index].get("text", "").split()
+        return words
+    
+    def _get_overlap_text(self, text: str, position: str, words: List[str] = None) -> str:
         """
         Get overlap text from a page
         
         Args:
             text: Page text
             position: 'start' or 'end'
+            words: Already split words of text, if available
             
         Returns:
             Overlap text
         """
-        words = text.split()
-        overlap_word_count = int(len(words) * self.overlap_ratio)
-        
-        if position == "start":
-            overlap_words = words[:overlap_word_count]
-        elif position == "end":
-            overlap_words = words[-overlap_word_count:]
-        else:
-            return ""
-        
-        return " ".join(overlap_words)
+        if words is None:
+            return _overlap_text(text, position, self.overlap_ratio)
+        return _overlap_from_words(words, position, self.overlap_ratio)
     
     def _split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs"""
-        # Split by double newlines
-        paragraphs = re.split(r'\n\s*\n', text)
-        
-        # Clean paragraphs
-        cleaned_paragraphs = []
-        for para in paragraphs:
-            para = para.strip()
-            if para:
-                cleaned_paragraphs.append(para)
-        
-        return cleaned_paragraphs
+        return list(_split_paragraphs(text))
     
     def _split_large_paragraph(self, paragraph: str) -> List[str]:
         """Split large paragraph into smaller chunks"""
-        sentences = re.split(r'(?<=[.!?])\s+', paragraph)
+        return [chunk for chunk, _ in self._split_large_paragraph_counted(paragraph)]
+    
+    def _split_large_paragraph_counted(self, paragraph: str) -> List[Tuple[str, int]]:
+        """
+        Split large paragraph into smaller chunks, keeping each chunk's word count
+        
+        Sentences carry no surrounding whitespace, so joining them with a space
+        never merges words and a chunk's word count is the sum of its sentences'.
+        """
+        sentences = _split_sentences(paragraph)
         
         chunks = []
         current_chunk = []
@@ -376,12 +520,12 @@ class PageChunker:
             if current_word_count + sentence_word_count > self.max_chunk_size:
                 # Finish current chunk
                 if current_chunk:
-                    chunks.append(" ".join(current_chunk))
+                    chunks.append((" ".join(current_chunk), current_word_count))
                     current_chunk = [sentence]
                     current_word_count = sentence_word_count
                 else:
                     # Sentence itself is too large
-                    chunks.append(sentence)
+                    chunks.append((sentence, sentence_word_count))
                     current_word_count = 0
             else:
                 current_chunk.append(sentence)
@@ -389,7 +533,7 @@ class PageChunker:
         
         # Add last chunk
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
+            chunks.append((" ".join(current_chunk), current_word_count))
         
         return chunks
     
@@ -401,9 +545,10 @@ class PageChunker:
         para_idx: int,
         sub_idx: int,
         page_index: int,
-        pages: List[Dict]
+        pages: List[Dict],
+        word_count: int = None
     ) -> Chunk:
-        """Create a semantic chunk"""
+        """Create a semantic chunk (word_count is recounted from text when not given)"""
         # Get context from previous paragraph if available
         prev_ref = ""
         if para_idx > 0 or sub_idx > 0:
@@ -425,7 +570,7 @@ class PageChunker:
             page_number=page_number,
             start_char=0,
             end_char=len(text),
-            word_count=len(text.split()),
+            word_count=len(text.split()) if word_count is None else word_count,
             metadata={
                 "chunk_type": "semantic",
                 "paragraph_index": para_idx,
@@ -440,34 +585,38 @@ class PageChunker:
     
     def _contains_headings(self, text: str) -> bool:
         """Check if text contains potential headings"""
-        # Simple heading detection
-        lines = text.split('\n')
-        for line in lines[:3]:  # Check first few lines
-            line = line.strip()
-            if line and len(line.split()) <= 10 and line.endswith(':'):
-                return True
-            if line and line.isupper() and len(line) < 100:
-                return True
-        return False
+        return _contains_headings(text)
+    
+    @staticmethod
+    def clear_text_caches():
+        """Drop memoized overlap/paragraph/heading results once a document is done"""
+        _overlap_text.cache_clear()
+        _split_paragraphs.cache_clear()
+        _contains_headings.cache_clear()
     
     def _clean_chunk_text(self, text: str) -> str:
         """Clean chunk text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        return self._clean_chunk_text_counted(text)[0]
+    
+    def _clean_chunk_text_counted(self, text: str) -> Tuple[str, int]:
+        """
+        Clean chunk text and count its words without splitting the result again
         
-        # Remove leading/trailing whitespace
-        text = text.strip()
+        Each inserted space after punctuation splits exactly one word in two,
+        so the cleaned word count is the split count plus the substitutions.
+        """
+        # Collapse whitespace runs and trim both ends in one C-level pass
+        words = text.split()
         
         # Ensure proper spacing after punctuation
-        text = re.sub(r'([.!?])([A-Z])', r'\1 \2', text)
+        text, fixes = _MISSING_SPACE_RE.subn(r'\1 \2', " ".join(words))
         
-        return text
+        return text, len(words) + fixes
     
     def _generate_chunk_id(self, page_number: int, position: int) -> str:
         """Generate unique chunk ID"""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        unique_str = f"{page_number}_{position}_{timestamp}"
-        return hashlib.md5(unique_str.encode()).hexdigest()[:8]
+        unique_str = f"{page_number}_{position}_{_utc_stamp(int(time.time()))}"
+        return hashlib.blake2b(unique_str.encode(), digest_size=4).hexdigest()
     
     def save_chunks_to_file(
         self, 
@@ -475,7 +624,7 @@ class PageChunker:
         output_path: str
     ) -> str:
         """
-        Save chunks to JSON file
+        Save chunks to JSON file (gzip-compressed when output_path ends in .gz)
         
         Args:
             chunks: List of chunks
@@ -484,30 +633,45 @@ class PageChunker:
         Returns:
             Path to saved file
         """
-        # Convert chunks to dictionaries
-        chunk_dicts = []
-        for chunk in chunks:
-            chunk_dict = {
-                "chunk_id": chunk.chunk_id,
-                "text": chunk.text,
-                "page_number": chunk.page_number,
-                "start_char": chunk.start_char,
-                "end_char": chunk.end_char,
-                "word_count": chunk.word_count,
-                "metadata": chunk.metadata,
-                "previous_page_ref": chunk.previous_page_ref,
-                "next_page_ref": chunk.next_page_ref
-            }
-            chunk_dicts.append(chunk_dict)
-        
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Save to JSON
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chunk_dicts, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Saved {len(chunk_dicts)} chunks to {output_path}")
+        # Serialize to JSON
+        if orjson is not None:
+            # orjson serializes the Chunk dataclasses directly, field by field
+            payload = orjson.dumps(chunks, option=orjson.OPT_INDENT_2)
+        else:
+            chunk_dicts = [
+                {
+                    "chunk_id": chunk.chunk_id,
+                    "text": chunk.text,
+                    "page_number": chunk.page_number,
+                    "start_char": chunk.start_char,
+                    "end_char": chunk.end_char,
+                    "word_count": chunk.word_count,
+                    "metadata": chunk.metadata,
+                    "previous_page_ref": chunk.previous_page_ref,
+                    "next_page_ref": chunk.next_page_ref
+                }
+                for chunk in chunks
+            ]
+            payload = json.dumps(chunk_dicts, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        if output_path.endswith('.gz'):
+            payload = gzip.compress(payload, compresslevel=6)
+        
+        # Write next to the target and rename, so a crash never leaves a truncated file
+        tmp_path = output_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(payload)
+            os.replace(tmp_path, output_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        logger.info(f"Saved {len(chunks)} chunks to {output_path}")
         return output_path
     
     def analyze_chunks(self, chunks: List[Chunk]) -> Dict[str, Any]:
@@ -523,29 +687,29 @@ class PageChunker:
         if not chunks:
             return {"error": "No chunks provided"}
         
-        word_counts = [chunk.word_count for chunk in chunks]
-        page_numbers = [chunk.page_number for chunk in chunks]
+        word_counts = np.fromiter((chunk.word_count for chunk in chunks), dtype=np.int64, count=len(chunks))
+        total_words = int(word_counts.sum())
+        
+        # Chunks below 300 words are small, below 700 medium, otherwise large
+        small, medium, large = np.bincount(
+            np.searchsorted(_SIZE_BUCKET_BOUNDS, word_counts, side="right"), minlength=3
+        ).tolist()
         
         # Calculate statistics
         stats = {
             "total_chunks": len(chunks),
-            "total_words": sum(word_counts),
-            "average_words_per_chunk": sum(word_counts) / len(chunks),
-            "min_words": min(word_counts),
-            "max_words": max(word_counts),
-            "pages_covered": len(set(page_numbers)),
-            "chunk_types": {},
+            "total_words": total_words,
+            "average_words_per_chunk": total_words / len(chunks),
+            "min_words": int(word_counts.min()),
+            "max_words": int(word_counts.max()),
+            "pages_covered": len({chunk.page_number for chunk in chunks}),
+            "chunk_types": dict(Counter(chunk.metadata.get("chunk_type", "unknown") for chunk in chunks)),
             "size_distribution": {
-                "small": len([w for w in word_counts if w < 300]),
-                "medium": len([w for w in word_counts if 300 <= w < 700]),
-                "large": len([w for w in word_counts if w >= 700])
+                "small": small,
+                "medium": medium,
+                "large": large
             }
         }
         
-        # Count chunk types
-        for chunk in chunks:
-            chunk_type = chunk.metadata.get("chunk_type", "unknown")
-            stats["chunk_types"][chunk_type] = stats["chunk_types"].get(chunk_type, 0) + 1
-        
         logger.info(f"Chunk analysis: {stats}")
         return stats
\ No newline at end of file
@@ -4,11 +4,39 @@ from typing import Dict, List, Any, Tuple
 import logging
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Buffer size for artifact writes
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Extraction artifacts are a record for humans, nothing in the pipeline reads
+# them back, so their disk writes run off the pipeline thread (one worker
+# keeps writes ordered)
+_artifact_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+
+
+def _write_artifacts(files: List[Tuple[str, bytes]]):
+    for path, payload in files:
+        # Rename into place so readers never see a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+
+def _log_write_failure(future):
+    if future.exception() is not None:
+        logger.error(f"Failed to write extraction artifacts: {future.exception()}")
+
 @dataclass
 class PDFMetadata:
     """Metadata for PDF document"""
@@ -332,21 +360,24 @@ class PDFIngestion:
             }
         }
         
-        # Save to JSON
+        # Serialize here so later changes to pages can't race the background write
         results_path = os.path.join(results_dir, "extraction_results.json")
-        with open(results_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            payload = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+        files = [(results_path, payload)]
         
-        # Save raw text for each page
+        # Raw text for each page
         for page in pages:
             if page.get("has_text"):
                 page_num = page["page_number"]
-                text = page["text"]
                 text_path = os.path.join(results_dir, f"page_{page_num:03d}.txt")
-                with open(text_path, "w", encoding="utf-8") as f:
-                    f.write(text)
+                files.append((text_path, page["text"].encode("utf-8")))
+        
+        _artifact_writer.submit(_write_artifacts, files).add_done_callback(_log_write_failure)
         
-        logger.info(f"Saved extraction results to {results_path}")
+        logger.info(f"Saving extraction results to {results_path}")
         return results_path
     
     def _clean_text(self, text: str) -> str:
@@ -328,7 +328,7 @@ class VectorStore:
                     "text": chunk.text,
                     "page_number": chunk.page_number,
                     "word_count": chunk.word_count,
-                    "embedding": json.loads(chunk.embedding) if chunk.embedding else None
+                    "embedding": list(chunk.embedding) if chunk.embedding is not None else None
                 }
             
             # Fallback to metadata file
@@ -418,10 +418,10 @@ class VectorStore:
                 # Update database record
                 vector_index.vector_count += len(new_embeddings)
                 vector_index.updated_at = datetime.utcnow()
-                vector_index.metadata = json.dumps({
+                vector_index.meta_data = {
                     "last_updated": datetime.utcnow().isoformat(),
                     "added_chunks": len(new_chunks)
-                })
+                }
                 
                 self.db.commit()
                 
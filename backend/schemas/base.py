@@ -0,0 +1,40 @@
+from typing import Any, Dict, Tuple
+
+from pydantic import AliasChoices, BaseModel
+
+# Per-class (field name, ORM attribute, default) triples, resolved once
+_TRUSTED_FIELDS: Dict[type, Tuple[Tuple[str, str, Any], ...]] = {}
+
+
+def _orm_attribute(name: str, alias) -> str:
+    """ORM attribute backing a field: its alias (first choice) or its own name"""
+    if isinstance(alias, AliasChoices):
+        alias = alias.choices[0]
+    return alias if isinstance(alias, str) else name
+
+
+class TrustedORMModel(BaseModel):
+    """Response model that can be built from trusted DB rows without validation"""
+
+    @classmethod
+    def from_orm_trusted(cls, row):
+        """
+        Build the model from an ORM row via model_construct
+
+        Args:
+            row: SQLAlchemy instance whose column types already match the fields
+
+        Returns:
+            Model instance (no validation or coercion is performed)
+        """
+        fields = _TRUSTED_FIELDS.get(cls)
+        if fields is None:
+            fields = _TRUSTED_FIELDS[cls] = tuple(
+                (name, _orm_attribute(name, field.validation_alias), field.default)
+                for name, field in cls.model_fields.items()
+            )
+
+        return cls.model_construct(**{
+            name: getattr(row, attr, default)
+            for name, attr, default in fields
+        })
@@ -1,14 +1,21 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Final
 from datetime import datetime
 from enum import Enum
 
+from schemas.base import TrustedORMModel
+
 class PDFStatus(str, Enum):
     UPLOADED = "uploaded"
     PROCESSING = "processing"
     PROCESSED = "processed"
     FAILED = "failed"
 
+# Plain-str status values for ORM assignments in pipeline code (no Enum round-trip)
+PDF_STATUS_PROCESSING: Final[str] = PDFStatus.PROCESSING.value
+PDF_STATUS_PROCESSED: Final[str] = PDFStatus.PROCESSED.value
+PDF_STATUS_FAILED: Final[str] = PDFStatus.FAILED.value
+
 class PDFUpload(BaseModel):
     title: str = Field(..., max_length=200)
     description: Optional[str] = None
@@ -17,7 +24,7 @@ class PDFUpdate(BaseModel):
     title: Optional[str] = Field(None, max_length=200)
     description: Optional[str] = None
 
-class PDFResponse(BaseModel):
+class PDFResponse(TrustedORMModel):
     id: int
     filename: str
     original_filename: str
@@ -100,7 +107,7 @@ class QuizUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[QuizStatus] = None
 
-class QuizResponse(BaseModel):
+class QuizResponse(TrustedORMModel):
     id: int
     pdf_id: int
     title: str
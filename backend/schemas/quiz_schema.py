@@ -1,13 +1,22 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, Dict, Any, List, Final
 from datetime import datetime
 from enum import Enum
 
+from schemas.base import TrustedORMModel
+from utils.helpers import json_column_value
+
 class QuizStatus(str, Enum):
     GENERATING = "generating"
     GENERATED = "generated"
     PUBLISHED = "published"
     ARCHIVED = "archived"
+    FAILED = "failed"
+
+# Plain-str status values for ORM assignments in pipeline code (no Enum round-trip)
+QUIZ_STATUS_GENERATING: Final[str] = QuizStatus.GENERATING.value
+QUIZ_STATUS_GENERATED: Final[str] = QuizStatus.GENERATED.value
+QUIZ_STATUS_FAILED: Final[str] = QuizStatus.FAILED.value
 
 class QuestionType(str, Enum):
     MCQ = "mcq"
@@ -28,7 +37,7 @@ class QuizUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[str] = None
 
-class QuizResponse(BaseModel):
+class QuizResponse(TrustedORMModel):
     id: int
     pdf_id: int
     title: str
@@ -73,7 +82,7 @@ class QuestionUpdate(BaseModel):
     subtopic: Optional[str] = None
     is_active: Optional[bool] = None
 
-class QuestionResponse(QuestionBase):
+class QuestionResponse(QuestionBase, TrustedORMModel):
     id: int
     quiz_id: int
     validation_score: Optional[float] = None
@@ -82,10 +91,23 @@ class QuestionResponse(QuestionBase):
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    pdf_metadata: Optional[Dict] = Field(None, validation_alias="metadata", serialization_alias="metadata")
+    pdf_metadata: Optional[Dict] = Field(
+        None,
+        validation_alias=AliasChoices("meta_data", "metadata"),
+        serialization_alias="metadata"
+    )
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, ser_json_timedelta="iso8601")
+    
+    @field_validator("options", "pdf_metadata", mode="before")
+    @classmethod
+    def _decode_json_column(cls, value):
+        """Rows written before native JSON storage hold an encoded string"""
+        return json_column_value(value)
+    
+    def to_json(self) -> str:
+        """Serialize with API field names, omitting the (often many) None fields"""
+        return self.model_dump_json(by_alias=True, exclude_none=True)
 
 # ADD THIS MISSING CLASS
 class QuestionWithTopics(QuestionResponse):
@@ -94,7 +116,7 @@ class QuestionWithTopics(QuestionResponse):
     class Config:
         from_attributes = True
 
-class TopicResponse(BaseModel):
+class TopicResponse(TrustedORMModel):
     id: int
     quiz_id: int
     topic_name: str
@@ -1,10 +1,14 @@
 import os
+import hashlib
 import json
 import logging
-import time
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 # Core Components
@@ -30,57 +34,267 @@ from agents.planner_agent import PlannerAgent
 # Models
 from db.models import PDFDocument, Quiz, Question, Topic, Chunk as DBChunk
 from config.settings import settings
+from schemas.pdf_schema import PDF_STATUS_PROCESSING, PDF_STATUS_PROCESSED, PDF_STATUS_FAILED
+from schemas.quiz_schema import QUIZ_STATUS_GENERATING, QUIZ_STATUS_GENERATED, QUIZ_STATUS_FAILED
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
-class QuizPipelineService:
-    def __init__(self, db: Session):
-        self.db = db
-        self.setup_directories()
-        
-        # Initialize core components
-        self.pdf_ingestion = PDFIngestion(
+# Buffer size for artifact writes
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Read size when hashing uploaded PDFs
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Data directories only need creating once per process, not per service instance
+_DIRS_READY = False
+
+# Shared pipeline components, see _shared_components
+_COMPONENTS: Optional[Dict[str, Any]] = None
+_COMPONENTS_LOCK = threading.Lock()
+
+
+def _file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's bytes, read in _HASH_CHUNK_SIZE blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, payload: bytes):
+    """Write payload next to path and rename it into place, so a crash never leaves a truncated file"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_json(path: str, obj: Any):
+    """Write obj as indented JSON (via orjson when it is installed), atomically"""
+    if orjson is not None:
+        payload = orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        payload = json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    
+    _write_atomic(path, payload)
+
+
+def _read_json(path: str) -> Any:
+    """Load a JSON file, via orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+if msgspec is not None:
+    class _ChunkRef(msgspec.Struct):
+        """Saved-chunk fields quiz generation uses; other fields are skipped while decoding"""
+        text: str
+        chunk_id: str
+        page_number: Optional[int] = None
+
+    _CHUNK_REFS_DECODER = msgspec.json.Decoder(List[_ChunkRef])
+
+
+def _load_chunk_refs(path: str) -> List[Dict[str, Any]]:
+    """
+    text, chunk_id and page_number of every chunk in a saved chunk file
+    
+    Neither decoding path holds the whole file and the full parsed chunk
+    list in memory at once: msgspec decodes straight from a read-only mmap,
+    and ijson streams one chunk at a time.
+    """
+    if msgspec is not None:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return msgspec.to_builtins(_CHUNK_REFS_DECODER.decode(buf))
+    
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            return [_chunk_ref(c) for c in ijson.items(f, 'item', use_float=True)]
+    
+    return [_chunk_ref(c) for c in _read_json(path)]
+
+
+def _chunk_ref(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    return {"text": str(chunk["text"]), "chunk_id": str(chunk["chunk_id"]), "page_number": chunk.get("page_number")}
+
+
+def _summary_key(text: str) -> str:
+    """Summary cache key: the LLM model plus the chunk text (blake3 when installed)"""
+    data = f"{settings.OPENAI_MODEL}\0{text}".encode("utf-8")
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def _artifact_bundle_path(pdf_id: int) -> str:
+    return os.path.join(settings.PROCESSED_DIR, f"pdf_{pdf_id}.msgpack")
+
+
+def _encode_extra(obj: Any) -> Any:
+    """msgspec enc_hook: numpy scalars/arrays become plain Python values"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise NotImplementedError(f"Cannot serialize {type(obj).__name__}")
+
+
+if msgspec is not None:
+    class _ArtifactBundle(msgspec.Struct):
+        """Internal per-PDF artifacts; chunks decode straight to the fields quiz generation uses"""
+        processing_results: Dict[str, Any]
+        chunks: List[_ChunkRef]
+
+    _BUNDLE_DECODER = msgspec.msgpack.Decoder(_ArtifactBundle)
+
+
+def _write_artifact_bundle(path: str, processing_results: Dict[str, Any], chunks: List[Chunk]):
+    """
+    Write processing results and chunks as one msgpack file
+    
+    Args:
+        path: Bundle path
+        processing_results: Processing summary (topics, artifact paths, ...)
+        chunks: Chunk dataclasses (msgspec encodes them field by field)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = msgspec.msgpack.encode(
+        {"processing_results": processing_results, "chunks": chunks},
+        enc_hook=_encode_extra
+    )
+    
+    _write_atomic(path, payload)
+
+
+def _read_artifact_bundle(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Processing results and chunk refs (see _load_chunk_refs) from a bundle"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        bundle = _BUNDLE_DECODER.decode(buf)
+    return bundle.processing_results, msgspec.to_builtins(bundle.chunks)
+
+
+def _shared_components() -> Dict[str, Any]:
+    """
+    Pipeline components (models, agents, caches), built once per process
+    
+    Loading spaCy and the agents costs seconds and hundreds of MB, and none of
+    these keep per-request state, so every QuizPipelineService shares one set.
+    The DB session and the FormatterAgent (which owns a mutable RNG) are per
+    instance.
+    """
+    global _COMPONENTS
+    with _COMPONENTS_LOCK:
+        if _COMPONENTS is None:
+            _COMPONENTS = _build_components()
+        return _COMPONENTS
+
+
+def _build_components() -> Dict[str, Any]:
+    """Instantiate every core component and agent (attribute name -> instance)"""
+    return {
+        # Core components
+        "pdf_ingestion": PDFIngestion(
             upload_dir=settings.UPLOAD_DIR,
             processed_dir=settings.PROCESSED_DIR
-        )
-        self.page_chunker = PageChunker(
+        ),
+        "page_chunker": PageChunker(
             overlap_ratio=settings.CHUNK_OVERLAP_RATIO,
             max_chunk_size=settings.MAX_CHUNK_SIZE
-        )
-        self.embedding_manager = EmbeddingManager(
+        ),
+        "embedding_manager": EmbeddingManager(
             vector_index_dir=settings.VECTOR_INDEX_DIR
-        )
-        self.entity_extractor = EntityExtractor()
-        self.topic_normalizer = TopicNormalizer(
+        ),
+        "entity_extractor": EntityExtractor(),
+        "topic_normalizer": TopicNormalizer(
             target_topic_count=settings.TARGET_TOPIC_COUNT
-        )
-        self.question_generator = QuestionGenerator()
-        self.question_validator = QuestionValidator(
+        ),
+        "question_generator": QuestionGenerator(),
+        "question_validator": QuestionValidator(
             validation_threshold=0.7
-        )
-        self.deduplicator = Deduplicator(
+        ),
+        "deduplicator": Deduplicator(
             similarity_threshold=settings.SIMILARITY_THRESHOLD
-        )
-        self.quiz_formatter = QuizFormatter()
+        ),
+        "quiz_formatter": QuizFormatter(),
         
-        # Initialize agents
-        self.planner_agent = PlannerAgent()
-        self.pdf_agent = PDFAgent()
-        self.topic_agent = TopicAgent()
-        self.question_agent = QuestionAgent()
-        self.validation_agent = ValidationAgent()
-        self.dedup_agent = DeduplicationAgent(
+        # Chunk summaries persist across quiz generations for the same PDF
+        "summary_cache": (
+            diskcache.Cache(os.path.join(settings.PROCESSED_DIR, "summary_cache"))
+            if diskcache is not None else None
+        ),
+        
+        # Agents
+        "planner_agent": PlannerAgent(),
+        "pdf_agent": PDFAgent(),
+        "topic_agent": TopicAgent(),
+        "question_agent": QuestionAgent(),
+        "validation_agent": ValidationAgent(),
+        "dedup_agent": DeduplicationAgent(
             similarity_threshold=settings.SIMILARITY_THRESHOLD
         )
+    }
+
+
+class QuizPipelineService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.setup_directories()
+        
+        # Core components and agents are shared process-wide
+        for name, component in _shared_components().items():
+            setattr(self, name, component)
+        
+        # The formatter shuffles options with its own RNG, so it stays per instance
         self.formatter_agent = FormatterAgent()
     
     def setup_directories(self):
         """Setup necessary directories using absolute paths for Docker stability"""
+        global _DIRS_READY
+        if _DIRS_READY:
+            return
+        
         os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
         os.makedirs(settings.PROCESSED_DIR, exist_ok=True)
         os.makedirs(settings.CHUNKS_DIR, exist_ok=True)
         os.makedirs(settings.QUIZZES_DIR, exist_ok=True)
         os.makedirs(settings.VECTOR_INDEX_DIR, exist_ok=True)
+        _DIRS_READY = True
     
     def process_pdf(self, pdf_id: int):
         """Process PDF - Uses self.db and includes safety checks"""
@@ -90,15 +304,38 @@ class QuizPipelineService:
                 logger.error(f"PDF document {pdf_id} not found")
                 return
             
-            pdf_doc.status = "processing"
+            # Read what the pipeline needs before committing: touching expired
+            # attributes afterwards would reopen a transaction and pin a pooled
+            # connection through extraction, chunking and embedding
+            filename = pdf_doc.filename
+            file_path = pdf_doc.file_path
+            
+            # Identical content that was already processed: reuse its artifacts
+            content_sha256 = _file_sha256(file_path)
+            pdf_doc.content_sha256 = content_sha256
+            original = self.db.query(PDFDocument).filter(
+                PDFDocument.content_sha256 == content_sha256,
+                PDFDocument.status == PDF_STATUS_PROCESSED,
+                PDFDocument.id != pdf_id
+            ).order_by(PDFDocument.processed_at.desc()).first()
+            original_metadata = original.pdf_metadata if original else None
+            if original_metadata and os.path.exists(original_metadata.get("processing_results_path", "")):
+                pdf_doc.status = PDF_STATUS_PROCESSED
+                pdf_doc.processed_at = datetime.utcnow()
+                pdf_doc.pdf_metadata = {**original_metadata, "reused_from_pdf_id": original.id}
+                self.db.commit()
+                logger.info(f"✅ {filename} matches already-processed PDF {original.id}; reusing its artifacts")
+                return
+            
+            pdf_doc.status = PDF_STATUS_PROCESSING
             self.db.commit()
             
-            logger.info(f"Starting PDF processing for: {pdf_doc.filename}")
+            logger.info(f"Starting PDF processing for: {filename}")
             
             # Step 1: Extraction
             logger.info("Step 1: Extracting text from PDF...")
-            pdf_metadata = self.pdf_ingestion.extract_metadata(pdf_doc.file_path)
-            pages = self.pdf_ingestion.extract_text_by_page(pdf_doc.file_path)
+            pdf_metadata = self.pdf_ingestion.extract_metadata(file_path)
+            pages = self.pdf_ingestion.extract_text_by_page(file_path)
             
             if not pages:
                 raise ValueError("No text extracted from PDF. Check if PDF is scanned/image-only.")
@@ -108,16 +345,24 @@ class QuizPipelineService:
             # Step 2: Chunking
             logger.info("Step 2: Chunking pages...")
             chunks = self.page_chunker.chunk_pages_with_overlap(pages)
-            chunks_path = os.path.join(settings.CHUNKS_DIR, f"pdf_{pdf_id}_chunks.json")
-            self.page_chunker.save_chunks_to_file(chunks, chunks_path)
+            if msgspec is not None:
+                # Chunks are stored in the msgpack artifact bundle (Step 5)
+                chunks_path = _artifact_bundle_path(pdf_id)
+            else:
+                chunks_path = os.path.join(settings.CHUNKS_DIR, f"pdf_{pdf_id}_chunks.json")
+                self.page_chunker.save_chunks_to_file(chunks, chunks_path)
+            self.page_chunker.clear_text_caches()
             
             # Step 3: Embeddings (Local Math - No Sleep Needed)
             logger.info("Step 3: Generating embeddings...")
-            chunks_with_embeddings = self.embedding_manager.generate_embeddings([chunk.__dict__ for chunk in chunks])
-            index_path = self.embedding_manager.create_vector_index(chunks_with_embeddings, f"pdf_{pdf_id}")
+            index_path = self.embedding_manager.create_chunk_index(chunks, f"pdf_{pdf_id}")
             
             # Step 4: Analysis (Local Rule-based)
-            entity_extractions = [self.entity_extractor.extract_entities_from_chunk(c.__dict__) for c in chunks]
+            entity_extractions = self.entity_extractor.extract_entities_from_columns(
+                [chunk.text for chunk in chunks],
+                [chunk.chunk_id for chunk in chunks],
+                [chunk.page_number for chunk in chunks]
+            )
             consolidated_entities = self.entity_extractor.consolidate_entities_across_chunks(entity_extractions)
             
             all_subtopics = []
@@ -128,7 +373,10 @@ class QuizPipelineService:
             normalized_topics = self.topic_normalizer.normalize_topics(all_subtopics)
             
             # Step 5: Save Results
-            results_path = os.path.join(settings.PROCESSED_DIR, f"pdf_{pdf_id}_processing_results.json")
+            if msgspec is not None:
+                results_path = _artifact_bundle_path(pdf_id)
+            else:
+                results_path = os.path.join(settings.PROCESSED_DIR, f"pdf_{pdf_id}_processing_results.json")
             processing_results = {
                 "pdf_id": pdf_id,
                 "metadata": pdf_metadata.__dict__,
@@ -140,11 +388,13 @@ class QuizPipelineService:
                 },
                 "processed_at": datetime.utcnow().isoformat()
             }
-            with open(results_path, 'w', encoding='utf-8') as f:
-                json.dump(processing_results, f, indent=2, ensure_ascii=False)
+            if msgspec is not None:
+                _write_artifact_bundle(results_path, processing_results, chunks)
+            else:
+                _write_json(results_path, processing_results)
             
             # Update PDF Status
-            pdf_doc.status = "processed"
+            pdf_doc.status = PDF_STATUS_PROCESSED
             pdf_doc.processed_at = datetime.utcnow()
             # Note: Matching your DB model naming convention 'pdf_metadata'
             pdf_doc.pdf_metadata = {
@@ -154,35 +404,40 @@ class QuizPipelineService:
                 "processing_results_path": results_path
             }
             self.db.commit()
-            logger.info(f"✅ PDF processing complete: {pdf_doc.filename}")
+            logger.info(f"✅ PDF processing complete: {filename}")
             
         except Exception as e:
             logger.error(f"❌ Error processing PDF {pdf_id}: {e}")
             self.db.rollback()
             pdf_doc = self.db.query(PDFDocument).filter(PDFDocument.id == pdf_id).first()
             if pdf_doc:
-                pdf_doc.status = "failed"
+                pdf_doc.status = PDF_STATUS_FAILED
                 pdf_doc.error_message = str(e)
                 self.db.commit()
 
-    def generate_quiz_from_pdf(self, pdf_id: int, quiz_id: int):
-        """Final Battle-Tested Version - Groq Free Tier Optimized"""
-        import time
+    def generate_quiz_from_pdf(self, pdf_id: int, quiz_id: int, use_cache: bool = True):
+        """Final Battle-Tested Version - Groq Free Tier Optimized (use_cache=False regenerates questions)"""
         try:
             pdf_doc = self.db.query(PDFDocument).filter(PDFDocument.id == pdf_id).first()
             quiz = self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
             if not pdf_doc or not quiz: raise ValueError("PDF or Quiz not found")
             
-            quiz.status = "generating"
+            # Captured before the commit so the LLM stages run without a pooled connection
+            quiz_title = str(quiz.title)
+            quiz_description = str(quiz.description)
+            # Recorded by process_pdf; for duplicate uploads it points at the original's artifacts
+            results_path = (pdf_doc.pdf_metadata or {}).get("processing_results_path") or _artifact_bundle_path(pdf_id)
+            quiz.status = QUIZ_STATUS_GENERATING
             self.db.commit()
 
-            results_path = os.path.join(settings.PROCESSED_DIR, f"pdf_{pdf_id}_processing_results.json")
-            with open(results_path, 'r', encoding='utf-8') as f:
-                processing_results = json.load(f)
-            with open(processing_results["paths"]["chunks"], 'r', encoding='utf-8') as f:
-                chunk_dicts = json.load(f)
-            
-            chunks_data = [{"text": str(c["text"]), "chunk_id": str(c["chunk_id"]), "page_number": c.get("page_number")} for c in chunk_dicts]
+            if msgspec is not None and results_path.endswith(".msgpack") and os.path.exists(results_path):
+                processing_results, chunks_data = _read_artifact_bundle(results_path)
+            else:
+                # PDFs processed before the msgpack bundle (or without msgspec)
+                if not results_path.endswith(".json"):
+                    results_path = os.path.join(settings.PROCESSED_DIR, f"pdf_{pdf_id}_processing_results.json")
+                processing_results = _read_json(results_path)
+                chunks_data = _load_chunk_refs(processing_results["paths"]["chunks"])
 
 
             # temp logs 
@@ -201,22 +456,11 @@ class QuizPipelineService:
 
             # --- STEP 1: PLANNING ---
             logger.info("Step 1: Planning quiz generation...")
-            chunk_summaries = []
-            for chunk in chunks_data:
-                try:
-                    # Strip to just text for agent safety
-                    analysis = self.pdf_agent.extract_key_information([{"text": chunk["text"]}])
-                    summary_val = str(analysis.get("summary", analysis)) if isinstance(analysis, dict) else str(analysis)
-                    chunk_summaries.append(summary_val)
-                    # temp logs 
-                    logger.info(
-                        f"[DEBUG] Sending chunk to pdf_agent -> id={chunk.get('chunk_id')}, "
-                        f"page={chunk.get('page_number')}, text_len={len(chunk.get('text') or '')}"
-                    )
-                    logger.info(f"[DEBUG] Chunk preview to pdf_agent:\n{(chunk.get('text') or '')[:400]}")
-
-                except: continue
-                time.sleep(3.5)
+            # pdf_agent groups the chunks into a few concurrent requests
+            chunk_summaries = [
+                summary for summary in self._summarize_chunks(chunks_data)
+                if summary is not None
+            ]
             
             full_content_summary = "\n".join(chunk_summaries)
             quiz_plan = self.planner_agent.plan_quiz_generation(len(chunks_data), full_content_summary)
@@ -232,9 +476,15 @@ class QuizPipelineService:
             # --- STEP 2: GENERATION & NORMALIZATION ---
             logger.info("Step 2: Generating questions...")
             generated_questions = []
-            for assignment in chunk_assignments:
+            normalized_topics = processing_results["normalized_topics"]
+            with ThreadPoolExecutor(max_workers=settings.LLM_MAX_CONCURRENCY) as executor:
+                assignment_questions = list(executor.map(
+                    lambda assignment: self._generate_assignment_questions(assignment, normalized_topics, use_cache),
+                    chunk_assignments
+                ))
+
+            for assignment, chunk_qs in zip(chunk_assignments, assignment_questions):
                 try:
-                    chunk_qs = self.question_agent.generate_questions_batch([assignment], processing_results["normalized_topics"])
                     logger.info("[DEBUG] ------------------ QUESTION GEN INPUT ------------------")
                     logger.info(f"[DEBUG] assignment chunk_id={assignment.get('chunk_id')}")
                     logger.info(f"[DEBUG] assignment keys={list(assignment.keys())}")
@@ -354,7 +604,6 @@ class QuizPipelineService:
                         logger.info(f"[DEBUG] First generated Q raw:\n{json.dumps(chunk_qs[0], indent=2)[:1200]}")
 
                 except: pass
-                time.sleep(7) 
 
             if not generated_questions:
                 raise ValueError("AI failed to generate any questions. Check PDF content.")
@@ -362,57 +611,47 @@ class QuizPipelineService:
             # --- STEP 3 & 4: VALIDATION (Throttled & Non-Fatal) ---
             logger.info(f"Step 4: Validating {len(generated_questions)} questions...")
 
-            # chunk_id -> chunk_text
+            # chunk_id -> chunk_text; question chunk_ids are normalized to str below so
+            # the agent's lookup uses the same keys
             chunks_lookup = {str(c["chunk_id"]): str(c["text"]) for c in chunks_data}
-            validated_questions = []
 
+            to_validate = []
+            missing_chunk = []
             for i, q in enumerate(generated_questions, 1):
-                try:
-                    # ✅ Ensure chunk_id is valid
-                    chunk_id_key = str(q.get("chunk_id")) if q.get("chunk_id") is not None else None
-                    chunk_text = chunks_lookup.get(chunk_id_key)
-
-                    # ✅ Debug logging (only first few to avoid spam)
-                    if i <= 5:
-                        logger.info(
-                            f"[DEBUG] Validating Q{i}: chunk_id={chunk_id_key}, "
-                            f"chunk_found={'YES' if chunk_text else 'NO'}, "
-                            f"q_preview={(q.get('question_text') or '')[:120]}, "
-                            f"ans_preview={(q.get('answer') or '')[:120]}"
-                        )
-
-                    # ✅ If chunk is missing, skip AI validation and keep question
-                    if not chunk_text:
-                        q["validation_status"] = "needs_review"
-                        q["validation_reason"] = "missing_chunk_text"
-                        validated_questions.append(q)
-                        continue
+                if q.get("chunk_id") is not None:
+                    q["chunk_id"] = str(q["chunk_id"])
+                chunk_text = chunks_lookup.get(q.get("chunk_id"))
+
+                # ✅ Debug logging (only first few to avoid spam)
+                if i <= 5:
+                    logger.info(
+                        f"[DEBUG] Validating Q{i}: chunk_id={q.get('chunk_id')}, "
+                        f"chunk_found={'YES' if chunk_text else 'NO'}, "
+                        f"q_preview={(q.get('question_text') or '')[:120]}, "
+                        f"ans_preview={(q.get('answer') or '')[:120]}"
+                    )
 
-                    # ✅ Run validation normally
-                    v_results = self.validation_agent.validate_questions_batch([q], chunks_lookup)
-
-                    # ✅ Make result handling safer (avoid v_results[0] assumptions)
-                    if v_results and isinstance(v_results, list) and len(v_results) > 0:
-                        if isinstance(v_results[0], list) and len(v_results[0]) > 0:
-                            validated_questions.append(v_results[0][0])
-                        elif isinstance(v_results[0], dict):
-                            validated_questions.append(v_results[0])
-                        else:
-                            q["validation_status"] = "needs_review"
-                            q["validation_reason"] = "unexpected_validation_output"
-                            validated_questions.append(q)
-                    else:
-                        q["validation_status"] = "needs_review"
-                        q["validation_reason"] = "empty_validation_output"
-                        validated_questions.append(q)
-
-                except Exception as ve:
-                    logger.warning(f"[DEBUG] Validation skipped due to error: {ve}")
+                # ✅ If chunk is missing, keep the question but don't spend an LLM call on it
+                if not chunk_text:
                     q["validation_status"] = "needs_review"
+                    q["validation_reason"] = "missing_chunk_text"
+                    missing_chunk.append(q)
+                else:
+                    to_validate.append(q)
+
+            # ✅ One batch call for the whole set (the agent fans the LLM requests out concurrently)
+            try:
+                passed, failed = self.validation_agent.validate_questions_batch(to_validate, chunks_lookup)
+            except Exception as ve:
+                logger.warning(f"[DEBUG] Validation skipped due to error: {ve}")
+                passed, failed = [], to_validate
+                for q in failed:
                     q["validation_reason"] = f"exception:{type(ve).__name__}"
-                    validated_questions.append(q)
 
-                time.sleep(4)
+            # Validation is non-fatal: questions that didn't pass are kept for review
+            for q in failed:
+                q["validation_status"] = "needs_review"
+            validated_questions = passed + failed + missing_chunk
 
 
             # --- STEP 6: DEDUPLICATION ---
@@ -425,7 +664,7 @@ class QuizPipelineService:
             topic_mapping = processing_results["normalized_topics"].get("topic_mapping", {})
             questions_with_topics = self.topic_normalizer.map_questions_to_normalized_topics(unique_questions, topic_mapping)
 
-            quiz_config = {"title": str(quiz.title), "description": str(quiz.description), "max_questions": 20}
+            quiz_config = {"title": quiz_title, "description": quiz_description, "max_questions": 20}
             formatted_quiz = self.formatter_agent.format_quiz(questions_with_topics, quiz_config)
 
             # 🚨 FINAL SAFETY FILTER BEFORE DB SAVE
@@ -470,11 +709,11 @@ class QuizPipelineService:
 
             self._save_quiz_to_database(quiz_id, formatted_quiz, processing_results["normalized_topics"])
 
-            quiz.status = "generated"
+            quiz.status = QUIZ_STATUS_GENERATED
             quiz.total_questions = len(questions_with_topics)
             quiz.generated_at = datetime.utcnow()
             self.db.commit()
-            logger.info(f"✅ Quiz generation complete: {quiz.title}")
+            logger.info(f"✅ Quiz generation complete: {quiz_title}")
             
         except Exception as e:
             import traceback
@@ -482,38 +721,91 @@ class QuizPipelineService:
             self.db.rollback()
             quiz = self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
             if quiz:
-                quiz.status = "failed"
+                quiz.status = QUIZ_STATUS_FAILED
                 quiz.error_message = str(e)
                 self.db.commit()
 
-    def _save_quiz_to_database(self, quiz_id: int, formatted_quiz: Dict[str, Any], normalized_topics: Dict[str, Any]):
-        """Saves final quiz items to DB using self.db"""
+    def _summarize_chunks(self, chunks: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """pdf_agent summary of each chunk's text (None where analysis fails), cached by text"""
+        summaries: List[Optional[str]] = [None] * len(chunks)
+        keys: List[Optional[str]] = [None] * len(chunks)
+        missing = []
+        
+        for i, chunk in enumerate(chunks):
+            if self.summary_cache is not None:
+                keys[i] = _summary_key(chunk["text"])
+                summaries[i] = self.summary_cache.get(keys[i])
+            if summaries[i] is None:
+                missing.append(i)
+        
+        if not missing:
+            return summaries
+        
+        logger.info(f"Summarizing {len(missing)} chunks ({len(chunks) - len(missing)} cached)")
         try:
-            for topic_data in normalized_topics.get("normalized_topics", []):
-                topic = Topic(
-                    quiz_id=quiz_id,
-                    topic_name=topic_data.get("topic_name"),
-                    subtopics=json.dumps(topic_data.get("subtopics", [])),
-                    subtopic_count=topic_data.get("subtopic_count", 0)
-                )
-                self.db.add(topic)
+            # Strip to just text for agent safety
+            analyses = self.pdf_agent.analyze_chunks([{"text": chunks[i]["text"]} for i in missing])
+        except Exception as e:
+            logger.warning(f"Chunk analysis failed: {e}")
+            return summaries
+        
+        for i, analysis in zip(missing, analyses):
+            try:
+                key_info = self.pdf_agent.consolidate_analyses([analysis])
+            except Exception:
+                continue
             
-            self.db.flush() 
+            summaries[i] = str(key_info.get("summary", key_info))
+            if keys[i] is not None:
+                self.summary_cache.set(keys[i], summaries[i])
+        
+        return summaries
+    
+    def _generate_assignment_questions(
+        self,
+        assignment: Dict[str, Any],
+        normalized_topics: Dict,
+        use_cache: bool = True
+    ) -> Optional[List[Dict]]:
+        """Raw question_agent output for one planner assignment, or None if generation fails"""
+        try:
+            return self.question_agent.generate_questions_batch([assignment], normalized_topics, use_cache=use_cache)
+        except Exception as e:
+            logger.warning(f"Question generation failed for chunk {assignment.get('chunk_id')}: {e}")
+            return None
+    
+    def _save_quiz_to_database(self, quiz_id: int, formatted_quiz: Dict[str, Any], normalized_topics: Dict[str, Any]):
+        """Saves final quiz items to DB using self.db (one multi-row INSERT per table)"""
+        try:
+            topic_rows = [
+                {
+                    "quiz_id": quiz_id,
+                    "topic_name": topic_data.get("topic_name"),
+                    "subtopics": topic_data.get("subtopics", []),
+                    "subtopic_count": topic_data.get("subtopic_count", 0)
+                }
+                for topic_data in normalized_topics.get("normalized_topics", [])
+            ]
+            if topic_rows:
+                self.db.execute(insert(Topic), topic_rows)
             
-            for i, q_data in enumerate(formatted_quiz.get("questions", []), 1):
-                question = Question(
-                    quiz_id=quiz_id,
-                    question_text=q_data.get("question_text", ""),
-                    question_type=q_data.get("question_type", "mcq"),
-                    options=json.dumps(q_data.get("options", [])),
-                    correct_answer=q_data.get("answer", ""),
-                    explanation=q_data.get("explanation", ""),
-                    difficulty=q_data.get("difficulty", "medium"),
-                    topic=q_data.get("normalized_topic", "General"),
-                    question_order=i,
-                    metadata=json.dumps({"chunk_id": q_data.get("chunk_id")})
-                )
-                self.db.add(question)
+            question_rows = [
+                {
+                    "quiz_id": quiz_id,
+                    "question_text": q_data.get("question_text", ""),
+                    "question_type": q_data.get("question_type", "mcq"),
+                    "options": q_data.get("options", []),
+                    "correct_answer": q_data.get("answer", ""),
+                    "explanation": q_data.get("explanation", ""),
+                    "difficulty": q_data.get("difficulty", "medium"),
+                    "topic": q_data.get("normalized_topic", "General"),
+                    "question_order": i,
+                    "meta_data": {"chunk_id": q_data.get("chunk_id")}
+                }
+                for i, q_data in enumerate(formatted_quiz.get("questions", []), 1)
+            ]
+            if question_rows:
+                self.db.execute(insert(Question), question_rows)
             
             self.db.commit()
         except Exception as e:
@@ -533,12 +825,12 @@ class QuizPipelineService:
             db.close()
 
     @staticmethod
-    def generate_quiz_background(pdf_id: int, quiz_id: int):
+    def generate_quiz_background(pdf_id: int, quiz_id: int, use_cache: bool = True):
         from db.database import SessionLocal
         db = SessionLocal()
         try:
             print(f"🚀 [AI] Background quiz generation starting for ID: {quiz_id}", flush=True)
             service = QuizPipelineService(db)
-            service.generate_quiz_from_pdf(pdf_id, quiz_id)
+            service.generate_quiz_from_pdf(pdf_id, quiz_id, use_cache=use_cache)
         finally:
             db.close()
\ No newline at end of file
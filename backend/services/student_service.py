@@ -2,7 +2,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, case, select
 import os
 from db.models import (
     User, Quiz, Question, StudentAttempt, StudentAnswer, Topic
@@ -10,6 +10,7 @@ from db.models import (
 from schemas.quiz_schema import QuizSummary, QuizAttempt, QuizResult, StudentProgress
 from schemas.student_schema import AttemptCreate, AnswerSubmit
 from config.settings import settings
+from utils.helpers import json_column_value
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,7 @@ class StudentService:
                     "title": quiz.title,
                     "description": quiz.description,
                     "total_questions": quiz.total_questions,
-                    "difficulty_distribution": json.loads(quiz.difficulty_distribution) if quiz.difficulty_distribution else {},
+                    "difficulty_distribution": json_column_value(quiz.difficulty_distribution, {}),
                     "estimated_time": quiz.total_questions * 2,  # 2 minutes per question
                     "published_at": quiz.published_at.isoformat() if quiz.published_at else None,
                     "previously_attempted": previous_attempt is not None,
@@ -170,7 +171,7 @@ class StudentService:
             
             if question.question_type == "mcq":
                 # Shuffle options for student
-                options = json.loads(question.options) if question.options else []
+                options = json_column_value(question.options, [])
                 import random
                 shuffled_options = options.copy()
                 random.shuffle(shuffled_options)
@@ -312,17 +313,17 @@ class StudentService:
             if attempt.completed_at:
                 return {"error": "Attempt already completed"}
             
-            # Get all answers for this attempt
-            answers = self.db.query(StudentAnswer).filter(
-                StudentAnswer.attempt_id == attempt_id
-            ).all()
-            
-            # Calculate score
-            total_questions = self.db.query(Question).filter(
-                Question.quiz_id == attempt.quiz_id
-            ).count()
+            # Count correct answers and quiz questions in one round-trip
+            correct_answers, total_questions = self.db.query(
+                select(func.count(StudentAnswer.id)).where(
+                    StudentAnswer.attempt_id == attempt_id,
+                    StudentAnswer.is_correct == True
+                ).scalar_subquery(),
+                select(func.count(Question.id)).where(
+                    Question.quiz_id == attempt.quiz_id
+                ).scalar_subquery()
+            ).one()
             
-            correct_answers = sum(1 for a in answers if a.is_correct)
             score = (correct_answers / total_questions * 100) if total_questions > 0 else 0
             
             # Update attempt
@@ -365,34 +366,27 @@ class StudentService:
     
     def _calculate_topic_performance(self, attempt_id: int) -> List[Dict[str, Any]]:
         """Calculate topic-wise performance"""
-        # Get all questions and answers for this attempt
-        answers = self.db.query(
-            StudentAnswer,
-            Question.topic
+        # Per-topic answer and correct counts, aggregated by the database
+        topic_stats = self.db.query(
+            Question.topic,
+            func.count(StudentAnswer.id),
+            func.count(case((StudentAnswer.is_correct == True, 1)))
         ).join(
             Question, StudentAnswer.question_id == Question.id
         ).filter(
             StudentAnswer.attempt_id == attempt_id
+        ).group_by(
+            Question.topic
         ).all()
         
-        # Group by topic
-        topic_stats = {}
-        for answer, topic in answers:
-            if topic not in topic_stats:
-                topic_stats[topic] = {"total": 0, "correct": 0}
-            
-            topic_stats[topic]["total"] += 1
-            if answer.is_correct:
-                topic_stats[topic]["correct"] += 1
-        
         # Format results
         performance = []
-        for topic, stats in topic_stats.items():
-            accuracy = (stats["correct"] / stats["total"] * 100) if stats["total"] > 0 else 0
+        for topic, total, correct in topic_stats:
+            accuracy = (correct / total * 100) if total > 0 else 0
             performance.append({
                 "topic": topic,
-                "total_questions": stats["total"],
-                "correct_answers": stats["correct"],
+                "total_questions": total,
+                "correct_answers": correct,
                 "accuracy": accuracy,
                 "performance": self._get_performance_level(accuracy)
             })
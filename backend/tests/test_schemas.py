@@ -0,0 +1,86 @@
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+
+from schemas.quiz_schema import QuestionResponse
+from utils.helpers import json_column_value
+
+class TestJsonColumnValue:
+    def test_native_value_passes_through(self):
+        """Values stored in a native JSON column are returned unchanged"""
+        options = ["A", "B", "C", "D"]
+        
+        assert json_column_value(options) is options
+        assert json_column_value({"key": 1}) == {"key": 1}
+    
+    def test_legacy_string_is_decoded(self):
+        """Rows written before native JSON storage hold an encoded string"""
+        assert json_column_value('["A", "B"]') == ["A", "B"]
+        assert json_column_value('{"page": 3}') == {"page": 3}
+    
+    def test_empty_values_return_default(self):
+        """None, empty strings and empty containers fall back to the default"""
+        assert json_column_value(None) is None
+        assert json_column_value("", default=[]) == []
+        assert json_column_value([], default=None) is None
+    
+    def test_invalid_string_raises(self):
+        """A string that is not JSON is reported rather than returned as-is"""
+        with pytest.raises(json.JSONDecodeError):
+            json_column_value("not json")
+
+class TestQuestionResponse:
+    def make_row(self, **overrides):
+        """Question row as the ORM exposes it"""
+        now = datetime(2024, 1, 1)
+        row = dict(
+            id=1,
+            quiz_id=1,
+            question_text="What do mitochondria produce?",
+            question_type="mcq",
+            options=["ATP", "DNA", "RNA", "Lipids"],
+            correct_answer="ATP",
+            explanation=None,
+            difficulty="medium",
+            topic=None,
+            subtopic=None,
+            page_reference=2,
+            validation_score=0.9,
+            confidence_score=0.8,
+            question_order=1,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+            meta_data={"chunk_id": "c1"}
+        )
+        row.update(overrides)
+        return SimpleNamespace(**row)
+    
+    def test_native_json_columns(self):
+        """Native JSON columns validate without decoding"""
+        question = QuestionResponse.model_validate(self.make_row())
+        
+        assert question.options == ["ATP", "DNA", "RNA", "Lipids"]
+        assert question.pdf_metadata == {"chunk_id": "c1"}
+    
+    def test_legacy_string_columns_are_decoded(self):
+        """Legacy rows with JSON-string options and metadata validate as lists and dicts"""
+        row = self.make_row(
+            options=json.dumps(["ATP", "DNA", "RNA", "Lipids"]),
+            meta_data=json.dumps({"chunk_id": "c1"})
+        )
+        
+        question = QuestionResponse.model_validate(row)
+        
+        assert question.options == ["ATP", "DNA", "RNA", "Lipids"]
+        assert question.pdf_metadata == {"chunk_id": "c1"}
+        assert json.loads(question.to_json())["options"] == ["ATP", "DNA", "RNA", "Lipids"]
+    
+    def test_short_answer_without_options(self):
+        """Short-answer rows store no options"""
+        question = QuestionResponse.model_validate(
+            self.make_row(question_type="short_answer", options=None)
+        )
+        
+        assert question.options is None
@@ -0,0 +1,68 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from config.llm_config import llm_client
+
+
+class LLMResponseCache:
+    """
+    Response cache in front of llm_client.generate_json.
+
+    Entries are keyed by the sha256 of the exact system and user prompt, so
+    a response is only ever reused for an identical request: prompts that
+    differ in a single option or answer are different keys. Entries expire
+    after ttl_seconds and the least recently used entry is evicted once
+    max_entries is reached.
+    """
+
+    def __init__(
+        self,
+        client=llm_client,
+        ttl_seconds: float = 300,
+        max_entries: int = 512
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def generate_json(self, prompt: str, system_prompt: str = None, use_cache: bool = True) -> Dict:
+        """Drop-in replacement for llm_client.generate_json with exact-match caching"""
+        if not use_cache:
+            return self.client.generate_json(prompt=prompt, system_prompt=system_prompt, use_cache=False)
+        
+        digest = hashlib.sha256(f"{system_prompt or ''}\0{prompt}".encode("utf-8")).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry["expires_at"] > time.monotonic():
+                self._entries.move_to_end(digest)
+                return copy.deepcopy(entry["response"])
+
+        response = self.client.generate_json(prompt=prompt, system_prompt=system_prompt)
+
+        with self._lock:
+            self._entries[digest] = {
+                "response": copy.deepcopy(response),
+                "expires_at": time.monotonic() + self.ttl_seconds
+            }
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return response
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+llm_cache = LLMResponseCache()
@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` acquisitions per `per` seconds.
+
+    The bucket starts full, so a short burst goes out immediately and later
+    callers block only as long as it takes for the next token to refill.
+    This replaces fixed sleeps between LLM calls, which idle even when the
+    provider quota has room.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: int = None):
+        """
+        Initialize limiter
+
+        Args:
+            rate: Acquisitions allowed per window
+            per: Window length in seconds
+            burst: Bucket capacity (defaults to rate)
+        """
+        self.capacity = float(burst if burst is not None else rate)
+        self.fill_rate = rate / per
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.fill_rate
+
+            time.sleep(wait)
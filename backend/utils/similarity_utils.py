@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -348,11 +349,16 @@ class SimilarityUtils:
             logger.error(f"Error calculating similarity distribution: {e}")
             return {"error": str(e)}
 
+# Memoized scores: validation and deduplication compare the same answer,
+# question and chunk texts repeatedly, and a TF-IDF fit is deterministic
+@lru_cache(maxsize=1024)
+def _cached_similarity(text1: str, text2: str) -> float:
+    return SimilarityUtils().calculate_cosine_similarity(text1, text2)
+
 # Convenience functions
 def calculate_similarity(text1: str, text2: str) -> float:
     """Calculate similarity between two texts"""
-    utils = SimilarityUtils()
-    return utils.calculate_cosine_similarity(text1, text2)
+    return _cached_similarity(text1, text2)
 
 def jaccard_similarity(text1: str, text2: str) -> float:
     """Calculate Jaccard similarity between two texts"""
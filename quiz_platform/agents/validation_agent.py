@@ -1,13 +1,55 @@
+import bisect
 import json
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from config.llm_config import llm_client
 from config.prompts import SystemPrompts, UserPrompts
+from config.settings import settings
 from utils.similarity_utils import calculate_similarity
+from utils.llm_cache import llm_cache
 import re
 
 logger = logging.getLogger(__name__)
 
+_VAGUE_RE = re.compile(r"\b(often|sometimes|usually|generally|might|could|possibly)\b")
+_NEG_RE = re.compile(r"\b(not|no|never|none)\b")
+_TERMINATOR_RE = re.compile(r"[.!?]")
+
+# Chunks shorter than this can't meaningfully support a question
+_MIN_SOURCE_CHARS = 50
+
+# Overall complexity below 0.3 is easy, below 0.7 medium, otherwise hard
+_COMPLEXITY_BOUNDS = (0.3, 0.7)
+_COMPLEXITY_LEVELS = ("easy", "medium", "hard")
+
+
+@lru_cache(maxsize=4096)
+def _text_complexity(text: str) -> float:
+    """Word-length and sentence-length complexity of a text, memoized since chunk texts repeat"""
+    words = text.split()
+    if not words:
+        return 0.0
+    
+    word_count = len(words)
+    
+    # Average word length
+    avg_word_len = sum(map(len, words)) / word_count
+    
+    # Sentence count: every terminator character, matched in one scan
+    sentences = len(_TERMINATOR_RE.findall(text))
+    words_per_sentence = word_count / max(1, sentences)
+    
+    # Complexity formula
+    complexity = (avg_word_len / 10) * 0.3 + (words_per_sentence / 30) * 0.7
+    return min(1.0, complexity)
+
+
+@lru_cache(maxsize=256)
+def _word_set(text: str) -> frozenset:
+    """Lowercased word set of a text; chunk texts repeat across the questions drawn from them"""
+    return frozenset(text.lower().split())
+
 def extract_json(text: str):
     # remove ```json ... ```
     cleaned = re.sub(r"```(?:json)?", "", text).replace("```", "").strip()
@@ -29,8 +71,15 @@ def extract_json(text: str):
     return None
 
 class ValidationAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout_per_item: Optional[float] = None
+    ):
         self.system_prompt = SystemPrompts.VALIDATOR_SYSTEM
+        # Defaults to LLM_MAX_CONCURRENCY, read when the agent is built rather than at import
+        self.max_workers = max(1, max_workers if max_workers is not None else settings.LLM_MAX_CONCURRENCY)
+        self.timeout_per_item = timeout_per_item
 
         
     def validate_question(
@@ -73,64 +122,27 @@ class ValidationAgent:
             )  
 
 
-            logger.debug(f"[VALIDATION] Question payload: {json.dumps(question, indent=2)[:1200]}")
-            logger.debug(f"[VALIDATION] Source preview: {source_text[:800]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[VALIDATION] Question payload: {json.dumps(question, indent=2)[:1200]}")
+                logger.debug(f"[VALIDATION] Source preview: {source_text[:800]}")
 
-            response = llm_client.generate_json(
+            response = llm_cache.generate_json(
                 prompt=prompt,
                 system_prompt=self.system_prompt
             )
-            # --- NORMALIZE WEIRD LLM RESPONSE STRUCTURES ---
-            if isinstance(response, dict):
-                # Unwrap nested formats like {"validation_result": {...}}
-                for wrapper_key in ["validation_result", "validation_results", "result", "data"]:
-                    if wrapper_key in response and isinstance(response[wrapper_key], dict):
-                        response = response[wrapper_key]
-                        break
-
-                # Normalize key names from different LLM styles
-                key_map = {
-                    "answerable_from_text": "is_answerable",
-                    "is_answerable_from_text": "is_answerable",
-                    "validated": "is_answerable",
-                    "validity": "is_answerable",
-
-                    "overall_validation_score": "overall_score",
-                    "overall_score": "overall_score",
-                    "validation_score": "overall_score",
-
-                    "difficulty_appropriateness": "difficulty_appropriate",
-                    "difficultyappropriate": "difficulty_appropriate",
-
-                    "feedback/comments": "feedback",
-                    "comments": "feedback"
-                }
-
-                normalized = {}
-                for k, v in response.items():
-                    normalized[key_map.get(k, k)] = v
-
-                response = normalized
+            response = self._normalize_llm_response(response)
            
             logger.info(
                 "[VALIDATION] LLM response summary | "
                 f"type={type(response)} | keys={list(response.keys()) if isinstance(response, dict) else 'NOT_DICT'}"
             )
 
-            logger.debug(f"[VALIDATION] Full LLM response: {json.dumps(response, indent=2)[:2000]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[VALIDATION] Full LLM response: {json.dumps(response, indent=2)[:2000]}")
 
             
             # Add question metadata
-            # Ensure numeric fields are proper numbers
-            response["overall_score"] = float(response.get("overall_score", 0.5) or 0.5)
-            response["answer_correctness_score"] = float(response.get("answer_correctness_score", 0.5) or 0.5)
-            response["clarity_score"] = float(response.get("clarity_score", 0.5) or 0.5)
-            response.update({
-                "question_id": question.get("question_id"),
-                "chunk_id": question.get("chunk_id"),
-                "page_number": question.get("page_number"),
-                "validation_timestamp": "now"
-            })
+            self._attach_question_metadata(response, question)
             
             logger.info(f"Validated question: {question.get('question_id')}")
             # If LLM forgot important fields, use fallback logic
@@ -148,6 +160,105 @@ class ValidationAgent:
 
             return self._basic_validation(question, source_text)
     
+    def _normalize_llm_response(self, response: Any) -> Any:
+        """Unwrap nested validation results and map LLM key variants onto ours"""
+        # --- NORMALIZE WEIRD LLM RESPONSE STRUCTURES ---
+        if isinstance(response, dict):
+            # Unwrap nested formats like {"validation_result": {...}}
+            for wrapper_key in ["validation_result", "validation_results", "result", "data"]:
+                if wrapper_key in response and isinstance(response[wrapper_key], dict):
+                    response = response[wrapper_key]
+                    break
+
+            # Normalize key names from different LLM styles
+            key_map = {
+                "answerable_from_text": "is_answerable",
+                "is_answerable_from_text": "is_answerable",
+                "validated": "is_answerable",
+                "validity": "is_answerable",
+
+                "overall_validation_score": "overall_score",
+                "overall_score": "overall_score",
+                "validation_score": "overall_score",
+
+                "difficulty_appropriateness": "difficulty_appropriate",
+                "difficultyappropriate": "difficulty_appropriate",
+
+                "feedback/comments": "feedback",
+                "comments": "feedback"
+            }
+
+            normalized = {}
+            for k, v in response.items():
+                normalized[key_map.get(k, k)] = v
+
+            response = normalized
+
+        return response
+    
+    def _attach_question_metadata(self, response: Dict[str, Any], question: Dict[str, Any]):
+        """Coerce score fields to floats and tag the result with the question's IDs"""
+        # Ensure numeric fields are proper numbers
+        response["overall_score"] = float(response.get("overall_score", 0.5) or 0.5)
+        response["answer_correctness_score"] = float(response.get("answer_correctness_score", 0.5) or 0.5)
+        response["clarity_score"] = float(response.get("clarity_score", 0.5) or 0.5)
+        response.update({
+            "question_id": question.get("question_id"),
+            "chunk_id": question.get("chunk_id"),
+            "page_number": question.get("page_number"),
+            "validation_timestamp": "now"
+        })
+    
+    def validate_question_group(
+        self, 
+        questions: List[Dict[str, Any]], 
+        source_text: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several questions drawn from the same source text in one LLM call
+        
+        Args:
+            questions: Question dictionaries sharing source_text
+            source_text: Source text from chunk
+            
+        Returns:
+            Validation results, one per question in input order; questions the
+            response leaves out are validated individually
+        """
+        if len(questions) == 1:
+            return [self.validate_question(questions[0], source_text)]
+        
+        try:
+            response = llm_cache.generate_json(
+                prompt=UserPrompts.validate_questions(questions, source_text),
+                system_prompt=self.system_prompt
+            )
+        except Exception as e:
+            logger.error(f"Error validating question group, validating individually: {e}")
+            response = None
+        
+        entries = response.get("validations") if isinstance(response, dict) else response
+        by_id = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and str(entry.get("id", "")).isdigit():
+                by_id[int(entry.pop("id"))] = entry
+        
+        results = []
+        for i, question in enumerate(questions):
+            result = by_id.get(i)
+            try:
+                if result is not None:
+                    result = self._normalize_llm_response(result)
+                    self._attach_question_metadata(result, question)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Malformed group validation for {question.get('question_id')}: {e}")
+                result = None
+            
+            results.append(result if result is not None else self.validate_question(question, source_text))
+        
+        logger.info(f"Validated {len(by_id)}/{len(questions)} questions in one request")
+        return results
+    
     def validate_questions_batch(
         self, 
         questions: List[Dict[str, Any]], 
@@ -165,6 +276,7 @@ class ValidationAgent:
         """
         validated_questions = []
         failed_questions = []
+        pending = []
         
         for question in questions:
             chunk_id = question.get("chunk_id")
@@ -177,8 +289,20 @@ class ValidationAgent:
                 failed_questions.append(question)
                 continue
             
-            validation_result = self.validate_question(question, source_text)
+            # Obvious rejects don't need an LLM round-trip
+            reject_reason = self._quick_reject(question, source_text)
+            if reject_reason:
+                question["validation_status"] = "failed"
+                question["validation_reason"] = reject_reason
+                failed_questions.append(question)
+                continue
             
+            pending.append((question, source_text))
+        
+        # LLM validation is network-bound, so the requests are issued concurrently
+        validation_results = self._validate_concurrently(pending)
+        
+        for (question, source_text), validation_result in zip(pending, validation_results):
             # Check if question passed validation
             is_answerable = bool(validation_result.get("is_answerable", True))
             answer_correctness = float(validation_result.get("answer_correctness_score", 0.5) or 0.5)
@@ -213,6 +337,95 @@ class ValidationAgent:
         logger.info(f"Validated {len(validated_questions)} questions, failed {len(failed_questions)}")
         return validated_questions, failed_questions
     
+    def _quick_reject(self, question: Dict[str, Any], source_text: str) -> Optional[str]:
+        """
+        Cheap structural checks that guarantee a validation failure
+        
+        Args:
+            question: Question dictionary
+            source_text: Source text from chunk
+            
+        Returns:
+            Rejection reason, or None if the question needs full validation
+        """
+        answer = question.get("answer")
+        if not answer:
+            return "Missing answer"
+        
+        options = question.get("options") or []
+        if question.get("question_type") == "mcq" and options and answer not in options:
+            return "Answer is not one of the options"
+        
+        if len(source_text.strip()) < _MIN_SOURCE_CHARS:
+            return "Source text too short to validate against"
+        
+        if not (_word_set(str(answer)) & _word_set(source_text)):
+            return "Answer has no overlap with source text"
+        
+        return None
+    
+    def _validate_concurrently(
+        self, 
+        pending: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate (question, source_text) pairs, preserving order
+        
+        Questions sharing a source text are sent together, up to
+        VALIDATION_BATCH_SIZE per request, and the requests run concurrently.
+        With timeout_per_item set, the call returns after at most
+        timeout_per_item x the largest batch size; batches still running then
+        fall back to _basic_validation.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, (question, source_text) in enumerate(pending):
+            groups.setdefault(source_text, []).append(i)
+        
+        batch_size = max(1, settings.VALIDATION_BATCH_SIZE)
+        batches = [
+            indices[start:start + batch_size]
+            for indices in groups.values()
+            for start in range(0, len(indices), batch_size)
+        ]
+        
+        def run(batch: List[int]) -> List[Dict[str, Any]]:
+            return self.validate_question_group([pending[i][0] for i in batch], pending[batch[0]][1])
+        
+        results: List[Any] = [None] * len(pending)
+        if len(batches) <= 1 and self.timeout_per_item is None:
+            for batch in batches:
+                for i, result in zip(batch, run(batch)):
+                    results[i] = result
+            return results
+        
+        # One deadline for the whole call: the largest batch's per-item budget
+        timeout = (
+            self.timeout_per_item * max(map(len, batches), default=0)
+            if self.timeout_per_item is not None else None
+        )
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches))))
+        try:
+            futures = [executor.submit(run, batch) for batch in batches]
+            wait(futures, timeout=timeout)
+            
+            for future, batch in zip(futures, batches):
+                try:
+                    if not future.done():
+                        raise TimeoutError(f"no result within {timeout}s")
+                    batch_results = future.result()
+                except Exception as e:
+                    logger.warning(f"Validation failed for questions {[pending[i][0].get('question_id') for i in batch]}: {e}")
+                    batch_results = [self._basic_validation(*pending[i]) for i in batch]
+                
+                for i, result in zip(batch, batch_results):
+                    results[i] = result
+        finally:
+            # Hung requests must not hold up the fallback results
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return results
+    
     def cross_reference_answer(
         self, 
         question: Dict[str, Any], 
@@ -267,15 +480,14 @@ class ValidationAgent:
         
         ambiguity_issues = []
         
+        question_lower = question_text.lower()
+        
         # Check for vague terms
-        vague_terms = ["often", "sometimes", "usually", "generally", "might", "could", "possibly"]
-        for term in vague_terms:
-            if term in question_text.lower():
-                ambiguity_issues.append(f"Vague term '{term}' used")
+        for term in dict.fromkeys(_VAGUE_RE.findall(question_lower)):
+            ambiguity_issues.append(f"Vague term '{term}' used")
         
         # Check for double negatives
-        negations = ["not", "no", "never", "none"]
-        negation_count = sum(1 for neg in negations if neg in question_text.lower())
+        negation_count = len(_NEG_RE.findall(question_lower))
         if negation_count > 1:
             ambiguity_issues.append("Multiple negations causing confusion")
         
@@ -291,7 +503,6 @@ class ValidationAgent:
 
             
             # Check for similar options
-            option_similarities = []
             for i in range(len(options)):
                 for j in range(i+1, len(options)):
                     sim = calculate_similarity(options[i], options[j])
@@ -334,12 +545,7 @@ class ValidationAgent:
         # Determine actual difficulty
         overall_complexity = (text_complexity + question_complexity + answer_complexity) / 3
         
-        if overall_complexity < 0.3:
-            actual_difficulty = "easy"
-        elif overall_complexity < 0.7:
-            actual_difficulty = "medium"
-        else:
-            actual_difficulty = "hard"
+        actual_difficulty = _COMPLEXITY_LEVELS[bisect.bisect_right(_COMPLEXITY_BOUNDS, overall_complexity)]
         
         # Check match
         difficulty_match = (claimed_difficulty == actual_difficulty)
@@ -359,14 +565,18 @@ class ValidationAgent:
         """Basic validation fallback"""
         answer = question.get("answer", "")
         
+        answer_lower = answer.lower()
+        
         # Simple check: is answer in source text?
-        answer_in_text = answer.lower() in source_text.lower() if answer else False
+        answer_in_text = answer_lower in source_text.lower() if answer else False
         
         # Calculate simple similarity
         answer_similarity = 0.0
         if answer and source_text:
-            words_in_common = len(set(answer.lower().split()) & set(source_text.lower().split()))
-            total_words = len(set(answer.lower().split()) | set(source_text.lower().split()))
+            answer_words = set(answer_lower.split())
+            source_words = _word_set(source_text)
+            words_in_common = len(answer_words & source_words)
+            total_words = len(answer_words | source_words)
             answer_similarity = words_in_common / total_words if total_words > 0 else 0
         
         return {
@@ -383,7 +593,7 @@ class ValidationAgent:
         """Check if answer can be inferred from source text"""
         # Simple inference check
         answer_keywords = set(answer.lower().split()[:5])  # First 5 words as keywords
-        source_words = set(source_text.lower().split())
+        source_words = _word_set(source_text)
         
         # Check if at least 2 keywords are in source
         matches = len(answer_keywords & source_words)
@@ -396,31 +606,15 @@ class ValidationAgent:
         if not words:
             return 0.0
         
-        # Count complex words (more than 3 syllables)
-        complex_words = 0
-        for word in words:
-            if len(word) > 8:  # Simple proxy for complexity
-                complex_words += 1
+        # Count complex words (more than 3 syllables); length > 8 is a simple proxy
+        complex_words = sum(len(word) > 8 for word in words)
         
         clarity = 1.0 - (complex_words / len(words))
         return max(0.1, min(1.0, clarity))
     
     def _calculate_text_complexity(self, text: str) -> float:
         """Calculate text complexity"""
-        words = text.split()
-        if not words:
-            return 0.0
-        
-        # Average word length
-        avg_word_len = sum(len(w) for w in words) / len(words)
-        
-        # Sentence count
-        sentences = text.count('.') + text.count('!') + text.count('?')
-        words_per_sentence = len(words) / max(1, sentences)
-        
-        # Complexity formula
-        complexity = (avg_word_len / 10) * 0.3 + (words_per_sentence / 30) * 0.7
-        return min(1.0, complexity)
+        return _text_complexity(text)
     
     def _calculate_question_complexity(self, question: Dict) -> float:
         """Calculate question complexity"""
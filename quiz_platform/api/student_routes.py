@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from datetime import datetime
 
@@ -9,6 +10,7 @@ from schemas.quiz_schema import QuizSummary, QuizAttempt, QuizResult, StudentPro
 from schemas.student_schema import AttemptCreate, AnswerSubmit
 from services.student_service import StudentService
 from api.auth_routes import get_current_user
+from utils.helpers import json_column_value
 
 router = APIRouter()
 
@@ -30,11 +32,12 @@ async def get_quiz_for_attempt(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    import json
     from datetime import datetime
 
-    # 1️⃣ Check quiz exists and is published
-    quiz = db.query(Quiz).filter(
+    # 1️⃣ Check quiz exists and is published, loading its active questions alongside
+    quiz = db.query(Quiz).options(
+        selectinload(Quiz.questions.and_(Question.is_active == True))
+    ).filter(
         Quiz.id == quiz_id,
         Quiz.status == "published"
     ).first()
@@ -42,7 +45,30 @@ async def get_quiz_for_attempt(
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found or not published")
 
-    # 2️⃣ Find or create attempt
+    # 2️⃣ Format the eager-loaded active questions before any commit expires them
+    formatted_questions = []
+    for q in sorted(quiz.questions, key=lambda q: q.question_order or 0):
+        try:
+            opts = json_column_value(q.options, [])
+        except:
+            opts = []
+
+        formatted_questions.append({
+            "id": q.id,
+            "question_text": q.question_text,
+            "question_type": q.question_type,
+            "options": opts,
+            "difficulty": q.difficulty
+        })
+
+    quiz_info = {   # ✅ REQUIRED by schema
+        "id": quiz.id,
+        "title": quiz.title,
+        "description": quiz.description,
+        "total_questions": quiz.total_questions
+    }
+
+    # 3️⃣ Find or create attempt
     attempt = db.query(StudentAttempt).filter(
         StudentAttempt.quiz_id == quiz_id,
         StudentAttempt.student_id == current_user.id,
@@ -60,40 +86,13 @@ async def get_quiz_for_attempt(
         db.commit()
         db.refresh(attempt)
 
-    # 3️⃣ Get active questions
-    questions = db.query(Question).filter(
-        Question.quiz_id == quiz_id,
-        Question.is_active == True
-    ).order_by(Question.question_order).all()
-
-    # 4️⃣ Format questions safely
-    formatted_questions = []
-    for q in questions:
-        try:
-            opts = json.loads(q.options) if isinstance(q.options, str) else (q.options or [])
-        except:
-            opts = []
-
-        formatted_questions.append({
-            "id": q.id,
-            "question_text": q.question_text,
-            "question_type": q.question_type,
-            "options": opts,
-            "difficulty": q.difficulty
-        })
-
-    # 5️⃣ Return clean response
+    # 4️⃣ Return clean response
     return {
         "attempt_id": attempt.id,
-        "quiz": {   # ✅ REQUIRED by schema
-            "id": quiz.id,
-            "title": quiz.title,
-            "description": quiz.description,
-            "total_questions": quiz.total_questions
-        },
+        "quiz": quiz_info,
         "questions": formatted_questions,
         "started_at": attempt.started_at,
-        "time_limit_minutes": quiz.total_questions * 2  # ✅ REQUIRED (or real DB field if you have one)
+        "time_limit_minutes": quiz_info["total_questions"] * 2  # ✅ REQUIRED (or real DB field if you have one)
     }
 
 
@@ -106,24 +105,26 @@ async def submit_answer(
     db: Session = Depends(get_db)
 ):
     """Submit answer for a question in attempt"""
-    # Verify attempt belongs to student
-    attempt = db.query(StudentAttempt).filter(
+    # Verify attempt belongs to student and fetch any existing answer in the same query
+    row = db.query(StudentAttempt, StudentAnswer).outerjoin(
+        StudentAnswer,
+        and_(
+            StudentAnswer.attempt_id == StudentAttempt.id,
+            StudentAnswer.question_id == answer_data.question_id
+        )
+    ).filter(
         StudentAttempt.id == attempt_id,
         StudentAttempt.student_id == current_user.id
     ).first()
     
-    if not attempt:
+    if not row:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
+    attempt, existing_answer = row
+    
     if attempt.completed_at:
         raise HTTPException(status_code=400, detail="Attempt already completed")
     
-    # Check if answer already exists
-    existing_answer = db.query(StudentAnswer).filter(
-        StudentAnswer.attempt_id == attempt_id,
-        StudentAnswer.question_id == answer_data.question_id
-    ).first()
-    
     if existing_answer:
         # Update existing answer
         existing_answer.selected_option = answer_data.selected_option
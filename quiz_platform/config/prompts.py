@@ -1,3 +1,4 @@
+import json
 from typing import List, Dict
 
 class SystemPrompts:
@@ -79,12 +80,8 @@ class SystemPrompts:
     
     Be strict but reasonable."""
 
-class UserPrompts:
-    """User prompts template for different tasks"""
-    
-    @staticmethod
-    def generate_quiz_plan(chunk_count: int, content_summary: str) -> str:
-        return f"""Based on {chunk_count} chunks of content, create a quiz generation plan.
+# User prompt templates, filled in with str.format by the UserPrompts helpers
+_QUIZ_PLAN_TMPL = """Based on {chunk_count} chunks of content, create a quiz generation plan.
         
         Content Summary:
         {content_summary}
@@ -96,10 +93,8 @@ class UserPrompts:
         - Estimated total questions
         
         Return JSON format."""
-    
-    @staticmethod
-    def extract_topics(text: str, page_num: int) -> str:
-        return f"""Extract topics and subtopics from the following text (Page {page_num}):
+
+_EXTRACT_TOPICS_TMPL = """Extract topics and subtopics from the following text (Page {page_num}):
         
         Text:
         {text}
@@ -110,24 +105,8 @@ class UserPrompts:
         3. Key entities/concepts mentioned
         
         Return as JSON."""
-    
-    # @staticmethod
-    # def generate_questions(text: str, subtopic: str, count: int = 2) -> str:
-    #     return f"""Generate {count} questions about '{subtopic}' from the following text:
-        
-    #     Text:
-    #     {text}
-        
-    #     Requirements:
-    #     1. Mix of MCQ and short answer questions
-    #     2. Clear correct answers
-    #     3. For MCQs: 4 options with plausible distractors
-    #     4. Indicate difficulty (Easy/Medium/Hard)
-        
-    #     Return as JSON."""
-    @staticmethod
-    def generate_questions(text: str, subtopic: str, count: int = 2) -> str:
-        return f"""
+
+_GENERATE_QUESTIONS_TMPL = """
     Generate {count} quiz questions about '{subtopic}' using ONLY the information in the text below.
 
     TEXT:
@@ -171,16 +150,13 @@ class UserPrompts:
     Return a JSON ARRAY of questions.
     """
 
-    
-    @staticmethod
-    def validate_question(question: Dict, source_text: str) -> str:
-        return f"""Validate this question based on the source text:
+_VALIDATE_QUESTION_TMPL = """Validate this question based on the source text:
         
-        Question: {question.get('question_text')}
-        Options: {question.get('options', [])}
-        Answer: {question.get('answer')}
-        Type: {question.get('question_type')}
-        Difficulty: {question.get('difficulty')}
+        Question: {question_text}
+        Options: {options}
+        Answer: {answer}
+        Type: {question_type}
+        Difficulty: {difficulty}
         
         Source Text:
         {source_text}
@@ -194,10 +170,27 @@ class UserPrompts:
         6. Feedback/comments
         
         Return as JSON."""
-    
-    @staticmethod
-    def normalize_topics(subtopics: List[str], target_count: int = 10) -> str:
-        return f"""Normalize these subtopics into approximately {target_count} main topics:
+
+_VALIDATE_QUESTIONS_TMPL = """Validate each of these questions based on the same source text:
+        
+        Questions:
+        {questions}
+        
+        Source Text:
+        {source_text}
+        
+        For every question provide:
+        1. is_answerable: answerable from text? (true/false)
+        2. answer_correctness_score (0-1)
+        3. clarity_score (0-1)
+        4. difficulty_appropriate (true/false)
+        5. overall_score (0-1)
+        6. feedback
+        
+        Return as JSON: {{"validations": [{{"id": <question id>, "is_answerable": ..., ...}}]}}
+        with exactly one entry per question."""
+
+_NORMALIZE_TOPICS_TMPL = """Normalize these subtopics into approximately {target_count} main topics:
         
         Subtopics:
         {subtopics}
@@ -208,4 +201,67 @@ class UserPrompts:
         3. Maintain hierarchy
         4. Ensure coverage of all concepts
         
-        Return as JSON with topics and their subtopics."""
\ No newline at end of file
+        Return as JSON with topics and their subtopics."""
+
+
+class UserPrompts:
+    """User prompts template for different tasks"""
+    
+    @staticmethod
+    def generate_quiz_plan(chunk_count: int, content_summary: str) -> str:
+        return _QUIZ_PLAN_TMPL.format(chunk_count=chunk_count, content_summary=content_summary)
+    
+    @staticmethod
+    def extract_topics(text: str, page_num: int) -> str:
+        return _EXTRACT_TOPICS_TMPL.format(text=text, page_num=page_num)
+    
+    # @staticmethod
+    # def generate_questions(text: str, subtopic: str, count: int = 2) -> str:
+    #     return f"""Generate {count} questions about '{subtopic}' from the following text:
+        
+    #     Text:
+    #     {text}
+        
+    #     Requirements:
+    #     1. Mix of MCQ and short answer questions
+    #     2. Clear correct answers
+    #     3. For MCQs: 4 options with plausible distractors
+    #     4. Indicate difficulty (Easy/Medium/Hard)
+        
+    #     Return as JSON."""
+    @staticmethod
+    def generate_questions(text: str, subtopic: str, count: int = 2) -> str:
+        return _GENERATE_QUESTIONS_TMPL.format(text=text, subtopic=subtopic, count=count)
+
+    
+    @staticmethod
+    def validate_question(question: Dict, source_text: str) -> str:
+        return _VALIDATE_QUESTION_TMPL.format(
+            question_text=question.get('question_text'),
+            options=question.get('options', []),
+            answer=question.get('answer'),
+            question_type=question.get('question_type'),
+            difficulty=question.get('difficulty'),
+            source_text=source_text
+        )
+    
+    @staticmethod
+    def validate_questions(questions: List[Dict], source_text: str) -> str:
+        return _VALIDATE_QUESTIONS_TMPL.format(
+            questions=json.dumps([
+                {
+                    "id": i,
+                    "question_text": question.get('question_text'),
+                    "options": question.get('options', []),
+                    "answer": question.get('answer'),
+                    "type": question.get('question_type'),
+                    "difficulty": question.get('difficulty')
+                }
+                for i, question in enumerate(questions)
+            ], ensure_ascii=False, indent=2),
+            source_text=source_text
+        )
+    
+    @staticmethod
+    def normalize_topics(subtopics: List[str], target_count: int = 10) -> str:
+        return _NORMALIZE_TOPICS_TMPL.format(subtopics=subtopics, target_count=target_count)
\ No newline at end of file
@@ -1,10 +1,15 @@
 # backend/config/settings.py
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
 class Settings(BaseSettings):
     # ================= DATABASE =================
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; recycle before server-side idle timeouts
+    DB_POOL_PRE_PING: bool = True
     FRONTEND_URL: str | None = None   # ✅ ADD THIS LINE
     # ================= REDIS =================
     REDIS_URL: str = "redis://localhost:6379"
@@ -13,7 +18,9 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "llama-3.1-8b-instant"
     LLM_BASE_URL: str = "https://api.groq.com/openai/v1"
+    LLM_CACHE_VERSION: str = "1"  # bump to invalidate cached LLM responses (e.g. after prompt changes)
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 2  # texts per forward pass; tiny keeps Render's memory in bounds, raise (e.g. 64) where RAM allows
 
     # ================= AUTH =================
     JWT_SECRET_KEY: str
@@ -31,6 +38,8 @@ class Settings(BaseSettings):
     CHUNKS_DIR: str = "./data/chunks"
     QUIZZES_DIR: str = "./data/quizzes"
     VECTOR_INDEX_DIR: str = "./data/vector_index"
+    LLM_CACHE_DIR: str = "./data/llm_cache"  # on-disk LLM response cache; empty disables it
+    LLM_CACHE_TTL_SECONDS: int = 86400  # cached LLM responses expire after a day
 
     # ================= CHUNKING =================
     CHUNK_OVERLAP_RATIO: float = 0.3
@@ -39,6 +48,9 @@ class Settings(BaseSettings):
 
     # ================= QUESTION GEN =================
     MAX_QUESTIONS_PER_CHUNK: int = 2
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_REQUESTS_PER_MINUTE: int = 30  # provider quota (Groq free tier: 30 RPM)
+    VALIDATION_BATCH_SIZE: int = 5  # questions from one chunk validated per LLM request
     QUESTION_TYPES: List[str] = ["mcq", "short_answer"]
 
     # ================= DEDUP =================
@@ -48,10 +60,25 @@ class Settings(BaseSettings):
     TARGET_TOPIC_COUNT: int = 10
     TOPIC_CLUSTERING_THRESHOLD: float = 0.7
 
-    class Config:
-        env_file = ".env"   # ✅ correct path (same folder level where app runs)
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",   # ✅ correct path (same folder level where app runs)
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        frozen=True
+    )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse .env and validate once, on first use"""
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Resolves the legacy `settings` name through get_settings(). Note that
+    # `from config.settings import settings` is itself an access, so modules
+    # importing it still build Settings when they are imported; code that must
+    # not do so calls get_settings() at use time instead
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,183 @@
+from typing import List, Tuple
+import logging
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Below this many vectors the exact float index is cheap enough
+BINARY_INDEX_MIN_VECTORS = 2048
+
+
+class DedupIndex:
+    """
+    Cosine-similarity index for duplicate checks against SIMILARITY_THRESHOLD.
+
+    Vectors are L2-normalized and stored in a faiss IndexFlatIP, so inner
+    product equals cosine similarity. Range searches return only the pairs at
+    or above the threshold instead of materializing an n x n matrix.
+    """
+
+    def __init__(self, dim: int, threshold: float = 0.85):
+        """
+        Initialize an empty index
+
+        Args:
+            dim: Embedding dimension
+            threshold: Cosine similarity at which two vectors count as duplicates
+        """
+        self.dim = dim
+        self.threshold = threshold
+        self._index = faiss.IndexFlatIP(dim)
+
+    @classmethod
+    def from_embeddings(cls, embeddings, threshold: float = 0.85) -> "DedupIndex":
+        """Build an index holding embeddings; row i gets id i"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        index = cls(vectors.shape[1], threshold)
+        index.add(vectors)
+        return index
+
+    def __len__(self) -> int:
+        return self._index.ntotal
+
+    def add(self, vectors) -> None:
+        """Add vectors; ids continue from the current size"""
+        self._index.add(self._prepare(vectors))
+
+    def neighbors(self, vectors, threshold: float = None) -> List[List[Tuple[int, float]]]:
+        """
+        Find indexed vectors similar to each query
+
+        Args:
+            vectors: Query embeddings (one per row)
+            threshold: Minimum cosine similarity (defaults to self.threshold)
+
+        Returns:
+            Per query, (id, similarity) pairs with similarity >= threshold, sorted by id
+        """
+        queries = self._prepare(vectors)
+        if len(self) == 0:
+            return [[] for _ in range(len(queries))]
+
+        if threshold is None:
+            threshold = self.threshold
+
+        # range_search keeps scores strictly above the radius; step just below
+        # it so ties with the threshold are still reported
+        radius = float(np.nextafter(np.float32(threshold), np.float32(-np.inf)))
+        lims, scores, ids = self._index.range_search(queries, radius)
+
+        results = []
+        for q in range(len(queries)):
+            start, end = lims[q], lims[q + 1]
+            hits = [
+                (int(i), float(s))
+                for i, s in zip(ids[start:end], scores[start:end])
+                if s >= threshold
+            ]
+            hits.sort()
+            results.append(hits)
+
+        return results
+
+    def is_duplicate(self, vector) -> bool:
+        """Whether any indexed vector reaches the threshold against vector"""
+        if len(self) == 0:
+            return False
+
+        scores, _ = self._index.search(self._prepare(vector), 1)
+        return bool(scores[0][0] >= self.threshold)
+
+    def _prepare(self, vectors) -> np.ndarray:
+        """float32, C-contiguous, L2-normalized copy (normalize_L2 works in place)"""
+        prepared = np.array(vectors, dtype=np.float32, copy=True, order="C").reshape(-1, self.dim)
+        faiss.normalize_L2(prepared)
+        return prepared
+
+
+class BinaryDedupIndex(DedupIndex):
+    """
+    DedupIndex variant that stores 1-bit sign codes in a faiss IndexBinaryFlat.
+
+    Codes take one bit per dimension (32x less than float32) and candidates
+    are found by Hamming distance, which faiss computes with popcount. The
+    cosine threshold maps to the Hamming radius expected for that angle
+    (d * arccos(threshold) / pi); candidates are then rescored with exact
+    cosine so reported similarities and the threshold test stay the same as
+    DedupIndex. Pairs whose sign codes disagree more than expected can be
+    missed, which is acceptable for duplicate detection.
+    """
+
+    def __init__(self, dim: int, threshold: float = 0.85):
+        if dim % 8:
+            raise ValueError(f"Binary index needs a dimension divisible by 8, got {dim}")
+
+        self.dim = dim
+        self.threshold = threshold
+        self._index = faiss.IndexBinaryFlat(dim)
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+
+    def add(self, vectors) -> None:
+        """Add vectors; ids continue from the current size"""
+        prepared = self._prepare(vectors)
+        self._index.add(self._binarize(prepared))
+        self._vectors = np.vstack([self._vectors, prepared])
+
+    def neighbors(self, vectors, threshold: float = None) -> List[List[Tuple[int, float]]]:
+        """Same contract as DedupIndex.neighbors, with Hamming candidate search"""
+        queries = self._prepare(vectors)
+        if len(self) == 0:
+            return [[] for _ in range(len(queries))]
+
+        if threshold is None:
+            threshold = self.threshold
+
+        # range_search keeps distances strictly below the radius
+        lims, _, ids = self._index.range_search(self._binarize(queries), self._hamming_radius(threshold) + 1)
+
+        results = []
+        for q in range(len(queries)):
+            candidates = ids[lims[q]:lims[q + 1]]
+            scores = self._vectors[candidates] @ queries[q]
+            hits = [
+                (int(i), float(s))
+                for i, s in zip(candidates, scores)
+                if s >= threshold
+            ]
+            hits.sort()
+            results.append(hits)
+
+        return results
+
+    def is_duplicate(self, vector) -> bool:
+        """Whether any indexed vector reaches the threshold against vector"""
+        return bool(self.neighbors(vector)[0])
+
+    def _hamming_radius(self, threshold: float) -> int:
+        angle = np.arccos(np.clip(threshold, -1.0, 1.0))
+        return int(np.ceil(self.dim * angle / np.pi))
+
+    @staticmethod
+    def _binarize(vectors: np.ndarray) -> np.ndarray:
+        return np.packbits(vectors > 0, axis=1)
+
+
+def build_dedup_index(embeddings, threshold: float = 0.85) -> DedupIndex:
+    """
+    Index embeddings for duplicate checks, binary-quantized when the batch is large
+
+    Args:
+        embeddings: Embeddings to index (one per row; row i gets id i)
+        threshold: Cosine similarity at which two vectors count as duplicates
+
+    Returns:
+        BinaryDedupIndex from BINARY_INDEX_MIN_VECTORS rows on (when the
+        dimension packs into whole bytes), otherwise an exact DedupIndex
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    if len(vectors) >= BINARY_INDEX_MIN_VECTORS and vectors.shape[1] % 8 == 0:
+        return BinaryDedupIndex.from_embeddings(vectors, threshold)
+
+    return DedupIndex.from_embeddings(vectors, threshold)
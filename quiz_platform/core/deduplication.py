@@ -3,8 +3,8 @@ from collections import Counter
 from typing import Dict, List, Any, Tuple, Set
 import logging
 from collections import defaultdict
-from sklearn.metrics.pairwise import cosine_similarity
 from config.llm_config import embedding_model
+from core.dedup import DedupIndex, build_dedup_index
 from utils.similarity_utils import jaccard_similarity, calculate_similarity
 
 logger = logging.getLogger(__name__)
@@ -74,36 +74,36 @@ class Deduplicator:
         duplicates = []
         processed = set()
         
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(embeddings)
+        # Only pairs at or above the threshold can be duplicates
+        neighbors = build_dedup_index(embeddings, self.similarity_threshold).neighbors(embeddings)
         
         for i in range(len(questions)):
             if i in processed:
                 continue
             
             current_duplicates = []
-            for j in range(i + 1, len(questions)):
-                if j in processed:
+            for j, similarity in neighbors[i]:
+                if j <= i or j in processed:
                     continue
                 
                 # Check multiple similarity measures
                 is_duplicate = self._are_questions_duplicate(
                     questions[i], 
                     questions[j], 
-                    similarity_matrix[i][j]
+                    similarity
                 )
                 
                 if is_duplicate:
-                    current_duplicates.append(j)
+                    current_duplicates.append((j, similarity))
                     processed.add(j)
             
             if current_duplicates:
                 # Mark all duplicates
-                for dup_idx in current_duplicates:
+                for dup_idx, similarity in current_duplicates:
                     duplicates.append({
                         "question": questions[dup_idx],
                         "duplicate_of": questions[i]["question_id"],
-                        "similarity_score": float(similarity_matrix[i][dup_idx]),
+                        "similarity_score": similarity,
                         "duplicate_reason": "semantic_similarity"
                     })
         
@@ -290,17 +290,18 @@ class Deduplicator:
             List of (index1, index2, similarity, reason) tuples
         """
         near_duplicates = []
+        if len(questions) < 2:
+            return near_duplicates
         
         # Generate embeddings
         question_texts = [q.get("question_text", "") for q in questions]
         embeddings = self._generate_embeddings(question_texts)
         
-        # Compare each pair
+        # Pairs between threshold and the duplicate threshold
+        neighbors = build_dedup_index(embeddings).neighbors(embeddings, threshold)
         for i in range(len(questions)):
-            for j in range(i + 1, len(questions)):
-                similarity = cosine_similarity([embeddings[i]], [embeddings[j]])[0][0]
-                
-                if threshold <= similarity < self.similarity_threshold:
+            for j, similarity in neighbors[i]:
+                if j > i and similarity < self.similarity_threshold:
                     reason = self._get_near_duplicate_reason(questions[i], questions[j], similarity)
                     near_duplicates.append((i, j, similarity, reason))
         
@@ -396,7 +397,7 @@ class Deduplicator:
         
         # Select diverse questions
         selected = []
-        selected_embeddings = []
+        selected_index = None
         
         for score, question in scored_questions:
             if len(selected) >= max_count:
@@ -405,21 +406,18 @@ class Deduplicator:
             question_text = question.get("question_text", "")
             embedding = embedding_model.embed(question_text)
             
-            # Check diversity with already selected questions
-            is_diverse = True
-            for sel_embedding in selected_embeddings:
-                similarity = cosine_similarity([embedding], [sel_embedding])[0][0]
-                if similarity > 0.7:  # Too similar to existing question
-                    is_diverse = False
-                    break
+            # Check diversity with already selected questions in one search
+            if selected_index is None:
+                selected_index = DedupIndex(len(embedding), threshold=0.7)
             
-            if is_diverse:
+            if not selected_index.is_duplicate(embedding):  # Too similar to existing question otherwise
                 selected.append(question)
-                selected_embeddings.append(embedding)
+                selected_index.add([embedding])
         
         # If we still need more questions, take highest scoring ones
         if len(selected) < max_count:
-            remaining = [q for _, q in scored_questions if q not in selected]
+            selected_ids = {id(q) for q in selected}
+            remaining = [q for _, q in scored_questions if id(q) not in selected_ids]
             selected.extend(remaining[:max_count - len(selected)])
         
         return selected
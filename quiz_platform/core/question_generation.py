@@ -1,5 +1,8 @@
+import bisect
 import json
 import random
+from functools import lru_cache
+from itertools import accumulate
 from typing import Dict, List, Any, Tuple
 import logging
 from datetime import datetime
@@ -9,6 +12,21 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Relative weight of each difficulty when sampling from a mix
+_DIFFICULTY_WEIGHTS = {"easy": 0.3, "medium": 0.5, "hard": 0.2}
+
+
+@lru_cache(maxsize=16)
+def _difficulty_cdf(difficulty_mix: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+    """Available difficulties of a mix and their normalized cumulative weights"""
+    available = tuple(d for d in difficulty_mix if d in _DIFFICULTY_WEIGHTS)
+    cumulative = list(accumulate(_DIFFICULTY_WEIGHTS[d] for d in available))
+    if not cumulative:
+        return (), ()
+    
+    total = cumulative[-1]
+    return available, tuple(c / total for c in cumulative)
+
 class QuestionGenerator:
     def __init__(self):
         self.system_prompt = SystemPrompts.QUESTION_GENERATOR_SYSTEM
@@ -440,24 +458,12 @@ class QuestionGenerator:
         if not difficulty_mix:
             return "medium"
         
-        # Simple weighted random selection
-        weights = {
-            "easy": 0.3,
-            "medium": 0.5,
-            "hard": 0.2
-        }
-        
-        # Filter to available difficulties
-        available = [d for d in difficulty_mix if d in weights]
+        # Weighted random selection over the mix's cached cumulative weights
+        available, cdf = _difficulty_cdf(tuple(difficulty_mix))
         if not available:
             return "medium"
         
-        # Calculate weights
-        weight_list = [weights[d] for d in available]
-        total = sum(weight_list)
-        normalized_weights = [w/total for w in weight_list]
-        
-        return random.choices(available, weights=normalized_weights, k=1)[0]
+        return available[bisect.bisect_right(cdf, random.random())]
     
     def enrich_questions_with_context(
         self, 
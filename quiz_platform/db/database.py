@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from typing import Generator
 import os
 
@@ -9,9 +9,10 @@ from config.settings import settings
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=20,
-    max_overflow=30,
-    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
     echo=settings.DEBUG
 )
 
@@ -34,9 +35,92 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# Indexes added to models after their tables existed: (table, index name, columns)
+_INDEXES = (
+    ("chunks", "ix_chunks_pdf_page", "pdf_id, page_number"),
+    ("questions", "ix_questions_quiz_active_order", "quiz_id, is_active, question_order"),
+    ("student_attempts", "ix_student_attempts_student_status", "student_id, status"),
+    ("system_logs", "ix_system_logs_level_created", "level, created_at"),
+    ("system_logs", "ix_system_logs_component_created", "component, created_at"),
+    ("system_logs", "ix_system_logs_user_created", "user_id, created_at"),
+    ("system_logs", "ix_system_logs_pdf_id", "pdf_id"),
+    ("system_logs", "ix_system_logs_quiz_id", "quiz_id")
+)
+
+# JSON columns stored as JSONB on Postgres: (table, column)
+_JSONB_COLUMNS = (
+    ("pdf_documents", "metadata"),
+    ("chunks", "meta_data"),
+    ("vector_indices", "meta_data"),
+    ("system_logs", "details")
+)
+
+# GIN indexes over the JSONB columns: (table, index name, column)
+_GIN_INDEXES = (
+    ("chunks", "ix_chunks_meta_gin", "meta_data"),
+    ("vector_indices", "ix_vector_indices_meta_gin", "meta_data")
+)
+
+def upgrade_schema():
+    """
+    Bring tables created by an older version up to the current models
+    
+    create_all only creates missing tables, so columns, column types and
+    indexes added to existing models are applied here. Every step checks
+    the live schema first, so this is safe to run on every startup.
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        if "pdf_documents" in tables:
+            columns = {column["name"] for column in inspector.get_columns("pdf_documents")}
+            indexes = {index["name"] for index in inspector.get_indexes("pdf_documents")}
+            
+            if "content_sha256" not in columns:
+                conn.execute(text("ALTER TABLE pdf_documents ADD COLUMN content_sha256 VARCHAR(64)"))
+            if "ix_pdf_documents_content_sha256" not in indexes:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_pdf_documents_content_sha256 "
+                    "ON pdf_documents (content_sha256)"
+                ))
+        
+        for table, name, columns in _INDEXES:
+            if table in tables:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        
+        if engine.dialect.name == "postgresql":
+            _upgrade_postgres_types(conn, inspector, tables)
+
+def _upgrade_postgres_types(conn, inspector, tables):
+    """Convert json columns to jsonb and real[], and add the GIN indexes over the jsonb ones"""
+    for table, column in _JSONB_COLUMNS:
+        if table not in tables:
+            continue
+        column_type = {c["name"]: c["type"] for c in inspector.get_columns(table)}.get(column)
+        if column_type is not None and not isinstance(column_type, postgresql.JSONB):
+            conn.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE jsonb USING "{column}"::jsonb'
+            ))
+    
+    # Embeddings were stored as a JSON array; non-arrays (JSON null) become NULL
+    if "chunks" in tables:
+        column_type = {c["name"]: c["type"] for c in inspector.get_columns("chunks")}.get("embedding")
+        if column_type is not None and not isinstance(column_type, postgresql.ARRAY):
+            conn.execute(text(
+                "ALTER TABLE chunks ALTER COLUMN embedding TYPE real[] USING "
+                "CASE WHEN json_typeof(embedding) = 'array' "
+                "THEN translate(embedding::text, '[]', '{}')::real[] END"
+            ))
+    
+    for table, name, column in _GIN_INDEXES:
+        if table in tables:
+            conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ("{column}")'))
+
 def init_db():
-    """Initialize database (create tables)"""
+    """Initialize database (create tables, then add newer columns)"""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
 
 def get_db_connection():
     """Get raw database connection"""
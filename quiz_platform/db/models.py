@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON, Enum, Index
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from .database import Base
 
+# Binary JSONB on Postgres (no reparse on read, GIN-indexable), JSON elsewhere
+JSONB_TYPE = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
     STUDENT = "student"
@@ -13,277 +18,300 @@ class UserRole(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(50), unique=True, index=True, nullable=False)
-    email = Column(String(100), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    full_name = Column(String(100))
-    is_admin = Column(Boolean, default=False)
-    is_active = Column(Boolean, default=True)
-    last_login = Column(DateTime)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    username: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    full_name: Mapped[Optional[str]] = mapped_column(String(100))
+    is_admin: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
 
     # Relationships
-    uploaded_pdfs = relationship("PDFDocument", back_populates="uploader")
-    created_quizzes = relationship("Quiz", back_populates="creator")
-    attempts = relationship("StudentAttempt", back_populates="student")
+    uploaded_pdfs: Mapped[List["PDFDocument"]] = relationship("PDFDocument", back_populates="uploader")
+    created_quizzes: Mapped[List["Quiz"]] = relationship("Quiz", back_populates="creator")
+    attempts: Mapped[List["StudentAttempt"]] = relationship("StudentAttempt", back_populates="student")
 
 class PDFDocument(Base):
     __tablename__ = "pdf_documents"
 
-    id = Column(Integer, primary_key=True, index=True)
-    filename = Column(String(255), nullable=False)
-    original_filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    title = Column(String(200))
-    description = Column(Text)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(200))
+    description: Mapped[Optional[str]] = mapped_column(Text)
     
     # Processing status
-    status = Column(String(50), default="uploaded")  # uploaded, processing, processed, failed
-    error_message = Column(Text)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="uploaded")  # uploaded, processing, processed, failed
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
     
     # Metadata (renamed to avoid SQLAlchemy conflict)
-    page_count = Column(Integer)
-    word_count = Column(Integer)
+    page_count: Mapped[Optional[int]] = mapped_column(Integer)
+    word_count: Mapped[Optional[int]] = mapped_column(Integer)
     # metadata = Column(JSON, nullable=True)  # Stores processing metadata (renamed from metadata)
-    pdf_metadata = Column("metadata", JSON, nullable=True)
+    pdf_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column("metadata", JSONB_TYPE, nullable=True)
+    # SHA-256 of the file bytes; a re-upload of processed content reuses its artifacts
+    content_sha256: Mapped[Optional[str]] = mapped_column(String(64), index=True)
 
     # Relationships
-    uploaded_by = Column(Integer, ForeignKey("users.id"))
-    uploader = relationship("User", back_populates="uploaded_pdfs")
+    uploaded_by: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"))
+    uploader: Mapped[Optional["User"]] = relationship("User", back_populates="uploaded_pdfs")
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
-    processed_at = Column(DateTime)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    quizzes = relationship("Quiz", back_populates="pdf_document")
+    quizzes: Mapped[List["Quiz"]] = relationship("Quiz", back_populates="pdf_document")
 
 class Quiz(Base):
     __tablename__ = "quizzes"
 
-    id = Column(Integer, primary_key=True, index=True)
-    pdf_id = Column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
-    title = Column(String(200), nullable=False)
-    description = Column(Text)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    pdf_id: Mapped[int] = mapped_column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
     
     # Quiz status
-    status = Column(String(50), default="generating")  # generating, generated, published, archived
-    error_message = Column(Text)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="generating")  # generating, generated, published, archived, failed
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
     
     # Quiz properties
-    total_questions = Column(Integer, default=0)
-    difficulty_distribution = Column(JSON)  # {"easy": 0.3, "medium": 0.5, "hard": 0.2}
-    estimated_time = Column(Integer)  # in minutes
+    total_questions: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    difficulty_distribution: Mapped[Optional[Dict[str, float]]] = mapped_column(JSON)  # {"easy": 0.3, "medium": 0.5, "hard": 0.2}
+    estimated_time: Mapped[Optional[int]] = mapped_column(Integer)  # in minutes
     
     # Storage
-    quiz_data_path = Column(String(500))  # Path to generated quiz JSON
+    quiz_data_path: Mapped[Optional[str]] = mapped_column(String(500))  # Path to generated quiz JSON
     
     # Relationships
-    created_by = Column(Integer, ForeignKey("users.id"))
-    creator = relationship("User", back_populates="created_quizzes")
-    pdf_document = relationship("PDFDocument", back_populates="quizzes")
+    created_by: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"))
+    creator: Mapped[Optional["User"]] = relationship("User", back_populates="created_quizzes")
+    pdf_document: Mapped[Optional["PDFDocument"]] = relationship("PDFDocument", back_populates="quizzes")
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
-    generated_at = Column(DateTime)
-    published_at = Column(DateTime)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    generated_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    questions = relationship("Question", back_populates="quiz", cascade="all, delete-orphan")
-    topics = relationship("Topic", back_populates="quiz", cascade="all, delete-orphan")
-    attempts = relationship("StudentAttempt", back_populates="quiz", cascade="all, delete-orphan")
+    # Strict: load explicitly (selectinload) instead of one SELECT per access
+    questions: Mapped[List["Question"]] = relationship("Question", back_populates="quiz", cascade="all, delete-orphan", lazy="raise")
+    topics: Mapped[List["Topic"]] = relationship("Topic", back_populates="quiz", cascade="all, delete-orphan", lazy="raise")
+    attempts: Mapped[List["StudentAttempt"]] = relationship("StudentAttempt", back_populates="quiz", cascade="all, delete-orphan")
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_quiz_active_order", "quiz_id", "is_active", "question_order"),)
 
-    id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    quiz_id: Mapped[int] = mapped_column(Integer, ForeignKey("quizzes.id"), nullable=False)
     
     # Question content
-    question_text = Column(Text, nullable=False)
-    question_type = Column(String(20), default="mcq")  # mcq, short_answer
-    options = Column(JSON)  # For MCQs: ["option1", "option2", ...]
-    correct_answer = Column(Text, nullable=False)
-    explanation = Column(Text)
+    question_text: Mapped[str] = mapped_column(Text, nullable=False)
+    question_type: Mapped[Optional[str]] = mapped_column(String(20), default="mcq")  # mcq, short_answer
+    options: Mapped[Optional[List[str]]] = mapped_column(JSON)  # For MCQs: ["option1", "option2", ...]
+    correct_answer: Mapped[str] = mapped_column(Text, nullable=False)
+    explanation: Mapped[Optional[str]] = mapped_column(Text)
     
     # Metadata
-    difficulty = Column(String(20), default="medium")  # easy, medium, hard
-    topic = Column(String(100))
-    subtopic = Column(String(100))
-    page_reference = Column(Integer)  # Page number in PDF
+    difficulty: Mapped[Optional[str]] = mapped_column(String(20), default="medium")  # easy, medium, hard
+    topic: Mapped[Optional[str]] = mapped_column(String(100))
+    subtopic: Mapped[Optional[str]] = mapped_column(String(100))
+    page_reference: Mapped[Optional[int]] = mapped_column(Integer)  # Page number in PDF
     
     # Generation info
-    validation_score = Column(Float)  # 0.0 - 1.0
-    confidence_score = Column(Float)  # 0.0 - 1.0
-    chunk_id = Column(String(100))  # Reference to source chunk
-    generation_source = Column(String(50))  # llm, fallback, regenerated
+    validation_score: Mapped[Optional[float]] = mapped_column(Float)  # 0.0 - 1.0
+    confidence_score: Mapped[Optional[float]] = mapped_column(Float)  # 0.0 - 1.0
+    chunk_id: Mapped[Optional[str]] = mapped_column(String(100))  # Reference to source chunk
+    generation_source: Mapped[Optional[str]] = mapped_column(String(50))  # llm, fallback, regenerated
     
     # Display order
-    question_order = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
+    question_order: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
     
     # Metadata (renamed to avoid SQLAlchemy conflict)
-    meta_data = Column(JSON)  # Additional metadata (renamed from metadata)
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)  # Additional metadata (renamed from metadata)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    quiz = relationship("Quiz", back_populates="questions")
-    answers = relationship("StudentAnswer", back_populates="question", cascade="all, delete-orphan")
+    quiz: Mapped[Optional["Quiz"]] = relationship("Quiz", back_populates="questions")
+    answers: Mapped[List["StudentAnswer"]] = relationship("StudentAnswer", back_populates="question", cascade="all, delete-orphan")
 
 class Topic(Base):
     __tablename__ = "topics"
 
-    id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    quiz_id: Mapped[int] = mapped_column(Integer, ForeignKey("quizzes.id"), nullable=False)
     
     # Topic info
-    topic_name = Column(String(200), nullable=False)
-    subtopics = Column(JSON)  # List of subtopics
-    subtopic_count = Column(Integer, default=0)
+    topic_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    subtopics: Mapped[Optional[List[str]]] = mapped_column(JSON)  # List of subtopics
+    subtopic_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Statistics
-    question_count = Column(Integer, default=0)
-    average_difficulty = Column(Float)
+    question_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    average_difficulty: Mapped[Optional[float]] = mapped_column(Float)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
     
     # Relationships
-    quiz = relationship("Quiz", back_populates="topics")
+    quiz: Mapped[Optional["Quiz"]] = relationship("Quiz", back_populates="topics")
 
 class StudentAttempt(Base):
     __tablename__ = "student_attempts"
+    __table_args__ = (Index("ix_student_attempts_student_status", "student_id", "status"),)
 
-    id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
-    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    quiz_id: Mapped[int] = mapped_column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    student_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Attempt status
-    status = Column(String(20), default="in_progress")  # in_progress, completed, abandoned
-    score = Column(Float)  # Percentage score
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="in_progress")  # in_progress, completed, abandoned
+    score: Mapped[Optional[float]] = mapped_column(Float)  # Percentage score
     
     # Timestamps
-    started_at = Column(DateTime, default=func.now())
-    completed_at = Column(DateTime)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     # Time tracking
-    time_taken_seconds = Column(Integer)  # Total time taken
+    time_taken_seconds: Mapped[Optional[int]] = mapped_column(Integer)  # Total time taken
     
     # Metadata (renamed to avoid SQLAlchemy conflict)
-    meta_data = Column(JSON)  # Additional attempt data (renamed from metadata)
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)  # Additional attempt data (renamed from metadata)
     
     # Relationships
-    quiz = relationship("Quiz", back_populates="attempts")
-    student = relationship("User", back_populates="attempts")
-    answers = relationship("StudentAnswer", back_populates="attempt", cascade="all, delete-orphan")
+    quiz: Mapped[Optional["Quiz"]] = relationship("Quiz", back_populates="attempts")
+    student: Mapped[Optional["User"]] = relationship("User", back_populates="attempts")
+    answers: Mapped[List["StudentAnswer"]] = relationship("StudentAnswer", back_populates="attempt", cascade="all, delete-orphan")
 
 class StudentAnswer(Base):
     __tablename__ = "student_answers"
 
-    id = Column(Integer, primary_key=True, index=True)
-    attempt_id = Column(Integer, ForeignKey("student_attempts.id"), nullable=False)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    attempt_id: Mapped[int] = mapped_column(Integer, ForeignKey("student_attempts.id"), nullable=False)
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id"), nullable=False)
     
     # Answer content
-    selected_option = Column(String(500))  # For MCQs
-    answer_text = Column(Text)  # For short answers
-    is_correct = Column(Boolean)
+    selected_option: Mapped[Optional[str]] = mapped_column(String(500))  # For MCQs
+    answer_text: Mapped[Optional[str]] = mapped_column(Text)  # For short answers
+    is_correct: Mapped[Optional[bool]] = mapped_column(Boolean)
     
     # Timestamps
-    answered_at = Column(DateTime, default=func.now())
+    answered_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
     
     # Relationships
-    attempt = relationship("StudentAttempt", back_populates="answers")
-    question = relationship("Question", back_populates="answers")
+    attempt: Mapped[Optional["StudentAttempt"]] = relationship("StudentAttempt", back_populates="answers")
+    question: Mapped[Optional["Question"]] = relationship("Question", back_populates="answers")
+
+# all-MiniLM-L6-v2 output size
+EMBEDDING_DIM = 384
+
+# Postgres stores vectors as a binary REAL array instead of JSON text
+EMBEDDING_TYPE = JSON().with_variant(postgresql.ARRAY(postgresql.REAL), "postgresql")
 
 class Chunk(Base):
     __tablename__ = "chunks"
+    __table_args__ = (
+        Index("ix_chunks_pdf_page", "pdf_id", "page_number"),
+        Index("ix_chunks_meta_gin", "meta_data", postgresql_using="gin").ddl_if(dialect="postgresql")
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    pdf_id = Column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    pdf_id: Mapped[int] = mapped_column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
     
     # Chunk content
-    chunk_id = Column(String(100), unique=True, index=True)
-    text = Column(Text, nullable=False)
-    page_number = Column(Integer, nullable=False)
+    chunk_id: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    page_number: Mapped[int] = mapped_column(Integer, nullable=False)
     
     # Position info
-    start_char = Column(Integer)
-    end_char = Column(Integer)
-    word_count = Column(Integer)
+    start_char: Mapped[Optional[int]] = mapped_column(Integer)
+    end_char: Mapped[Optional[int]] = mapped_column(Integer)
+    word_count: Mapped[Optional[int]] = mapped_column(Integer)
     
     # Context info
-    previous_page_ref = Column(String(100))
-    next_page_ref = Column(String(100))
+    previous_page_ref: Mapped[Optional[str]] = mapped_column(String(100))
+    next_page_ref: Mapped[Optional[str]] = mapped_column(String(100))
     
-    # Embeddings
-    embedding = Column(JSON)  # Vector embedding
-    embedding_dim = Column(Integer)
+    # Embeddings (native float4[] on Postgres, JSON elsewhere)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(EMBEDDING_TYPE)
+    embedding_dim: Mapped[Optional[int]] = mapped_column(Integer, default=EMBEDDING_DIM)
     
     # Metadata (renamed to avoid SQLAlchemy conflict)
-    meta_data = Column(JSON)  # Renamed from metadata
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB_TYPE)  # Renamed from metadata
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
     
     # Relationships
-    pdf_document = relationship("PDFDocument")
+    pdf_document: Mapped[Optional["PDFDocument"]] = relationship("PDFDocument")
 
 class VectorIndex(Base):
     __tablename__ = "vector_indices"
+    __table_args__ = (
+        Index("ix_vector_indices_meta_gin", "meta_data", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    pdf_id = Column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    pdf_id: Mapped[int] = mapped_column(Integer, ForeignKey("pdf_documents.id"), nullable=False)
     
     # Index info
-    index_name = Column(String(200), unique=True, index=True)
-    index_type = Column(String(50), default="faiss")  # faiss, pinecone, etc.
+    index_name: Mapped[Optional[str]] = mapped_column(String(200), unique=True, index=True)
+    index_type: Mapped[Optional[str]] = mapped_column(String(50), default="faiss")  # faiss, pinecone, etc.
     
     # Storage
-    index_path = Column(String(500))
-    metadata_path = Column(String(500))
+    index_path: Mapped[Optional[str]] = mapped_column(String(500))
+    metadata_path: Mapped[Optional[str]] = mapped_column(String(500))
     
     # Statistics
-    vector_count = Column(Integer)
-    embedding_dim = Column(Integer)
+    vector_count: Mapped[Optional[int]] = mapped_column(Integer)
+    embedding_dim: Mapped[Optional[int]] = mapped_column(Integer)
     
     # Metadata (renamed to avoid SQLAlchemy conflict)
-    meta_data = Column(JSON)  # Renamed from metadata
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB_TYPE)  # Renamed from metadata
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    pdf_document = relationship("PDFDocument")
+    pdf_document: Mapped[Optional["PDFDocument"]] = relationship("PDFDocument")
 
 class SystemLog(Base):
     __tablename__ = "system_logs"
+    __table_args__ = (
+        Index("ix_system_logs_level_created", "level", "created_at"),
+        Index("ix_system_logs_component_created", "component", "created_at"),
+        Index("ix_system_logs_user_created", "user_id", "created_at")
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Log info
-    level = Column(String(20), nullable=False)  # INFO, WARNING, ERROR, DEBUG
-    component = Column(String(100))  # Module/component name
-    message = Column(Text, nullable=False)
-    details = Column(JSON)
+    level: Mapped[str] = mapped_column(String(20), nullable=False)  # INFO, WARNING, ERROR, DEBUG
+    component: Mapped[Optional[str]] = mapped_column(String(100))  # Module/component name
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB_TYPE)
     
     # Context
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    pdf_id = Column(Integer, ForeignKey("pdf_documents.id"), nullable=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    pdf_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("pdf_documents.id"), nullable=True, index=True)
+    quiz_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("quizzes.id"), nullable=True, index=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), index=True)
     
     # Relationships
-    user = relationship("User")
-    pdf_document = relationship("PDFDocument")
-    quiz = relationship("Quiz")
\ No newline at end of file
+    user: Mapped[Optional["User"]] = relationship("User")
+    pdf_document: Mapped[Optional["PDFDocument"]] = relationship("PDFDocument")
+    quiz: Mapped[Optional["Quiz"]] = relationship("Quiz")
\ No newline at end of file
@@ -6,12 +6,13 @@ from api.init_admin_route import router as init_admin_router
 
 
 from api import auth_routes, admin_routes, student_routes
-from db.database import engine
+from db.database import engine, upgrade_schema
 from db.models import Base
 
 
 # Create DB tables automatically
 Base.metadata.create_all(bind=engine)
+upgrade_schema()
 
 app = FastAPI(
     title="PDF Quiz Platform API",
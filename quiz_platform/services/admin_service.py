@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, desc, and_
 import os
 from db.models import (
@@ -9,7 +9,8 @@ from db.models import (
     StudentAttempt, StudentAnswer
 )
 from schemas.pdf_schema import PDFResponse, QuizResponse
-from schemas.quiz_schema import QuizWithQuestions
+from schemas.quiz_schema import QuizWithQuestions, QuestionResponse, TopicResponse
+from schemas.quiz_schema import QuizResponse as QuizDetailResponse
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -160,11 +161,21 @@ class AdminService:
         try:
             if pdf_id:
                 # Get specific PDF analytics
-                pdf = self.db.query(PDFDocument).filter(PDFDocument.id == pdf_id).first()
+                pdf = self.db.query(PDFDocument).options(
+                    selectinload(PDFDocument.quizzes)
+                ).filter(PDFDocument.id == pdf_id).first()
                 if not pdf:
                     return {"error": "PDF not found"}
                 
-                quizzes = self.db.query(Quiz).filter(Quiz.pdf_id == pdf_id).all()
+                quizzes = pdf.quizzes
+                
+                # Attempt counts for every quiz in one grouped query
+                attempt_counts = dict(
+                    self.db.query(StudentAttempt.quiz_id, func.count(StudentAttempt.id))
+                    .filter(StudentAttempt.quiz_id.in_([quiz.id for quiz in quizzes]))
+                    .group_by(StudentAttempt.quiz_id)
+                    .all()
+                ) if quizzes else {}
                 
                 return {
                     "pdf_id": pdf.id,
@@ -179,24 +190,31 @@ class AdminService:
                             "title": quiz.title,
                             "status": quiz.status,
                             "question_count": quiz.total_questions,
-                            "attempt_count": self.db.query(StudentAttempt).filter(
-                                StudentAttempt.quiz_id == quiz.id
-                            ).count()
+                            "attempt_count": attempt_counts.get(quiz.id, 0)
                         }
                         for quiz in quizzes
                     ],
-                    "processing_metadata": json.loads(pdf.metadata) if pdf.metadata else {}
+                    "processing_metadata": pdf.pdf_metadata or {}
                 }
             else:
                 # Get all PDFs analytics
                 pdfs = self.db.query(PDFDocument).all()
                 
+                # Per-PDF quiz and attempt counts in two grouped queries
+                quiz_counts = dict(
+                    self.db.query(Quiz.pdf_id, func.count(Quiz.id)).group_by(Quiz.pdf_id).all()
+                )
+                attempt_counts = dict(
+                    self.db.query(Quiz.pdf_id, func.count(StudentAttempt.id))
+                    .join(StudentAttempt, StudentAttempt.quiz_id == Quiz.id)
+                    .group_by(Quiz.pdf_id)
+                    .all()
+                )
+                
                 analytics = []
                 for pdf in pdfs:
-                    quiz_count = self.db.query(Quiz).filter(Quiz.pdf_id == pdf.id).count()
-                    attempt_count = self.db.query(StudentAttempt).join(Quiz).filter(
-                        Quiz.pdf_id == pdf.id
-                    ).count()
+                    quiz_count = quiz_counts.get(pdf.id, 0)
+                    attempt_count = attempt_counts.get(pdf.id, 0)
                     
                     analytics.append({
                         "id": pdf.id,
@@ -225,6 +243,37 @@ class AdminService:
             logger.error(f"Error getting PDF analytics: {e}")
             return {"error": str(e)}
     
+    def get_quiz_with_questions(self, quiz_id: int) -> Optional[QuizWithQuestions]:
+        """
+        Assemble the quiz detail payload
+        
+        The quiz, its questions and its topics come from one query with
+        selectin eager loads (three round-trips regardless of quiz size). The
+        quiz and topic rows are wrapped with model_construct; questions are
+        validated so legacy JSON-string options get decoded.
+        
+        Args:
+            quiz_id: Quiz ID
+            
+        Returns:
+            QuizWithQuestions, or None if the quiz does not exist
+        """
+        quiz = self.db.query(Quiz).options(
+            selectinload(Quiz.questions),
+            selectinload(Quiz.topics)
+        ).filter(Quiz.id == quiz_id).first()
+        if not quiz:
+            return None
+        
+        return QuizWithQuestions.model_construct(
+            quiz=QuizDetailResponse.from_orm_trusted(quiz),
+            questions=[
+                QuestionResponse.model_validate(q)
+                for q in sorted(quiz.questions, key=lambda q: q.question_order or 0)
+            ],
+            topics=[TopicResponse.from_orm_trusted(t) for t in quiz.topics]
+        )
+    
     def get_quiz_analytics(self, quiz_id: int) -> Dict[str, Any]:
         """Get quiz analytics"""
         try:
@@ -5,7 +5,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_, extract, case
 import pandas as pd
 import numpy as np
-import json
 import os
 
 from db.models import (
@@ -13,6 +12,7 @@ from db.models import (
     StudentAttempt, StudentAnswer, Topic
 )
 from config.settings import settings
+from utils.helpers import json_column_value
 
 logger = logging.getLogger(__name__)
 
@@ -278,7 +278,7 @@ class AnalyticsService:
         
         total_subtopics = 0
         for topic in topics:
-            subtopics = json.loads(topic.subtopics) if topic.subtopics else []
+            subtopics = json_column_value(topic.subtopics, [])
             total_subtopics += len(subtopics)
         
         return total_subtopics / len(topics)
@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 from unittest.mock import Mock, patch
 
+from core.dedup import BinaryDedupIndex, DedupIndex
 from core.deduplication import Deduplicator
 from utils.similarity_utils import calculate_similarity
 
@@ -131,16 +132,13 @@ class TestDeduplicator:
         question1 = self.test_questions[0]
         question2 = self.test_questions[1]
         
-        # Mock high similarity
-        with patch('core.deduplication.cosine_similarity') as mock_cosine:
-            mock_cosine.return_value = np.array([[0.9]])
-            
-            is_duplicate = self.deduplicator._are_questions_duplicate(
-                question1, question2, 0.9
-            )
-            
-            # These should be duplicates
-            assert is_duplicate is True
+        # High embedding similarity
+        is_duplicate = self.deduplicator._are_questions_duplicate(
+            question1, question2, 0.9
+        )
+        
+        # These should be duplicates
+        assert is_duplicate is True
         
         # Test with different question types
         mcq_question = {"question_type": "mcq", "question_text": "Test?", "answer": "A"}
@@ -563,14 +561,11 @@ class TestDeduplicator:
         }
         
         # These should be duplicates despite different metadata
-        with patch('core.deduplication.cosine_similarity') as mock_cosine:
-            mock_cosine.return_value = np.array([[1.0]])  # Perfect similarity
-            
-            is_duplicate = self.deduplicator._are_questions_duplicate(
-                question1, question2, 0.9
-            )
-            
-            assert is_duplicate is True
+        is_duplicate = self.deduplicator._are_questions_duplicate(
+            question1, question2, 1.0  # Perfect similarity
+        )
+        
+        assert is_duplicate is True
     
     def test_threshold_adjustment(self):
         """Test deduplication with different similarity thresholds"""
@@ -695,4 +690,51 @@ class TestDeduplicator:
         assert len(unique) < len(large_question_set)
         assert stats["total_original_questions"] == len(large_question_set)
         assert stats["total_unique_questions"] == len(unique)
-        assert stats["total_duplicates_removed"] == len(duplicates)
\ No newline at end of file
+        assert stats["total_duplicates_removed"] == len(duplicates)
+
+
+class TestDedupIndex:
+    def test_neighbors_above_threshold(self):
+        """Only pairs at or above the threshold are returned, sorted by id"""
+        embeddings = np.array([
+            [1.0, 0.0, 0.0],
+            [0.99, 0.1, 0.0],
+            [0.0, 1.0, 0.0],
+            [2.0, 0.0, 0.0]
+        ], dtype=np.float32)
+        
+        index = DedupIndex.from_embeddings(embeddings, threshold=0.85)
+        neighbors = index.neighbors(embeddings)
+        
+        assert [j for j, _ in neighbors[0]] == [0, 1, 3]
+        assert [j for j, _ in neighbors[2]] == [2]
+        assert neighbors[0][2][1] == pytest.approx(1.0)
+    
+    def test_is_duplicate(self):
+        """is_duplicate compares against vectors added so far"""
+        index = DedupIndex(dim=2, threshold=0.9)
+        assert not index.is_duplicate([1.0, 0.0])
+        
+        index.add([[1.0, 0.0]])
+        assert index.is_duplicate([3.0, 0.1])
+        assert not index.is_duplicate([0.0, 1.0])
+        assert len(index) == 1
+
+
+class TestBinaryDedupIndex:
+    def test_matches_float_index(self):
+        """Hamming candidates rescored with cosine give the same pairs as DedupIndex"""
+        rng = np.random.default_rng(0)
+        base = rng.standard_normal((50, 64)).astype(np.float32)
+        embeddings = np.vstack([base, base + 0.2 * rng.standard_normal(base.shape).astype(np.float32)])
+        
+        exact = DedupIndex.from_embeddings(embeddings, threshold=0.85).neighbors(embeddings)
+        binary = BinaryDedupIndex.from_embeddings(embeddings, threshold=0.85).neighbors(embeddings)
+        
+        assert [[j for j, _ in row] for row in binary] == [[j for j, _ in row] for row in exact]
+        assert binary[0][0][1] == pytest.approx(exact[0][0][1])
+    
+    def test_rejects_unpacked_dimension(self):
+        """Codes are packed into bytes, so the dimension must be a multiple of 8"""
+        with pytest.raises(ValueError):
+            BinaryDedupIndex(dim=3)
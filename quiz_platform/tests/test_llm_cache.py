@@ -0,0 +1,148 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from config.llm_config import LLMClient
+from config.settings import settings
+from utils.llm_cache import LLMResponseCache
+
+
+class FakeDiskCache:
+    """diskcache.Cache stand-in whose clock the tests advance by hand"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.items = {}
+    
+    def get(self, key):
+        value, expires_at = self.items.get(key, (None, None))
+        if expires_at is not None and self.now >= expires_at:
+            return None
+        return value
+    
+    def set(self, key, value, expire=None):
+        self.items[key] = (value, self.now + expire if expire is not None else None)
+
+
+class TestLLMClientResponseCache:
+    def setup_method(self):
+        """LLMClient with a stubbed API call and an in-memory response cache"""
+        self.client = LLMClient.__new__(LLMClient)
+        self.client.model = "test-model"
+        self.client.response_cache = FakeDiskCache()
+        self.client.generate = Mock(return_value='{"answer": "42"}')
+    
+    def test_miss_then_hit(self):
+        """The first call reaches the API, an identical second call is replayed"""
+        first = self.client.generate_json("prompt", system_prompt="system")
+        second = self.client.generate_json("prompt", system_prompt="system")
+        
+        assert first == second == {"answer": "42"}
+        assert self.client.generate.call_count == 1
+    
+    def test_different_prompt_misses(self):
+        """Only identical requests share a cache entry"""
+        self.client.generate_json("prompt one")
+        self.client.generate_json("prompt two")
+        
+        assert self.client.generate.call_count == 2
+    
+    def test_entries_expire(self):
+        """Responses are stored with LLM_CACHE_TTL_SECONDS and requested again afterwards"""
+        self.client.generate_json("prompt")
+        
+        self.client.response_cache.now += settings.LLM_CACHE_TTL_SECONDS - 1
+        self.client.generate_json("prompt")
+        assert self.client.generate.call_count == 1
+        
+        self.client.response_cache.now += 2
+        self.client.generate_json("prompt")
+        assert self.client.generate.call_count == 2
+    
+    def test_use_cache_false_bypasses_cache(self):
+        """A regenerate calls the API even when a response is cached"""
+        self.client.generate_json("prompt")
+        self.client.generate_json("prompt", use_cache=False)
+        
+        assert self.client.generate.call_count == 2
+        assert len(self.client.response_cache.items) == 1
+    
+    def test_unparseable_response_not_cached(self):
+        """Only responses that parse as JSON are stored"""
+        self.client.generate.return_value = "not json"
+        
+        with pytest.raises(ValueError):
+            self.client.generate_json("prompt")
+        
+        assert self.client.response_cache.items == {}
+
+
+class TestLLMResponseCache:
+    def setup_method(self):
+        """In-memory cache in front of a stub client, with a hand-driven clock"""
+        self.client = Mock()
+        self.client.generate_json.side_effect = lambda prompt, system_prompt=None, **kwargs: {"prompt": prompt, "items": [1]}
+        self.cache = LLMResponseCache(client=self.client, ttl_seconds=60, max_entries=2)
+        
+        self.clock = patch("utils.llm_cache.time")
+        self.time = self.clock.start()
+        self.time.monotonic.return_value = 1000.0
+    
+    def teardown_method(self):
+        self.clock.stop()
+    
+    def test_hit(self):
+        """An identical prompt is answered from the cache"""
+        assert self.cache.generate_json("p", system_prompt="s") == {"prompt": "p", "items": [1]}
+        assert self.cache.generate_json("p", system_prompt="s") == {"prompt": "p", "items": [1]}
+        
+        assert self.client.generate_json.call_count == 1
+    
+    def test_system_prompt_is_part_of_key(self):
+        """The same prompt under another system prompt is a different request"""
+        self.cache.generate_json("p", system_prompt="s1")
+        self.cache.generate_json("p", system_prompt="s2")
+        
+        assert self.client.generate_json.call_count == 2
+    
+    def test_ttl_expiry(self):
+        """Entries older than ttl_seconds are fetched again"""
+        self.cache.generate_json("p")
+        
+        self.time.monotonic.return_value += 59
+        self.cache.generate_json("p")
+        assert self.client.generate_json.call_count == 1
+        
+        self.time.monotonic.return_value += 2
+        self.cache.generate_json("p")
+        assert self.client.generate_json.call_count == 2
+    
+    def test_lru_eviction(self):
+        """Past max_entries the least recently used entry is dropped"""
+        self.cache.generate_json("a")
+        self.cache.generate_json("b")
+        self.cache.generate_json("a")  # a is now the most recent
+        self.cache.generate_json("c")  # evicts b
+        
+        self.cache.generate_json("a")
+        assert self.client.generate_json.call_count == 3
+        
+        self.cache.generate_json("b")
+        assert self.client.generate_json.call_count == 4
+    
+    def test_deep_copy_isolation(self):
+        """Mutating a returned response does not change what the cache hands out"""
+        first = self.cache.generate_json("p")
+        first["items"].append(2)
+        
+        second = self.cache.generate_json("p")
+        second["items"].append(3)
+        
+        assert self.cache.generate_json("p") == {"prompt": "p", "items": [1]}
+    
+    def test_use_cache_false_bypasses_both_layers(self):
+        """A regenerate skips the in-memory cache and tells the client to skip its own"""
+        self.cache.generate_json("p")
+        self.cache.generate_json("p", use_cache=False)
+        
+        assert self.client.generate_json.call_count == 2
+        self.client.generate_json.assert_called_with(prompt="p", system_prompt=None, use_cache=False)
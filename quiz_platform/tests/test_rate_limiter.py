@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import patch
+
+from utils.rate_limiter import RateLimiter
+
+class FakeClock:
+    """Stand-in for the time module: sleep advances monotonic instead of blocking"""
+    
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestRateLimiter:
+    def setup_method(self):
+        """Limiter driven by a fake clock"""
+        self.clock = FakeClock()
+        self.patcher = patch("utils.rate_limiter.time", self.clock)
+        self.patcher.start()
+        self.limiter = RateLimiter(rate=60, per=60.0, burst=3)
+    
+    def teardown_method(self):
+        self.patcher.stop()
+    
+    def test_burst_passes_immediately(self):
+        """A full bucket serves `burst` acquisitions without sleeping"""
+        for _ in range(3):
+            self.limiter.acquire()
+        
+        assert self.clock.sleeps == []
+    
+    def test_next_acquire_waits_for_refill(self):
+        """Once the burst is spent, the next caller waits 1/fill_rate seconds"""
+        for _ in range(3):
+            self.limiter.acquire()
+        
+        self.limiter.acquire()
+        
+        assert sum(self.clock.sleeps) == pytest.approx(1 / self.limiter.fill_rate)
+        assert self.clock.now == pytest.approx(101.0)
+    
+    def test_idle_time_refills_up_to_capacity(self):
+        """Tokens accrue while idle but never beyond the burst size"""
+        for _ in range(3):
+            self.limiter.acquire()
+        
+        self.clock.now += 3600
+        for _ in range(3):
+            self.limiter.acquire()
+        assert self.clock.sleeps == []
+        
+        self.limiter.acquire()
+        assert sum(self.clock.sleeps) == pytest.approx(1.0)
@@ -1,7 +1,11 @@
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 import numpy as np
 
+from agents.validation_agent import ValidationAgent
 from core.question_validation import QuestionValidator
 from utils.similarity_utils import calculate_similarity
 
@@ -378,4 +382,67 @@ class TestQuestionValidator:
         complex_count = self.validator._count_complex_words(complex_text)
         
         assert simple_count == 0  # All words are short
-        assert complex_count > 0  # Has complex words
\ No newline at end of file
+        assert complex_count > 0  # Has complex words
+
+
+class TestValidationAgent:
+    SOURCE = "Mitochondria produce most of the chemical energy that powers biochemical reactions in cells."
+    
+    def test_validate_concurrently_respects_timeout(self):
+        """A hung batch falls back to basic validation without delaying the call"""
+        agent = ValidationAgent(max_workers=2, timeout_per_item=0.1)
+        release = threading.Event()
+        
+        def fake_group(questions, source_text):
+            if source_text.startswith("slow"):
+                release.wait(5)
+            return [{"overall_score": 1.0, "feedback": "llm"} for _ in questions]
+        
+        pending = [
+            ({"question_id": "q1", "answer": "cells"}, "slow source about cells"),
+            ({"question_id": "q2", "answer": "atoms"}, "fast source about atoms")
+        ]
+        
+        with patch.object(agent, "validate_question_group", side_effect=fake_group):
+            start = time.monotonic()
+            results = agent._validate_concurrently(pending)
+            elapsed = time.monotonic() - start
+        release.set()
+        
+        assert elapsed < 1.0
+        assert results[1]["feedback"] == "llm"
+        assert results[0].get("feedback") != "llm"
+    
+    def test_quick_reject_missing_answer(self):
+        """Questions without an answer are rejected"""
+        agent = ValidationAgent()
+        
+        assert agent._quick_reject({"question_text": "Q?"}, self.SOURCE) == "Missing answer"
+    
+    def test_quick_reject_answer_not_in_options(self):
+        """An MCQ answer must be one of its options"""
+        agent = ValidationAgent()
+        question = {"question_type": "mcq", "answer": "Mitochondria", "options": ["Nucleus", "Ribosome"]}
+        
+        assert agent._quick_reject(question, self.SOURCE) == "Answer is not one of the options"
+    
+    def test_quick_reject_short_source(self):
+        """Sources under the minimum length cannot support a question"""
+        agent = ValidationAgent()
+        
+        assert agent._quick_reject({"answer": "cells"}, "Cells.") == "Source text too short to validate against"
+    
+    def test_quick_reject_no_word_overlap(self):
+        """Short words that only occur inside source words do not count as overlap"""
+        agent = ValidationAgent()
+        
+        assert agent._quick_reject({"answer": "a"}, self.SOURCE) == "Answer has no overlap with source text"
+        assert agent._quick_reject({"answer": "quantum gravity"}, self.SOURCE) == "Answer has no overlap with source text"
+    
+    def test_quick_reject_passes_grounded_answer(self):
+        """Answers sharing a word with the source go on to full validation"""
+        agent = ValidationAgent()
+        question = {"question_type": "mcq", "answer": "the mitochondria", "options": ["the mitochondria", "the nucleus"]}
+        
+        assert agent._quick_reject(question, self.SOURCE) is None
+
@@ -66,6 +66,23 @@ def safe_json_loads(json_str: str) -> Any:
         json_str = re.sub(r'(\w+):', r'"\1":', json_str)
         return json.loads(json_str)
 
+def json_column_value(value: Any, default: Any = None) -> Any:
+    """
+    Native value of a JSON column
+    
+    Args:
+        value: Column value (legacy rows may hold an encoded JSON string)
+        default: Returned for empty values
+        
+    Returns:
+        Decoded value
+    """
+    if not value:
+        return default
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
 def calculate_md5(file_path: str) -> str:
     """
     Calculate MD5 hash of file